@@ -0,0 +1,130 @@
+"""
+Application funnel analytics
+Stage conversion, time to first response and per-source / per-resume effectiveness,
+computed in SQL from the status_events history and cached until the next event
+"""
+
+import threading
+
+# Statuses that mean the company answered, and the furthest stage each one proves
+RESPONSE_STATUSES = ('interview', 'rejected', 'offer', 'accepted')
+STAGES = (
+    ('applied', None),
+    ('responded', RESPONSE_STATUSES),
+    ('interview', ('interview', 'offer', 'accepted')),
+    ('offer', ('offer', 'accepted')),
+    ('accepted', ('accepted',)),
+)
+
+GROUPS = {
+    'source': "COALESCE(a.source, 'other')",
+    'resume': "COALESCE(r.name, 'Base resume')",
+}
+
+
+def _in(statuses):
+    return f"({', '.join(repr(status) for status in statuses)})"
+
+
+def _reached(group="'all'"):
+    """One row per application: its group, the stages its history reached and its first response"""
+    flags = ',\n'.join(f"MAX(e.status IN {_in(statuses)}) AS {stage}" for stage, statuses in STAGES if statuses)
+    return f'''
+        reached AS (
+            SELECT a.id, {group} AS grp, a.date_applied,
+                   {flags},
+                   MIN(CASE WHEN e.status IN {_in(RESPONSE_STATUSES)} THEN e.created_date END) AS first_response
+            FROM applications a
+            LEFT JOIN resumes r ON r.id = a.resume_id
+            LEFT JOIN status_events e ON e.application_id = a.id
+            GROUP BY a.id
+        ),
+        timed AS (
+            SELECT grp, julianday(first_response) - julianday(date_applied) AS days,
+                   ROW_NUMBER() OVER (PARTITION BY grp ORDER BY julianday(first_response) - julianday(date_applied)) AS n,
+                   COUNT(*) OVER (PARTITION BY grp) AS total
+            FROM reached WHERE first_response IS NOT NULL
+        ),
+        medians AS (
+            SELECT grp, AVG(days) AS median_days FROM timed
+            WHERE n IN ((total + 1) / 2, (total + 2) / 2)
+            GROUP BY grp
+        )
+    '''
+
+
+def funnel_query():
+    counts = '\nUNION ALL\n'.join(
+        f"SELECT '{stage}' AS stage, {position} AS position, "
+        f"{'COUNT(*)' if statuses is None else f'COALESCE(SUM({stage}), 0)'} AS count FROM reached"
+        for position, (stage, statuses) in enumerate(STAGES)
+    )
+    return f'''
+        WITH {_reached()},
+        stages AS ({counts})
+        SELECT stage, count,
+               ROUND(100.0 * count / NULLIF(LAG(count) OVER (ORDER BY position), 0), 1) AS conversion,
+               ROUND(100.0 * count / NULLIF(FIRST_VALUE(count) OVER (ORDER BY position), 0), 1) AS overall
+        FROM stages ORDER BY position
+    '''
+
+
+def effectiveness_query(group):
+    return f'''
+        WITH {_reached(GROUPS.get(group, "'all'"))}
+        SELECT reached.grp AS name, COUNT(*) AS applications,
+               COALESCE(SUM(responded), 0) AS responses,
+               COALESCE(SUM(interview), 0) AS interviews,
+               COALESCE(SUM(offer), 0) AS offers,
+               ROUND(100.0 * COALESCE(SUM(responded), 0) / COUNT(*), 1) AS response_rate,
+               ROUND(100.0 * COALESCE(SUM(interview), 0) / COUNT(*), 1) AS interview_rate,
+               ROUND(MAX(medians.median_days), 1) AS median_days_to_response
+        FROM reached LEFT JOIN medians ON medians.grp = reached.grp
+        GROUP BY reached.grp
+        ORDER BY applications DESC, name
+    '''
+
+
+MONTHS_QUERY = '''
+    SELECT substr(date_applied, 1, 7) AS month, COUNT(*) AS applications
+    FROM applications WHERE date_applied IS NOT NULL
+    GROUP BY month ORDER BY month
+'''
+
+
+class Analytics:
+    """Cached funnel report; recomputed only after a new status event"""
+
+    def __init__(self, db=None):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.db = db
+        # Per-resume numbers join the resumes table, which is created on demand elsewhere
+        self.db.create_resume_table()
+        self._report = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def compute(self):
+        overall = self.db.query(effectiveness_query('all'))
+        return {
+            'overall': overall[0] if overall else None,
+            'funnel': self.db.query(funnel_query()),
+            'by_source': self.db.query(effectiveness_query('source')),
+            'by_resume': self.db.query(effectiveness_query('resume')),
+            'by_month': self.db.query(MONTHS_QUERY),
+        }
+
+    def report(self):
+        """{'overall', 'funnel', 'by_source', 'by_resume', 'by_month'}; cached until the next event"""
+        version = self.db.get_status_events_version()
+        with self._lock:
+            if self._report is None or version != self._version:
+                self._report = self.compute()
+                self._version = version
+            return self._report
+
+    def invalidate(self):
+        with self._lock:
+            self._report = None
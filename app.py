@@ -1,14 +1,12 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file, Response, stream_with_context
 from werkzeug.utils import secure_filename
 import os
 from datetime import datetime, timedelta
+from concurrent.futures import TimeoutError
 import json
-from database import Database
-from resume_tailor import ResumeTailor
-from job_finder import JobFinder
 from config import Config
-import PyPDF2
-import docx2txt
+from app_context import get_app_context
+from exporter import Exporter, ExportError, FORMATS
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this'  # Change this to a random secret key
@@ -17,53 +15,93 @@ app.secret_key = 'your-secret-key-change-this'  # Change this to a random secret
 UPLOAD_FOLDER = 'data/uploads'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'doc', 'docx'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = Config.MAX_UPLOAD_BYTES
 
-# Create upload folder
+# Create data and upload folders
+context = get_app_context().open()
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize components
-db = Database()
+# Shared components (closed when the process exits)
+db = context.db
 db.create_resume_table()  # Make sure resume table exists
-tailor = ResumeTailor()
-finder = JobFinder()
+tailor = context.tailor
+finder = context.finder
+extractor = context.extractor
+follow_ups = context.follow_ups
+analytics = context.analytics
+documents = context.documents
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 def extract_text_from_file(filepath):
     """Extract text from various file formats"""
-    extension = filepath.rsplit('.', 1)[1].lower()
-    
-    try:
-        if extension == 'txt':
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return f.read()
-        
-        elif extension == 'pdf':
-            with open(filepath, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
-        
-        elif extension in ['doc', 'docx']:
-            return docx2txt.process(filepath)
-            
-    except Exception as e:
-        print(f"Error extracting text: {e}")
+    return extractor.extract_file(filepath)
+
+def store_resume_text(text_content, resume_name, filename, description, filepath, content_hash=None):
+    """Save extracted resume text; removes the upload if nothing was extracted"""
+    if not text_content:
+        os.remove(filepath)  # Clean up
         return None
+    
+    return db.add_resume(
+        name=resume_name,
+        content=text_content,
+        filename=filename,
+        description=description,
+        content_hash=content_hash
+    )
+
+def handle_resume_stream(stream, original_filename, resume_name, description):
+    """Stream an upload to disk, dedupe it by content hash and store its text
+    
+    Returns a (category, message) pair for the caller to report.
+    """
+    extension = original_filename.rsplit('.', 1)[1].lower()
+    digest, filepath, text_content = extractor.save_stream(stream, app.config['UPLOAD_FOLDER'], extension)
+    filename = os.path.basename(filepath)
+    
+    existing_id = db.get_resume_by_hash(digest)
+    if existing_id:
+        return 'success', f'This file was already uploaded (resume #{existing_id}).'
+    
+    if not resume_name:
+        resume_name = f"Resume - {datetime.now().strftime('%Y-%m-%d')}"
+    
+    if text_content is None:
+        # Parse off the request thread; large PDFs finish in the background
+        future = extractor.submit_file(filepath, digest)
+        try:
+            text_content = future.result(timeout=Config.EXTRACTION_WAIT_SECONDS)
+        except TimeoutError:
+            future.add_done_callback(
+                lambda f: store_resume_text(f.result(), resume_name, filename, description, filepath, digest)
+            )
+            return 'success', f'Resume "{resume_name}" is still being processed and will appear shortly.'
+    
+    if store_resume_text(text_content, resume_name, filename, description, filepath, digest):
+        return 'success', f'Resume "{resume_name}" uploaded successfully!'
+    return 'error', 'Could not extract text from file'
 
 @app.route('/')
 def index():
     """Dashboard page"""
     stats = db.get_stats()
     recent_apps = db.get_applications(limit=5)
+    follow_up_count, due_follow_ups = follow_ups.reminders(limit=5)
     
     return render_template('dashboard.html', 
                          stats=stats, 
-                         recent_apps=recent_apps)
+                         recent_apps=recent_apps,
+                         follow_up_count=follow_up_count,
+                         due_follow_ups=due_follow_ups)
+
+@app.route('/follow_up/<int:follow_up_id>/done', methods=['POST'])
+def follow_up_done(follow_up_id):
+    """Mark a follow-up reminder as done"""
+    db.mark_follow_ups([follow_up_id], 'done')
+    flash('Follow-up marked as done', 'success')
+    return redirect(url_for('index'))
 
 @app.route('/resumes')
 def resumes():
@@ -87,38 +125,32 @@ def upload_resume():
         return redirect(url_for('resumes'))
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Save file
-        file.save(filepath)
-        
-        # Extract text
-        text_content = extract_text_from_file(filepath)
-        
-        if text_content:
-            # Save to database
-            if not resume_name:
-                resume_name = f"Resume - {datetime.now().strftime('%Y-%m-%d')}"
-            
-            resume_id = db.add_resume(
-                name=resume_name,
-                content=text_content,
-                filename=filename,
-                description=description
-            )
-            
-            flash(f'Resume "{resume_name}" uploaded successfully!', 'success')
-        else:
-            flash('Could not extract text from file', 'error')
-            os.remove(filepath)  # Clean up
+        category, message = handle_resume_stream(
+            file.stream, secure_filename(file.filename), resume_name, description
+        )
+        flash(message, category)
     else:
         flash('Invalid file type. Allowed: txt, pdf, doc, docx', 'error')
     
     return redirect(url_for('resumes'))
 
+@app.route('/upload_resume_stream', methods=['POST', 'PUT'])
+def upload_resume_stream():
+    """Streaming resume upload: raw file body, filename in the query string
+    
+    Example: curl -T cv.pdf "http://localhost:5000/upload_resume_stream?filename=cv.pdf"
+    """
+    filename = secure_filename(request.args.get('filename', ''))
+    if not allowed_file(filename):
+        return jsonify({'status': 'error', 'message': 'Invalid file type. Allowed: txt, pdf, doc, docx'}), 400
+    
+    category, message = handle_resume_stream(
+        request.stream, filename,
+        request.args.get('resume_name', ''),
+        request.args.get('description', '')
+    )
+    return jsonify({'status': category, 'message': message}), 200 if category == 'success' else 422
+
 @app.route('/delete_resume/<int:resume_id>')
 def delete_resume(resume_id):
     """Delete a resume"""
@@ -137,7 +169,20 @@ def set_default_resume(resume_id):
 def jobs():
     """Job management page"""
     finder.load_jobs()
-    return render_template('jobs.html', jobs=finder.jobs)
+    sort = request.args.get('sort', 'match')
+    resumes = db.get_resume_contents()
+    
+    if sort == 'similar':
+        # Semantic neighbours of your default resume
+        resume_text = resumes[0][1] if resumes else tailor.base_resume
+        jobs_list = [dict(job, score=score) for score, job in finder.most_similar(resume_text, k=100)]
+    else:
+        # Best keyword match for your resumes first (numpy/scipy load on first use)
+        from relevance import rank_jobs
+        ranked = rank_jobs(finder.jobs, resumes)
+        jobs_list = [dict(job, score=score) for score, _, job in ranked]
+    
+    return render_template('jobs.html', jobs=jobs_list, sort=sort)
 
 @app.route('/add_job', methods=['GET', 'POST'])
 def add_job():
@@ -168,6 +213,17 @@ def applications():
     apps = db.get_applications(limit=100)
     return render_template('applications.html', applications=apps)
 
+@app.route('/export/<dataset>.<fmt>')
+def export(dataset, fmt):
+    """Download applications, follow-ups or saved jobs as CSV, JSONL or Parquet, streamed in chunks"""
+    try:
+        pieces = Exporter(db).iter_export(dataset, fmt)
+    except ExportError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('applications'))
+    return Response(stream_with_context(pieces), mimetype=FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename={dataset}.{fmt}'})
+
 @app.route('/apply', methods=['GET', 'POST'])
 def apply():
     """Apply to a job"""
@@ -180,6 +236,7 @@ def apply():
         location = request.form.get('location')
         job_type = request.form.get('job_type')
         salary_range = request.form.get('salary')
+        contact_email = request.form.get('contact_email') or None
         resume_id = request.form.get('resume_id')
         
         # Get selected resume
@@ -193,31 +250,25 @@ def apply():
         tailored_resume = tailor.tailor_resume(job_description, company, position) if job_description else tailor.base_resume
         cover_letter = tailor.generate_cover_letter(job_description, company, position) if job_description else tailor.get_cover_letter_template(company, position)
         
-        # Save files
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_company = "".join(c for c in company if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
-        safe_position = "".join(c for c in position if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
-        
-        resume_filename = f"data/resumes/{safe_company}_{safe_position}_{timestamp}_resume.txt"
-        cover_filename = f"data/resumes/{safe_company}_{safe_position}_{timestamp}_cover.txt"
-        
-        with open(resume_filename, 'w') as f:
-            f.write(tailored_resume)
-        
-        with open(cover_filename, 'w') as f:
-            f.write(cover_letter)
+        # Store the documents, the resume as a diff against the one it was tailored from
+        base_id = documents.put_base(tailor.base_resume)
+        resume_doc_id = documents.put(tailored_resume, 'resume', base_id)
+        cover_doc_id = documents.put(cover_letter, 'cover_letter')
         
         # Log application
         app_id = db.add_application(
             company=company,
             position=position,
             job_url=job_url,
-            resume=resume_filename,
-            cover_letter=cover_filename,
             notes=f"Applied via web interface on {datetime.now().strftime('%Y-%m-%d')}",
             salary_range=salary_range,
             location=location,
-            job_type=job_type
+            job_type=job_type,
+            contact_email=contact_email,
+            source='web',
+            resume_id=resume_data[0] if resume_data else None,
+            resume_doc_id=resume_doc_id,
+            cover_doc_id=cover_doc_id
         )
         
         flash(f'Application created successfully! Documents saved.', 'success')
@@ -231,26 +282,26 @@ def apply():
 @app.route('/application/<int:app_id>')
 def view_application(app_id):
     """View a specific application"""
-    apps = db.get_applications(limit=1000)
-    app_data = next((app for app in apps if app['id'] == app_id), None)
+    app_data = db.get_application(app_id)
     
     if app_data:
-        # Read the generated files if they exist
-        resume_content = ""
-        cover_content = ""
+        # Stored documents, or the files written by older versions
+        resume_content = documents.get(app_data['resume_doc_id']) if app_data.get('resume_doc_id') else ""
+        cover_content = documents.get(app_data['cover_doc_id']) if app_data.get('cover_doc_id') else ""
         
-        if app_data.get('resume_used') and os.path.exists(app_data['resume_used']):
+        if not resume_content and app_data.get('resume_used') and os.path.exists(app_data['resume_used']):
             with open(app_data['resume_used'], 'r') as f:
                 resume_content = f.read()
         
-        if app_data.get('cover_letter') and os.path.exists(app_data['cover_letter']):
+        if not cover_content and app_data.get('cover_letter') and os.path.exists(app_data['cover_letter']):
             with open(app_data['cover_letter'], 'r') as f:
                 cover_content = f.read()
         
         return render_template('view_application.html', 
                              app=app_data, 
                              resume=resume_content, 
-                             cover_letter=cover_content)
+                             cover_letter=cover_content,
+                             history=db.get_status_events(app_id))
     
     flash('Application not found', 'error')
     return redirect(url_for('applications'))
@@ -267,26 +318,12 @@ def update_status(app_id):
 def statistics():
     """Show statistics page"""
     stats = db.get_stats()
-    apps = db.get_applications(limit=1000)
-    
-    # Calculate additional stats
-    by_month = {}
-    by_company = {}
-    
-    for app in apps:
-        # Group by month
-        if app['date_applied']:
-            month = app['date_applied'][:7]  # YYYY-MM
-            by_month[month] = by_month.get(month, 0) + 1
-        
-        # Group by company
-        company = app['company']
-        by_company[company] = by_company.get(company, 0) + 1
+    report = analytics.report()
     
     return render_template('statistics.html', 
                          stats=stats, 
-                         by_month=by_month, 
-                         by_company=by_company)
+                         report=report,
+                         by_month={row['month']: row['applications'] for row in report['by_month']})
 
 if __name__ == '__main__':
     print("🌐 Starting Job Application Assistant Web Server...")
@@ -0,0 +1,138 @@
+"""
+Application context
+One shared instance of each service (database, resume tailor, job finder, resume
+extractor, detail fetcher, blobs, documents, analytics, follow-ups, mailers), built on first use and closed together
+"""
+
+import atexit
+import threading
+
+from config import Config
+
+
+class AppContext:
+    """Service container passed to every component of a run
+
+    Services are created lazily, so an email-only run never builds the job finder
+    and a CLI that never tailors never creates an OpenAI client. provide() swaps
+    in a ready-made instance (tests, custom setups) before first use.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or Config.DATABASE_PATH
+        self._services = {}
+        self._order = []
+        self._lock = threading.RLock()
+
+    def _get(self, name, factory):
+        with self._lock:
+            if name not in self._services:
+                self._services[name] = factory()
+                self._order.append(name)
+            return self._services[name]
+
+    def provide(self, name, service):
+        with self._lock:
+            if name not in self._services:
+                self._order.append(name)
+            self._services[name] = service
+        return service
+
+    @property
+    def db(self):
+        from database import Database
+        return self._get('db', lambda: Database(self.db_path))
+
+    @property
+    def tailor(self):
+        from resume_tailor import ResumeTailor
+        return self._get('tailor', ResumeTailor)
+
+    @property
+    def finder(self):
+        from job_finder import JobFinder
+        return self._get('finder', lambda: JobFinder(self.db))
+
+    @property
+    def extractor(self):
+        from resume_extraction import ResumeTextExtractor
+        return self._get('extractor', ResumeTextExtractor)
+
+    @property
+    def details(self):
+        from job_details import DetailFetcher
+        return self._get('details', DetailFetcher)
+
+    @property
+    def limiter(self):
+        from rate_limiter import get_rate_limiter
+        return self._get('limiter', get_rate_limiter)
+
+    @property
+    def watermarks(self):
+        from watermarks import WatermarkStore
+        return self._get('watermarks', lambda: WatermarkStore(self.db))
+
+    @property
+    def blobs(self):
+        from blobstore import BlobStore
+        return self._get('blobs', lambda: BlobStore(db=self.db))
+
+    @property
+    def documents(self):
+        from document_store import DocumentStore
+        return self._get('documents', lambda: DocumentStore(self.db))
+
+    @property
+    def analytics(self):
+        from analytics import Analytics
+        return self._get('analytics', lambda: Analytics(self.db))
+
+    @property
+    def follow_ups(self):
+        from follow_ups import FollowUpEngine
+        return self._get('follow_ups', lambda: FollowUpEngine(self.db))
+
+    def mailer(self, username, password):
+        """Pooled mailer for an account; the SMTP connections are reused by every caller"""
+        from mailer import Mailer, SMTPPool
+        return self._get(f'mailer:{username}', lambda: Mailer(SMTPPool(username=username, password=password),
+                                                              db=self.db, blobs=self.blobs))
+
+    def open(self):
+        """Run the one-time setup (folders, API key check, schema) up front"""
+        Config.init()
+        self.db
+        return self
+
+    def close(self):
+        """Release pools and workers, newest first; the context can be reused afterwards"""
+        with self._lock:
+            services = [(name, self._services.pop(name)) for name in reversed(self._order)]
+            self._order = []
+        for name, service in services:
+            release = getattr(service, 'shutdown', None) or getattr(service, 'close', None)
+            if release is None:
+                continue
+            try:
+                release()
+            except Exception as e:
+                print(f"⚠️ Error closing {name}: {e}")
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_shared_context = None
+
+
+def get_app_context():
+    """Context shared by every component in this process, closed at exit"""
+    global _shared_context
+    if _shared_context is None:
+        _shared_context = AppContext()
+        atexit.register(_shared_context.close)
+    return _shared_context
@@ -0,0 +1,159 @@
+"""
+Durable apply queue
+Discovery enqueues applications in SQLite; a pool of workers leases and sends them,
+with retries and a send rate per channel
+"""
+
+import os
+import socket
+import threading
+import uuid
+from datetime import date, datetime, time as day_start, timedelta
+
+from database import Database
+from rate_limiter import QuotaExceeded, get_rate_limiter
+
+# Channels without a handler (e.g. 'manual') stay queued for a person to work through
+MANUAL_CHANNEL = 'manual'
+
+
+class ApplyQueue:
+    def __init__(self, db=None, max_attempts=3, retry_delay=300, lease_seconds=300):
+        self.db = db or Database()
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+
+    def enqueue(self, job_key, channel, payload):
+        """Queue once per job; returns the task id, or None if already queued"""
+        return self.db.enqueue_application_task(job_key, channel, payload)
+
+    def lease(self, owner, channels, limit=1):
+        return self.db.lease_application_tasks(owner, channels, self.lease_seconds, limit)
+
+    def complete(self, task):
+        self.db.finish_application_task(task['id'], 'sent')
+
+    def fail(self, task, error, retry=True):
+        """Retry later with backoff, or mark failed once attempts run out"""
+        if retry and task['attempts'] < self.max_attempts:
+            delay = self.retry_delay * 2 ** (task['attempts'] - 1)
+            self.db.finish_application_task(task['id'], 'queued', error, datetime.now() + timedelta(seconds=delay))
+            return 'retry'
+        self.db.finish_application_task(task['id'], 'failed', error)
+        return 'failed'
+
+    def defer(self, task, until, reason):
+        """Put a task back without counting the attempt (e.g. daily quota reached)"""
+        self.db.finish_application_task(task['id'], 'queued', reason, until, refund_attempt=True)
+        return 'deferred'
+
+    def queued_today(self):
+        """Tasks queued since midnight, whatever has become of them"""
+        return self.db.count_application_tasks(datetime.combine(date.today(), day_start()))
+
+    def pending(self, channel=MANUAL_CHANNEL):
+        return self.db.get_application_tasks(channel=channel, status='queued')
+
+    def counts(self):
+        return self.db.get_apply_queue_counts()
+
+
+class ApplyWorkerPool:
+    """Background workers that drain the queue; handlers[channel](payload) returns truthy on success
+
+    Each channel is paced by the limiter's 'applications' bucket for that channel.
+    Handlers raise QuotaExceeded to push a task to the next day; once the daily
+    quota is used up, tasks are pushed without waiting for a send slot first.
+    """
+
+    def __init__(self, queue, handlers, limiter=None, workers=2, poll_interval=5.0, quota='applications'):
+        self.queue = queue
+        self.handlers = handlers
+        self.limiter = limiter or get_rate_limiter()
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.quota = quota
+        self.owner_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.processed = 0
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, args=(f"{self.owner_prefix}:{i}:{uuid.uuid4().hex[:6]}",),
+                                      name=f'apply-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"👷 Started {self.workers} apply workers for {', '.join(self.handlers)}")
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self, owner='inline'):
+        """Process one due task on the calling thread; returns its outcome or None if idle"""
+        tasks = self.queue.lease(owner, list(self.handlers))
+        if not tasks:
+            return None
+        return self._process(tasks[0])
+
+    def drain(self):
+        """Process every due task on the calling thread"""
+        outcomes = []
+        while True:
+            outcome = self.run_once()
+            if outcome is None:
+                return outcomes
+            outcomes.append(outcome)
+
+    def _process(self, task):
+        try:
+            if self.limiter.remaining(self.quota) == 0:
+                # No point waiting out a send slot only to be told the same by the handler
+                raise QuotaExceeded(f"Daily {self.quota} quota reached")
+            self.limiter.acquire('applications', task['channel'])
+            ok = self.handlers[task['channel']](task['payload'])
+        except QuotaExceeded as e:
+            tomorrow = datetime.combine(date.today() + timedelta(days=1), day_start())
+            outcome = self.queue.defer(task, tomorrow, str(e))
+        except Exception as e:
+            outcome = self.queue.fail(task, f"{type(e).__name__}: {e}")
+        else:
+            if ok:
+                self.queue.complete(task)
+                outcome = 'sent'
+            else:
+                outcome = self.queue.fail(task, 'handler reported failure', retry=False)
+        with self._lock:
+            self.processed += 1
+        print(f"   📬 Task {task['id']} ({task['channel']}): {outcome}")
+        return outcome
+
+    def _run(self, owner):
+        while not self._stop.is_set():
+            try:
+                outcome = self.run_once(owner)
+            except Exception as e:
+                print(f"⚠️ Apply worker error: {e}")
+                outcome = None
+            if outcome is None:
+                self._stop.wait(self.poll_interval)
+
+
+if __name__ == "__main__":
+    queue = ApplyQueue()
+    print("📊 Apply queue:")
+    for (channel, status), count in sorted(queue.counts().items()):
+        print(f"   {channel:<8} {status:<12} {count}")
+
+    manual = queue.pending(MANUAL_CHANNEL)
+    if manual:
+        print(f"\n📋 {len(manual)} jobs to apply to by hand:")
+        for task in manual:
+            job = task['payload']['job']
+            print(f"   {job.get('title')} at {job.get('company')}: {job.get('url')}")
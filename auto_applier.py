@@ -1,34 +1,32 @@
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-import time
 import json
 from datetime import datetime
 import re
-from bs4 import BeautifulSoup
 import requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import os
-from resume_tailor import ResumeTailor
-from database import Database
+import threading
+from app_context import get_app_context
+from rate_limiter import QuotaExceeded
+from crawl_frontier import CrawlFrontier, IndeedCrawler, session_fetcher
+from watermarks import scope_key
 
 class JobAutoApplier:
-    def __init__(self, email, email_password):
+    def __init__(self, email, email_password, context=None):
         self.email = email
         self.email_password = email_password
-        self.db = Database()
-        self.tailor = ResumeTailor()
+        self.context = context or get_app_context()
+        self.db = self.context.db
+        self.tailor = self.context.tailor
         self.applied_jobs = self.load_applied_jobs()
+        self._applied_lock = threading.Lock()  # apply workers save from several threads
         
         # Your criteria
         self.keywords = []
         self.locations = []
         self.exclude_companies = []
         self.min_salary = None
+        self.max_result_pages = 3
+        self.limiter = self.context.limiter
+        # Repeat searches only return jobs posted since the last one
+        self.watermarks = self.context.watermarks
         
     def load_applied_jobs(self):
         """Load list of already applied jobs to avoid duplicates"""
@@ -40,16 +38,17 @@ class JobAutoApplier:
     
     def save_applied_job(self, job_id):
         """Save applied job to avoid reapplying"""
-        self.applied_jobs.append(job_id)
-        with open('data/applied_jobs.json', 'w') as f:
-            json.dump(self.applied_jobs, f)
+        with self._applied_lock:
+            self.applied_jobs.append(job_id)
+            with open('data/applied_jobs.json', 'w') as f:
+                json.dump(self.applied_jobs, f)
     
     def setup_email(self):
-        """Setup SMTP for sending emails"""
-        # For Gmail
-        self.smtp = smtplib.SMTP('smtp.gmail.com', 587)
-        self.smtp.starttls()
-        self.smtp.login(self.email, self.email_password)
+        """Setup the pooled SMTP mailer (Gmail unless SMTP_HOST is set)"""
+        self.mailer = self.context.mailer(self.email, self.email_password)
+        self.mailer.pool.check()
+        # Anything still queued from an earlier run goes out first
+        self.mailer.flush()
     
     def search_jobs_indeed(self, job_title, location):
         """Search Indeed with anti-bot detection measures"""
@@ -91,76 +90,32 @@ class JobAutoApplier:
                 # First visit the homepage to get cookies
                 print(f"🔍 Visiting Indeed homepage first...")
                 homepage_response = session.get(base_url, timeout=10)
-                time.sleep(2)  # Wait a bit
+                self.limiter.acquire('scrape', base_url)
                 
-                # Now search
-                url = f"{base_url}/jobs?q={job_title_formatted}&l={location_formatted}"
+                # Now search, newest first so the crawl can stop at jobs it already saw
+                url = f"{base_url}/jobs?q={job_title_formatted}&l={location_formatted}&sort=date"
                 print(f"🔍 Searching: {url}")
                 
-                response = session.get(url, timeout=10)
-                
-                if response.status_code == 403:
-                    print(f"  ⚠️ Indeed is blocking requests (403). Trying alternative method...")
-                    continue
-                
-                if response.status_code != 200:
-                    print(f"  ⚠️ Got status code: {response.status_code}")
-                    continue
-                
-                print(f"  ✅ Got response from Indeed")
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Indeed's structure - try multiple selectors
-                job_cards = (
-                    soup.find_all('div', {'class': 'job_seen_beacon'}) or
-                    soup.find_all('div', {'class': 'jobsearch-SerpJobCard'}) or
-                    soup.find_all('div', {'class': 'slider_container'}) or
-                    soup.find_all('div', {'class': 'cardOutline'}) or
-                    soup.find_all('div', {'id': lambda x: x and 'job_' in x})
+                # Follow pagination and each job's detail page for the full description
+                crawler = IndeedCrawler(
+                    session_fetcher(session),
+                    frontier=CrawlFrontier(state_path=None, max_depth=self.max_result_pages - 1),
+                    workers=2,
+                    debug_path='data/indeed_page.html',
+                    watermarks=self.watermarks
                 )
                 
-                if not job_cards:
-                    print("  ⚠️ No job cards found with known selectors")
-                    # Save for debugging
-                    with open('data/indeed_page.html', 'w', encoding='utf-8') as f:
-                        f.write(response.text[:10000])  # Save first 10k chars
-                    print("  💾 Saved page snippet to data/indeed_page.html")
+                for job in crawler.crawl([(url, location)]):
+                    job['id'] = f"{job['company']}_{job['title']}_{datetime.now().date()}"
+                    job['source'] = 'Indeed'
+                    jobs.append(job)
+                    print(f"  ✓ Found: {job['title']} at {job['company']}")
                 
-                for card in job_cards[:10]:
-                    try:
-                        # Extract job details with multiple attempts
-                        title = (
-                            card.find('h2', {'class': 'jobTitle'}) or
-                            card.find('a', {'data-testid': 'job-title'}) or
-                            card.find('span', {'title': True})
-                        )
-                        
-                        company = (
-                            card.find('span', {'class': 'companyName'}) or
-                            card.find('div', {'class': 'companyName'}) or
-                            card.find('a', {'data-testid': 'company-name'})
-                        )
-                        
-                        if title and company:
-                            title_text = title.get_text(strip=True)
-                            company_text = company.get_text(strip=True)
-                            
-                            job = {
-                                'id': f"{company_text}_{title_text}_{datetime.now().date()}",
-                                'title': title_text,
-                                'company': company_text,
-                                'location': location,
-                                'description': card.get_text(strip=True)[:300],
-                                'source': 'Indeed'
-                            }
-                            jobs.append(job)
-                            print(f"  ✓ Found: {title_text} at {company_text}")
-                    
-                    except Exception as e:
-                        continue
+                if not jobs and any('403' in error for _, error in crawler.errors):
+                    print(f"  ⚠️ Indeed is blocking requests (403). Trying alternative method...")
                 
-                if jobs:
-                    break  # Found jobs, stop trying other domains
+                if jobs or crawler.reached_watermark:
+                    break  # Found jobs (or nothing new since last time), stop trying other domains
                     
             except requests.exceptions.Timeout:
                 print(f"  ⚠️ Request timed out")
@@ -205,15 +160,25 @@ class JobAutoApplier:
         
         return True
     
-    def auto_apply_email(self, job, resume_path, cover_letter=None):
-        """Automatically send application email"""
+    def rank_jobs(self, jobs):
+        """Rank jobs by relevance to your saved resumes, best first"""
+        resumes = self.db.get_resume_contents()
+        if not resumes and self.tailor.base_resume:
+            resumes = [(None, self.tailor.base_resume)]
+        from relevance import rank_jobs  # numpy/scipy, only needed once there are jobs to rank
+        return rank_jobs(jobs, resumes)
+    
+    def auto_apply_email(self, job, resume_path, cover_letter=None, resume_id=None):
+        """Automatically send application email
+        
+        resume_path is a file, or a generated resume as {'filename', 'data'};
+        resume_id is the saved resume the job was matched to, for per-resume statistics.
+        Raises QuotaExceeded once today's MAX_APPLICATIONS_PER_DAY have been sent; an
+        application that fails before it is sent doesn't count against them.
+        """
+        self.limiter.take_daily('applications', raise_error=True)
+        sent = False
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = job['email']
-            msg['Subject'] = f"Application for {job['title']} Position"
-            
             # Generate tailored cover letter
             if not cover_letter:
                 cover_letter = self.tailor.generate_cover_letter(
@@ -222,27 +187,35 @@ class JobAutoApplier:
                     job['title']
                 )
             
-            # Email body
-            body = cover_letter
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach resume
-            with open(resume_path, 'rb') as f:
-                attach = MIMEApplication(f.read(), _subtype="pdf")
-                attach.add_header('Content-Disposition', 'attachment', 
-                                filename=os.path.basename(resume_path))
-                msg.attach(attach)
-            
-            # Send email
-            self.smtp.send_message(msg)
+            # Queue in the outbox and send over the pooled connection
+            outcome = self.mailer.send(
+                self.email, job['email'], f"Application for {job['title']} Position",
+                cover_letter, attachments=[resume_path]
+            )
+            if outcome == 'failed':
+                self.limiter.refund('applications')
+                return False
+            sent = True
             
-            print(f"✅ Applied to {job['title']} at {job['company']}")
+            if outcome == 'sent':
+                print(f"✅ Applied to {job['title']} at {job['company']}")
+            else:
+                print(f"📤 Application to {job['company']} queued for retry")
             
-            # Log application
+            # Log application, keeping what was sent
+            documents = self.context.documents
+            resume_doc_id = None
+            if isinstance(resume_path, dict):
+                resume_doc_id = documents.put(resume_path['data'], 'resume', documents.put_base(self.tailor.base_resume))
             self.db.add_application(
                 company=job['company'],
                 position=job['title'],
-                notes=f"Auto-applied via email to {job['email']}"
+                notes=f"Auto-applied via email to {job['email']}",
+                contact_email=job['email'],
+                source='email',
+                resume_id=resume_id,
+                resume_doc_id=resume_doc_id,
+                cover_doc_id=documents.put(cover_letter, 'cover_letter')
             )
             
             # Save to avoid reapplying
@@ -251,54 +224,76 @@ class JobAutoApplier:
             return True
             
         except Exception as e:
+            if not sent:
+                self.limiter.refund('applications')
             print(f"❌ Failed to apply to {job['title']}: {e}")
             return False
     
     def auto_apply_linkedin_easy(self, job_urls):
         """Automate LinkedIn Easy Apply (requires LinkedIn login)"""
-        driver = webdriver.Chrome()  # You need ChromeDriver installed
+        # Selenium is only loaded for browser runs, not email-only ones
+        from selenium.webdriver.common.by import By
+        from browser_pool import BrowserPool
+        from selenium_waits import WaitStrategy
+        
+        # You need ChromeDriver installed; visible so the password prompt makes sense
+        pool = BrowserPool(size=1, headless=False)
+        pooled = pool.acquire()
+        driver = pooled.driver
+        
+        waits = WaitStrategy(driver)
         
         try:
             # Login to LinkedIn
             driver.get("https://www.linkedin.com/login")
             
-            email_input = driver.find_element(By.ID, "username")
+            email_input = waits.element('linkedin_login_form', By.ID, "username")
             email_input.send_keys(self.email)
             
             password_input = driver.find_element(By.ID, "password")
             password_input.send_keys(input("Enter LinkedIn password: "))
             
+            login_url = driver.current_url
             driver.find_element(By.XPATH, "//button[@type='submit']").click()
             
-            time.sleep(5)  # Wait for login
+            waits.url_changes('linkedin_login', login_url)  # Wait for login
             
             for job_url in job_urls:
+                if not self.limiter.take_daily('applications'):
+                    print("⏸️ Daily application limit reached")
+                    break
+                
+                # Don't spam
+                self.limiter.acquire('linkedin')
                 try:
                     driver.get(job_url)
-                    time.sleep(3)
                     
                     # Click Easy Apply button
-                    easy_apply_btn = driver.find_element(By.XPATH, "//button[contains(@class, 'jobs-apply-button')]")
+                    easy_apply_btn = waits.clickable(
+                        'linkedin_job_details', By.XPATH, "//button[contains(@class, 'jobs-apply-button')]"
+                    )
                     easy_apply_btn.click()
                     
-                    time.sleep(2)
-                    
                     # Fill out application (this varies by job)
                     # You'd need to handle different form types
                     
                     # Submit
-                    submit_btn = driver.find_element(By.XPATH, "//button[@aria-label='Submit application']")
+                    submit_btn = waits.clickable(
+                        'linkedin_apply_step', By.XPATH, "//button[@aria-label='Submit application']"
+                    )
                     submit_btn.click()
                     
                     print(f"✅ Applied via LinkedIn Easy Apply")
-                    time.sleep(5)  # Don't spam
                     
                 except Exception as e:
+                    self.limiter.refund('applications')
                     print(f"❌ Failed to apply: {e}")
                     continue
                     
         finally:
-            driver.quit()
+            waits.report()
+            pool.release(pooled)
+            pool.close()
     
     def run_auto_apply(self, job_title, location, max_applications=10):
         """Main auto-apply process"""
@@ -314,17 +309,26 @@ class JobAutoApplier:
         # Setup email
         self.setup_email()
         
-        # Search for jobs
-        jobs = self.search_jobs_indeed(job_title, location)
+        # Search for jobs, plus ones an earlier run of this search found but didn't get to
+        scope = scope_key(job_title, location)
+        carried = self.watermarks.carried_over(scope)
+        jobs = {job['id']: job for job in list(carried.values()) + self.search_jobs_indeed(job_title, location)}
         
-        # Filter jobs
-        matching_jobs = [job for job in jobs if self.matches_criteria(job)]
+        # Filter jobs, best matches first, remembering the resume each one matched
+        ranked = self.rank_jobs([job for job in jobs.values() if self.matches_criteria(job)])
+        matching_jobs = [job for _, _, job in ranked]
+        resume_ids = {job['id']: resume_id for _, resume_id, job in ranked}
         
         print(f"\n📊 Found {len(matching_jobs)} matching jobs")
         
         # Apply to jobs
         applications_sent = 0
+        attempted = set()
         for job in matching_jobs[:max_applications]:
+            if self.limiter.remaining('applications') == 0:
+                print("⏸️ Daily application limit reached")
+                break
+            
             print(f"\n🎯 Applying to: {job['title']} at {job['company']}")
             
             # Generate tailored resume
@@ -334,17 +338,27 @@ class JobAutoApplier:
                 job['title']
             )
             
-            # Save tailored resume as PDF (you'd need to implement PDF conversion)
-            resume_path = f"data/resumes/auto_{job['company']}_{datetime.now().strftime('%Y%m%d')}.txt"
-            with open(resume_path, 'w') as f:
-                f.write(tailored_resume)
-            
-            # Apply
-            if self.auto_apply_email(job, resume_path):
-                applications_sent += 1
+            # Attached straight from the blobstore (a PDF version would need a converter)
+            safe_company = "".join(c for c in job['company'] if c.isalnum() or c in ' -_').strip()[:30]
+            resume = {'filename': f"{safe_company or 'tailored'} resume.txt", 'data': tailored_resume}
             
-            # Don't spam - wait between applications
-            time.sleep(30)
+            # Apply (the mailer paces sends at the 'email' rate limit)
+            try:
+                if self.auto_apply_email(job, resume, resume_id=resume_ids[job['id']]):
+                    applications_sent += 1
+            except QuotaExceeded as e:
+                print(f"⏸️ {e}")
+                break
+            attempted.add(job['id'])
+        
+        # The watermark has moved past these, so keep them for the next run
+        waiting = {job['id']: job for job in matching_jobs if job['id'] not in attempted}
+        self.watermarks.carry_over(scope, waiting)
+        self.watermarks.consumed(scope, set(carried) - set(waiting))
+        if waiting:
+            print(f"🗂️ {len(waiting)} matching jobs carried over to the next run")
+        
+        self.mailer.close()
         
         print(f"""
         ✅ AUTO-APPLY COMPLETE
@@ -0,0 +1,167 @@
+"""
+Content-addressed storage for generated documents and email attachments
+A blob is named by the SHA-256 of its content and stored compressed (zstd when the
+zstandard package is installed, zlib otherwise) under a two-level fan-out such as
+data/blobs/3f/a2/3fa2...; the blobs table records each one for database references
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+import zlib
+
+from config import Config
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+class BlobStore:
+    """Write-once blobs keyed by content hash; storing the same bytes twice is a no-op
+
+    Files are written to a temporary name and renamed into place, so readers never
+    see a partial blob. The codec is recognised from the data on read, so zlib and
+    zstd blobs can live side by side.
+    """
+
+    def __init__(self, root=None, db=None, compression=None, level=None):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.root = root or Config.BLOB_FOLDER
+        self.db = db
+        compression = compression or Config.BLOB_COMPRESSION
+        if compression == 'zstd' and _zstandard() is None:
+            compression = 'zlib'
+        self.compression = compression
+        self.level = level
+        self._files = {}  # abspath -> (mtime_ns, size, reference) of the last snapshot
+
+    def path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def _compress(self, data):
+        if self.compression == 'zstd':
+            return _zstandard().ZstdCompressor(level=self.level or 10).compress(data)
+        return zlib.compress(data, self.level or 9)
+
+    def _decompress(self, payload):
+        if payload.startswith(ZSTD_MAGIC):
+            zstandard = _zstandard()
+            if zstandard is None:
+                raise RuntimeError("This blob is zstd-compressed: pip install zstandard")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
+
+    def put(self, data):
+        """Store bytes (or text as UTF-8); returns the content hash"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if os.path.exists(path):
+            stored = os.path.getsize(path)
+        else:
+            payload = self._compress(data)
+            folder = os.path.dirname(path)
+            os.makedirs(folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            stored = len(payload)
+        self.db.add_blob(digest, len(data), stored, self.compression)
+        return digest
+
+    def get(self, digest):
+        """The bytes stored under digest; KeyError if there is no such blob"""
+        try:
+            with open(self.path(digest), 'rb') as f:
+                return self._decompress(f.read())
+        except FileNotFoundError:
+            raise KeyError(digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def attachment(self, attachment):
+        """Snapshot an attachment into the store: a file path or {'filename', 'data'} → {'blob', 'filename'}"""
+        if isinstance(attachment, dict):
+            if 'blob' in attachment:
+                return attachment
+            return {'blob': self.put(attachment['data']), 'filename': attachment['filename']}
+        # The same resume is attached to every application; only re-read it once it changes
+        path = os.path.abspath(attachment)
+        stat = os.stat(path)
+        cached = self._files.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size) and self.exists(cached[2]['blob']):
+            return dict(cached[2])
+        with open(path, 'rb') as f:
+            reference = {'blob': self.put(f.read()), 'filename': os.path.basename(attachment)}
+        self._files[path] = (stat.st_mtime_ns, stat.st_size, reference)
+        return dict(reference)
+
+
+def benchmark(applications=2000, resume_kb=150):
+    """Auto-apply attachments: one file per application vs the blob store, zlib vs zstd"""
+    import random
+    import shutil
+    from database import Database
+    from document_store import sample_documents
+
+    folder = tempfile.mkdtemp()
+    try:
+        db = Database(os.path.join(folder, 'applications.db'))
+        rng = random.Random(3)
+        # A PDF-like resume: some compressible structure around incompressible streams
+        pdf = b''.join(b'%PDF-1.4 obj << /Filter /FlateDecode /Length 1024 >> stream\n'
+                       + rng.randbytes(1024) + b'\nendstream\nendobj\n' for _ in range(resume_kb * 1024 // 1100))
+        documents = [(resume, cover) for _, resume, cover in sample_documents(applications)]
+        raw = sum(len(pdf) + len(resume.encode()) + len(cover.encode()) for resume, cover in documents)
+        print(f"📊 {applications:,} applications, each attaching a {len(pdf) / 1024:.0f} KB PDF "
+              f"and a tailored resume plus a cover letter ({raw / 1024 / 1024:.0f} MB if copied per application)")
+
+        for compression in ('zlib', 'zstd'):
+            if compression == 'zstd' and _zstandard() is None:
+                print("   zstd: skipped (pip install zstandard)")
+                continue
+            store = BlobStore(os.path.join(folder, compression), db, compression)
+            start = time.perf_counter()
+            digests = set()
+            for resume, cover in documents:
+                digests.add(store.put(pdf))
+                digests.add(store.put(resume))
+                digests.add(store.put(cover))
+            write = time.perf_counter() - start
+
+            stored = widest = 0
+            for path, folders, names in os.walk(store.root):
+                widest = max(widest, len(folders) + len(names))
+                stored += sum(os.path.getsize(os.path.join(path, name)) for name in names)
+
+            start = time.perf_counter()
+            for digest in digests:
+                store.get(digest)
+            read = (time.perf_counter() - start) / len(digests)
+            print(f"   {compression}: {len(digests):,} blobs, {stored / 1024 / 1024:.1f} MB "
+                  f"({raw / stored:.0f}x less), at most {widest} entries per directory, "
+                  f"{write / (applications * 3) * 1e6:.0f} µs per put, {read * 1e6:.0f} µs per get")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark()
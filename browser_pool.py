@@ -0,0 +1,163 @@
+"""
+Reusable pool of Chrome drivers for Selenium searches
+Keeps warm sessions (cookies included), health-checks drivers and recycles them after K pages
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+def chrome_options(headless=True):
+    """Chrome options shared by every Selenium flow"""
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--window-size=1366,900')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    if headless:
+        options.add_argument('--headless=new')
+    return options
+
+
+def default_driver_factory(headless=True):
+    from selenium import webdriver
+
+    driver = webdriver.Chrome(options=chrome_options(headless))
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+def fixture_url(name, folder='fixtures'):
+    """file:// URL for a saved HTML page, for running flows offline"""
+    return 'file://' + os.path.abspath(os.path.join(folder, name))
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created = time.time()
+
+
+class BrowserPool:
+    def __init__(self, size=3, headless=True, max_pages=50, warm_url=None, driver_factory=None):
+        self.size = size
+        self.headless = headless
+        self.max_pages = max_pages
+        self.warm_url = warm_url
+        self.driver_factory = driver_factory or (lambda: default_driver_factory(headless))
+        self.cookies = []
+        self._idle = queue.Queue()
+        self._all = []
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_driver(self):
+        """Launch a driver and warm it up on the base site with shared cookies"""
+        driver = self.driver_factory()
+        if self.warm_url:
+            driver.get(self.warm_url)
+            if self.cookies:
+                for cookie in self.cookies:
+                    try:
+                        driver.add_cookie(cookie)
+                    except Exception:
+                        pass  # Cookie for another domain
+        pooled = PooledDriver(driver)
+        with self._lock:
+            self._all.append(pooled)
+        return pooled
+
+    def _retire(self, pooled):
+        """Quit a driver, keeping its cookies for its replacement"""
+        try:
+            cookies = pooled.driver.get_cookies()
+            if cookies:
+                self.cookies = cookies
+        except Exception:
+            pass
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+
+    def is_healthy(self, pooled):
+        try:
+            return pooled.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """Get a healthy driver, starting one if the pool isn't full yet"""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        with self._lock:
+            can_start = len(self._all) + self._starting < self.size and self._idle.empty()
+            if can_start:
+                self._starting += 1
+
+        if can_start:
+            try:
+                pooled = self._start_driver()
+            finally:
+                with self._lock:
+                    self._starting -= 1
+        else:
+            pooled = self._idle.get(timeout=timeout)
+
+        if pooled.pages >= self.max_pages or not self.is_healthy(pooled):
+            print("♻️ Recycling browser")
+            self._retire(pooled)
+            pooled = self._start_driver()
+        return pooled
+
+    def release(self, pooled):
+        pooled.pages += 1
+        if self._closed:
+            self._retire(pooled)
+        else:
+            self._idle.put(pooled)
+
+    @contextmanager
+    def driver(self):
+        """Lease a driver: `with pool.driver() as driver: ...`"""
+        pooled = self.acquire()
+        try:
+            yield pooled.driver
+        finally:
+            self.release(pooled)
+
+    def map(self, func, items):
+        """Run func(driver, item) for each item concurrently across the pool"""
+        def run(item):
+            with self.driver() as driver:
+                return func(driver, item)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+        for pooled in drivers:
+            self._retire(pooled)
@@ -0,0 +1,115 @@
+"""
+Job card extraction for Indeed result pages
+Either one batched in-browser JavaScript call, or lxml; both driven by the extractor registry
+"""
+
+import time
+from datetime import datetime
+
+from extractors import registry, SITE_SPECS
+
+
+def extract_cards_in_browser(driver, limit=None, site='indeed'):
+    """Extract every card with a single execute_script round-trip"""
+    return registry.extract_in_browser(site, driver, limit=limit)
+
+
+def extract_cards_from_html(page_html, limit=None, site='indeed', base_url=None):
+    """Extract every card from page HTML with lxml"""
+    return registry.extract(site, page_html, limit=limit, base_url=base_url)
+
+
+def to_job(card, default_location=None, source='Indeed'):
+    """Turn an extracted card into the job dict used across the app"""
+    return {
+        'title': card.get('title') or 'Title not found',
+        'company': card.get('company') or 'Company not found',
+        'location': card.get('location') or default_location,
+        'salary': card.get('salary'),
+        'job_key': card.get('job_key'),
+        'url': card.get('url'),
+        'found_date': datetime.now().isoformat(),
+        'source': source
+    }
+
+
+def _legacy_parse(page_html):
+    """The previous BeautifulSoup html.parser approach, kept for benchmarking"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_html, 'html.parser')
+    job_cards = []
+    for selector in SITE_SPECS['indeed']['cards']:
+        job_cards = soup.select(selector)
+        if job_cards:
+            break
+
+    jobs = []
+    for card in job_cards:
+        title = None
+        title_elem = card.select_one('h2.jobTitle span[title]')
+        if title_elem:
+            title = title_elem.get('title')
+        if not title:
+            title_elem = card.select_one('h2.jobTitle a span')
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+        company_elem = card.select_one('span.companyName') or card.select_one('[data-testid="company-name"]')
+        location_elem = card.select_one('div.companyLocation')
+        salary_elem = card.select_one('div.salary-snippet')
+        jobs.append({
+            'title': title,
+            'company': company_elem.get_text(strip=True) if company_elem else None,
+            'location': location_elem.get_text(strip=True) if location_elem else None,
+            'salary': salary_elem.get_text(strip=True) if salary_elem else None,
+        })
+    return jobs
+
+
+def _amplified_fixture(path='fixtures/indeed_results.html', copies=20):
+    """Fixture page with its cards repeated, to resemble a full results page"""
+    with open(path, 'r', encoding='utf-8') as f:
+        page = f.read()
+    start = page.index('<li>')
+    end = page.rindex('</li>') + len('</li>')
+    return page[:start] + page[start:end] * copies + page[end:]
+
+
+def benchmark(driver=None, runs=50):
+    """Time the old BeautifulSoup parse against lxml (and in-browser JS if a driver is given)
+
+    For the JS path, pass a driver from a BrowserPool pointed at
+    fixture_url('indeed_results.html').
+    """
+    page = _amplified_fixture()
+
+    timings = {}
+    start = time.perf_counter()
+    for _ in range(runs):
+        legacy = _legacy_parse(page)
+    timings['BeautifulSoup html.parser'] = (time.perf_counter() - start) / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        cards = extract_cards_from_html(page)
+    timings['lxml + extractor registry'] = (time.perf_counter() - start) / runs
+
+    if driver is not None:
+        start = time.perf_counter()
+        for _ in range(runs):
+            extract_cards_in_browser(driver)
+        timings['in-browser JS (1 round-trip)'] = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            _legacy_parse(driver.page_source)
+        timings['page_source + BeautifulSoup'] = (time.perf_counter() - start) / runs
+
+    assert [c['title'] for c in cards] == [c['title'] for c in legacy]
+    print(f"📊 {len(cards)} cards per page, {runs} runs")
+    for name, seconds in timings.items():
+        print(f"   {name}: {seconds * 1000:.2f} ms/page")
+
+
+if __name__ == "__main__":
+    benchmark()
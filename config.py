@@ -16,35 +16,85 @@ class Config:
     LOG_FOLDER = 'logs'
     DATA_FOLDER = 'data'
     
+    _initialized = False
+    
     # Create all necessary folders if they don't exist
     @classmethod
     def setup_folders(cls):
         """Create all required folders"""
         folders = [cls.DATA_FOLDER, cls.RESUME_FOLDER, cls.LOG_FOLDER]
         for folder in folders:
-            os.makedirs(folder, exist_ok=True)
-            print(f"✅ Folder ready: {folder}")
+            if not os.path.isdir(folder):
+                os.makedirs(folder, exist_ok=True)
+                print(f"✅ Folder ready: {folder}")
+    
+    @classmethod
+    def init(cls):
+        """One-time setup for entry points: folders and the API key check; later calls do nothing"""
+        if cls._initialized:
+            return
+        cls._initialized = True
+        cls.setup_folders()
+        
+        # Check if API key is configured
+        if cls.OPENAI_API_KEY:
+            if cls.OPENAI_API_KEY.startswith('sk-'):
+                print("✅ OpenAI API key configured")
+            else:
+                print("⚠️  OpenAI API key found but format looks incorrect")
+        else:
+            print("⚠️  No OpenAI API key found - AI features will be limited")
+            print("   Add to .env file: OPENAI_API_KEY=your-key-here")
     
     # Application Settings
     MAX_APPLICATIONS_PER_DAY = 10
     FOLLOW_UP_DAYS = 7
+    # Older follow-ups (e.g. the history of a database from before follow-ups) are not sent
+    FOLLOW_UP_MAX_OVERDUE_DAYS = 14
+    # Saved jobs kept in memory for listing, ranking and the apply form (the newest ones)
+    SAVED_JOBS_LOADED = 1000
     
     # Resume Settings
     DEFAULT_RESUME_PATH = 'data/base_resume.txt'
+    SKILLS_TAXONOMY_PATH = 'data/skills_taxonomy.json'
+    EXTRACTION_WAIT_SECONDS = 5
+    MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_MB', '16')) * 1024 * 1024
+    
+    # Semantic Matching (local sentence-transformers model; hashing vectors if unset)
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL')
+    EMBEDDING_INDEX_PATH = 'data/embeddings/jobs'
+    
+    # Generated documents and attachments (blobstore); zstd needs the zstandard package
+    BLOB_FOLDER = 'data/blobs'
+    BLOB_COMPRESSION = os.getenv('BLOB_COMPRESSION', 'zstd')
+    
+    # Email Sending
+    SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
+    SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', '1') != '0'
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '2'))
+    EMAIL_RATE_PER_MINUTE = float(os.getenv('EMAIL_RATE_PER_MINUTE', '6'))
+    
+    # Rate Limits: channel -> (events per minute, burst); hosts get their own bucket
+    RATE_LIMITS = {
+        'email': (EMAIL_RATE_PER_MINUTE, 1),
+        'applications': (2, 1),
+        'linkedin': (12, 1),
+        'scrape': (30, 2),
+    }
+    DAILY_QUOTAS = {
+        'applications': MAX_APPLICATIONS_PER_DAY,
+    }
+    
+    # Scheduler: pipeline -> interval ('4h', '15m', ...) for run_auto_apply
+    SCHEDULES = {
+        'scrape': os.getenv('SCRAPE_EVERY', '4h'),
+        'enrich': os.getenv('ENRICH_EVERY', '30m'),
+        'apply': os.getenv('APPLY_EVERY', '5m'),
+        'outbox': os.getenv('OUTBOX_EVERY', '15m'),
+        'follow_up': os.getenv('FOLLOW_UP_EVERY', '1h'),
+    }
     
     # Job Search Settings
     DEFAULT_LOCATION = 'Remote'
     DEFAULT_JOB_TYPE = 'Full-time'
-
-# Run setup when module is imported
-Config.setup_folders()
-
-# Check if API key is configured
-if Config.OPENAI_API_KEY:
-    if Config.OPENAI_API_KEY.startswith('sk-'):
-        print("✅ OpenAI API key configured")
-    else:
-        print("⚠️  OpenAI API key found but format looks incorrect")
-else:
-    print("⚠️  No OpenAI API key found - AI features will be limited")
-    print("   Add to .env file: OPENAI_API_KEY=your-key-here")
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh application database for one test"""
+    return Database(db_path=str(tmp_path / 'applications.db'))
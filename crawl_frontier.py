@@ -0,0 +1,276 @@
+"""
+Crawl frontier for multi-page job searches
+URL dedup, per-host politeness, depth/page limits and resumable state on disk
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, urljoin
+
+from extractors import registry as default_registry
+from card_extraction import to_job
+from job_details import extract_description
+
+# Query parameters that don't change which page is served
+IGNORED_PARAMS = {'vjk', 'from', 'advn', 'tk', 'fccid'}
+
+
+def normalize_url(url):
+    """Canonical form used for dedup: lowercase host, sorted query, no fragment"""
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in IGNORED_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+
+class CrawlFrontier:
+    """FIFO of pending requests; depth counts pagination hops from the first results page"""
+
+    def __init__(self, state_path='data/crawl_state.json', max_depth=5, max_pages=60, politeness=2.0):
+        self.state_path = state_path
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.politeness = politeness
+        self.queue = deque()
+        self.in_flight = {}
+        self.seen = set()
+        self.jobs = {}
+        self.pages_fetched = 0
+        self.next_allowed = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if self.state_path and os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                self.queue = deque(state['queue'])
+                self.seen = set(state['seen'])
+                self.jobs = state['jobs']
+                print(f"♻️ Resuming crawl: {len(self.queue)} pages queued, {len(self.jobs)} jobs so far")
+            except Exception as e:
+                print(f"⚠️ Could not load crawl state: {e}")
+
+    def save(self):
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                # Requests still being fetched go back in the queue
+                'queue': list(self.in_flight.values()) + list(self.queue),
+                'seen': sorted(self.seen),
+                'jobs': self.jobs,
+            }
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def finish(self):
+        """Drop the saved state once the queue is drained; otherwise keep it for the next run"""
+        if self.queue:
+            print(f"⏸️ Page budget spent with {len(self.queue)} pages queued; resume with the same state file")
+            self.save()
+        elif self.state_path and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def add(self, url, kind='results', depth=0, meta=None):
+        """Queue a URL unless it was seen before or is past the depth limit"""
+        key = normalize_url(url)
+        with self._lock:
+            if key in self.seen or depth > self.max_depth:
+                return False
+            self.seen.add(key)
+            self.queue.append({'url': url, 'kind': kind, 'depth': depth, 'meta': meta or {}})
+        return True
+
+    def pop(self):
+        """Next request, or None when the queue is empty or this run's page budget is spent"""
+        with self._lock:
+            if not self.queue or self.pages_fetched >= self.max_pages:
+                return None
+            request = self.queue.popleft()
+            self.pages_fetched += 1
+            self.in_flight[normalize_url(request['url'])] = request
+            return request
+
+    def complete(self, request):
+        with self._lock:
+            self.in_flight.pop(normalize_url(request['url']), None)
+
+    def wait_turn(self, url):
+        """Block until this host may be hit again"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = slot + self.politeness
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def session_fetcher(session, timeout=10):
+    """Fetch pages with a requests session (raises on 403/5xx)"""
+    def fetch(url):
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+    return fetch
+
+
+def pool_fetcher(pool, ready=None):
+    """Fetch pages with drivers leased from a BrowserPool; ready(driver, url) waits for content"""
+    def fetch(url):
+        with pool.driver() as driver:
+            driver.get(url)
+            if ready:
+                ready(driver, url)
+            return driver.page_source
+    return fetch
+
+
+def detail_url_for(card, page_url):
+    """Indeed's own job page for a card; /rc/clk links are redirects"""
+    if card.get('job_key'):
+        return urljoin(page_url, f"/viewjob?jk={card['job_key']}")
+    return card.get('url')
+
+
+class IndeedCrawler:
+    def __init__(self, fetch, frontier=None, workers=4, registry=None, follow_details=True,
+                 source='Indeed', debug_path=None, save_every=5, watermarks=None):
+        self.fetch = fetch
+        self.frontier = frontier or CrawlFrontier()
+        self.workers = workers
+        self.registry = registry or default_registry
+        self.follow_details = follow_details
+        self.source = source
+        self.debug_path = debug_path
+        self.save_every = save_every
+        # With a WatermarkStore, each search stops paginating at jobs the last crawl saw
+        self.watermarks = watermarks
+        self._watermarks = {}
+        self.errors = []
+
+    def _watermark(self, meta):
+        if not self.watermarks or 'scope' not in meta:
+            return None
+        if meta['scope'] not in self._watermarks:
+            self._watermarks[meta['scope']] = self.watermarks.get('indeed', meta['scope'])
+        return self._watermarks[meta['scope']]
+
+    @property
+    def reached_watermark(self):
+        """True once a search hit a page of only jobs the last crawl saw"""
+        return any(watermark.exhausted for watermark in self._watermarks.values())
+
+    def _fetch(self, request):
+        self.frontier.wait_turn(request['url'])
+        return self.fetch(request['url'])
+
+    def _process_results(self, request, page_html):
+        url = request['url']
+        root = self.registry.parse(page_html)
+        spec = self.registry.get('indeed')
+        cards = spec.extract(root, base_url=url)
+        location = request['meta'].get('location')
+        watermark = self._watermark(request['meta'])
+
+        if not cards and self.debug_path:
+            os.makedirs(os.path.dirname(self.debug_path) or '.', exist_ok=True)
+            with open(self.debug_path, 'w', encoding='utf-8') as f:
+                f.write(page_html[:10000])
+            print(f"  💾 No cards; saved page snippet to {self.debug_path}")
+
+        added = postings = seen = 0
+        for card in cards:
+            if not (card['title'] or card['company']):
+                continue
+            postings += 1
+            key = card['job_key'] or card['url'] or f"{card['company']}_{card['title']}"
+            if key in self.frontier.jobs:
+                # Repeated from an earlier page of this crawl
+                seen += 1
+                continue
+            if watermark:
+                if not watermark.is_new(key):
+                    seen += 1
+                    continue
+                watermark.record(key)
+            job = to_job(card, default_location=location, source=self.source)
+            job['description'] = card['description']
+            self.frontier.jobs[key] = job
+            added += 1
+
+            detail_url = detail_url_for(card, url)
+            if self.follow_details and detail_url:
+                self.frontier.add(detail_url, 'detail', request['depth'], {'job': key})
+
+        print(f"  📄 Page {request['depth'] + 1}: {len(cards)} cards, {added} new jobs")
+
+        next_page = spec.link(root, 'next_page', base_url=url)
+        if next_page and watermark and watermark.end_page(postings, seen):
+            print("  🛑 Reached jobs seen in the last crawl, not paginating further")
+        elif next_page:
+            self.frontier.add(next_page, 'results', request['depth'] + 1, request['meta'])
+
+    def _process_detail(self, request, page_html):
+        job = self.frontier.jobs.get(request['meta'].get('job'))
+        if job is None:
+            return
+        description = extract_description(page_html)
+        if description:
+            job['description'] = description
+            job['detail_url'] = request['url']
+            job['detail_fetched'] = True
+
+    def crawl(self, start_urls):
+        """Crawl from (url, location) pairs; returns every job found"""
+        for url, location in start_urls:
+            meta = {'location': location}
+            if self.watermarks:
+                meta['scope'] = normalize_url(url)
+            self.frontier.add(url, 'results', 0, meta)
+
+        pending = {}
+        completed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                while len(pending) < self.workers:
+                    request = self.frontier.pop()
+                    if request is None:
+                        break
+                    pending[executor.submit(self._fetch, request)] = request
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request = pending.pop(future)
+                    try:
+                        page_html = future.result()
+                        if request['kind'] == 'results':
+                            self._process_results(request, page_html)
+                        else:
+                            self._process_detail(request, page_html)
+                    except Exception as e:
+                        print(f"  ⚠️ {request['url']}: {e}")
+                        self.errors.append((request['url'], str(e)))
+                    self.frontier.complete(request)
+                    completed += 1
+                    if completed % self.save_every == 0:
+                        self.frontier.save()
+
+        jobs = list(self.frontier.jobs.values())
+        self.frontier.finish()
+        for watermark in self._watermarks.values():
+            self.watermarks.save(watermark)
+        return jobs
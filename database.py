@@ -1,17 +1,34 @@
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
+import threading
+
+# Database files whose schema was already set up by this process
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+# Columns of saved_jobs after job_key; anything else on a job is kept in `extra` as JSON
+SAVED_JOB_FIELDS = ('title', 'company', 'location', 'url', 'description', 'salary', 'job_type', 'date_found')
+
+# Application statuses that still warrant a follow-up
+FOLLOW_UP_STATUSES = ('pending', 'applied')
 
 class Database:
     def __init__(self, db_path='data/applications.db'):
         self.db_path = db_path
-        self.init_db()
+        with _init_lock:
+            key = os.path.abspath(db_path)
+            if key not in _initialized_paths:
+                self.init_db()
+                _initialized_paths.add(key)
     
     def init_db(self):
         """Create tables if they don't exist"""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
         
         # Create applications table
         cursor.execute('''
@@ -28,7 +45,86 @@ class Database:
                 response TEXT,
                 salary_range TEXT,
                 location TEXT,
-                job_type TEXT
+                job_type TEXT,
+                contact_email TEXT,
+                source TEXT,
+                resume_id INTEGER,
+                resume_doc_id INTEGER,
+                cover_doc_id INTEGER
+            )
+        ''')
+        
+        # Older databases predate follow-up emails and analytics
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(applications)')]
+        if 'contact_email' not in columns:
+            cursor.execute('ALTER TABLE applications ADD COLUMN contact_email TEXT')
+        if 'resume_id' not in columns:
+            cursor.execute('ALTER TABLE applications ADD COLUMN resume_id INTEGER')
+        for column in ('resume_doc_id', 'cover_doc_id'):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE applications ADD COLUMN {column} INTEGER')
+        if 'source' not in columns:
+            cursor.execute('ALTER TABLE applications ADD COLUMN source TEXT')
+            # Each entry point left its own note
+            cursor.execute('''
+                UPDATE applications SET source = CASE
+                    WHEN notes LIKE 'Auto-applied via email%' THEN 'email'
+                    WHEN notes LIKE 'Applied via web interface%' THEN 'web'
+                    WHEN notes LIKE 'Found via semi-automated search%' THEN 'semi_auto'
+                    WHEN notes LIKE 'Prepared on%' THEN 'prepared'
+                    WHEN notes LIKE 'Applied on%' THEN 'cli'
+                END
+            ''')
+        
+        # Every status an application went through, appended by add_application and update_status
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS status_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                application_id INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                previous_status TEXT,
+                created_date TIMESTAMP,
+                FOREIGN KEY (application_id) REFERENCES applications (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_status_events_application ON status_events (application_id, created_date)')
+        if 'status_events' not in tables:
+            # Rebuild what the applications table still knows: when each was logged, and the
+            # time of the last status change that update_status kept in `response`
+            cursor.execute('''
+                INSERT INTO status_events (application_id, status, created_date)
+                SELECT id, 'pending', date_applied FROM applications ORDER BY id
+            ''')
+            cursor.execute('''
+                INSERT INTO status_events (application_id, status, previous_status, created_date)
+                SELECT id, status, 'pending', COALESCE(response, date_applied) FROM applications
+                WHERE status != 'pending' ORDER BY id
+            ''')
+        
+        # Generated resumes and cover letters (document_store), full text or a diff against base_id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                content_hash TEXT NOT NULL UNIQUE,
+                base_id INTEGER,
+                encoding TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                created_date TIMESTAMP,
+                FOREIGN KEY (base_id) REFERENCES documents (id)
+            )
+        ''')
+        
+        # Files in the blobstore, by content hash
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                compression TEXT,
+                created_date TIMESTAMP
             )
         ''')
         
@@ -55,6 +151,113 @@ class Database:
                 FOREIGN KEY (application_id) REFERENCES applications (id)
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_follow_ups_due ON follow_ups (status, follow_up_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_follow_ups_application ON follow_ups (application_id)')
+        
+        # Outgoing emails, kept until sent so they survive restarts
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sender TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                attachments TEXT,
+                application_id INTEGER,
+                status TEXT DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                next_attempt TIMESTAMP,
+                last_error TEXT,
+                created_date TIMESTAMP,
+                sent_date TIMESTAMP,
+                FOREIGN KEY (application_id) REFERENCES applications (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt)')
+        
+        # Applications waiting to be sent, drained by apply_queue workers
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS apply_queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key TEXT NOT NULL UNIQUE,
+                channel TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT DEFAULT 'queued',
+                attempts INTEGER DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires TIMESTAMP,
+                next_attempt TIMESTAMP,
+                last_error TEXT,
+                created_date TIMESTAMP,
+                updated_date TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_apply_queue_due ON apply_queue (channel, status, next_attempt)')
+        
+        # Uses per day for each rate_limiter quota
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_quotas (
+                day TEXT NOT NULL,
+                name TEXT NOT NULL,
+                used INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, name)
+            )
+        ''')
+        
+        # Jobs saved for later (JobFinder), one row per job key
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS saved_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key TEXT NOT NULL UNIQUE,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                url TEXT,
+                description TEXT,
+                salary TEXT,
+                job_type TEXT,
+                date_found TEXT,
+                extra TEXT
+            )
+        ''')
+        
+        # Newest posting seen per scraped source and search, so scrapes stop at old postings
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source TEXT NOT NULL,
+                scope TEXT NOT NULL DEFAULT '',
+                last_posted TEXT,
+                last_id TEXT,
+                seen_ids TEXT,
+                updated_date TIMESTAMP,
+                PRIMARY KEY (source, scope)
+            )
+        ''')
+        
+        # Scraped jobs past the watermark that weren't applied to yet, ranked again next run
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS carried_jobs (
+                scope TEXT NOT NULL DEFAULT '',
+                job_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                found_date TIMESTAMP,
+                PRIMARY KEY (scope, job_key)
+            )
+        ''')
+        
+        # Last run and execution lock of each scheduler job
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scheduler_jobs (
+                name TEXT PRIMARY KEY,
+                last_started TIMESTAMP,
+                last_finished TIMESTAMP,
+                last_status TEXT,
+                last_error TEXT,
+                run_count INTEGER DEFAULT 0,
+                lock_owner TEXT,
+                lock_expires TIMESTAMP
+            )
+        ''')
         
         conn.commit()
         conn.close()
@@ -62,26 +265,45 @@ class Database:
     
     def add_application(self, company, position, job_url=None, 
                        resume=None, cover_letter=None, notes=None,
-                       salary_range=None, location=None, job_type=None):
+                       salary_range=None, location=None, job_type=None, contact_email=None,
+                       source=None, resume_id=None, resume_doc_id=None, cover_doc_id=None):
         """Log a new application"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        now = datetime.now()
         cursor.execute('''
             INSERT INTO applications 
             (company, position, job_url, date_applied, resume_used, 
-             cover_letter, notes, salary_range, location, job_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (company, position, job_url, datetime.now(), 
-              resume, cover_letter, notes, salary_range, location, job_type))
+             cover_letter, notes, salary_range, location, job_type, contact_email, source, resume_id,
+             resume_doc_id, cover_doc_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (company, position, job_url, now, 
+              resume, cover_letter, notes, salary_range, location, job_type, contact_email, source, resume_id,
+              resume_doc_id, cover_doc_id))
+        app_id = cursor.lastrowid
+        cursor.execute('''
+            INSERT INTO status_events (application_id, status, created_date) VALUES (?, 'pending', ?)
+        ''', (app_id, now))
         
         conn.commit()
-        app_id = cursor.lastrowid
         conn.close()
         
         print(f"✅ Application logged! ID: {app_id}")
         return app_id
     
+    def get_application(self, app_id):
+        """One application by id, or None"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM applications WHERE id = ?', (app_id,))
+        row = cursor.fetchone()
+        columns = [description[0] for description in cursor.description]
+        conn.close()
+        
+        return dict(zip(columns, row)) if row else None
+    
     def get_applications(self, limit=10):
         """Get recent applications"""
         conn = sqlite3.connect(self.db_path)
@@ -102,26 +324,65 @@ class Database:
         return applications
     
     def update_status(self, app_id, status):
-        """Update application status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Update application status and append it to the application's status history"""
         valid_statuses = ['pending', 'applied', 'interview', 'rejected', 'offer', 'accepted']
         if status not in valid_statuses:
             print(f"⚠️ Invalid status. Use one of: {valid_statuses}")
             return
         
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        row = cursor.execute('SELECT status FROM applications WHERE id = ?', (app_id,)).fetchone()
+        if row is None or row[0] == status:
+            conn.close()
+            return
+        
         cursor.execute('''
             UPDATE applications 
-            SET status = ?, response = ?
+            SET status = ?
             WHERE id = ?
-        ''', (status, datetime.now(), app_id))
+        ''', (status, app_id))
+        cursor.execute('''
+            INSERT INTO status_events (application_id, status, previous_status, created_date)
+            VALUES (?, ?, ?, ?)
+        ''', (app_id, status, row[0], datetime.now()))
+        
+        # Once the company has answered there is nothing to follow up on
+        if status not in FOLLOW_UP_STATUSES:
+            cursor.execute('''
+                UPDATE follow_ups SET status = 'cancelled'
+                WHERE application_id = ? AND status IN ('pending', 'manual')
+            ''', (app_id,))
         
         conn.commit()
         conn.close()
         
         print(f"✅ Updated application {app_id} to {status}")
     
+    def get_status_events(self, app_id):
+        """Status history of one application, oldest first"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT status, previous_status, created_date FROM status_events
+            WHERE application_id = ?
+            ORDER BY created_date, id
+        ''', (app_id,))
+        columns = [description[0] for description in cursor.description]
+        events = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        conn.close()
+        return events
+    
+    def get_status_events_version(self):
+        """Id of the newest status event; changes whenever an application is logged or updated"""
+        conn = sqlite3.connect(self.db_path)
+        version = conn.execute('SELECT MAX(id) FROM status_events').fetchone()[0]
+        conn.close()
+        return version or 0
+    
     def get_stats(self):
         """Get application statistics"""
         conn = sqlite3.connect(self.db_path)
@@ -205,22 +466,29 @@ class Database:
                 is_default BOOLEAN DEFAULT 0,
                 created_date TIMESTAMP,
                 last_used TIMESTAMP,
-                description TEXT
+                description TEXT,
+                content_hash TEXT
             )
         ''')
         
+        # Older databases predate content hashing
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(resumes)')]
+        if 'content_hash' not in columns:
+            cursor.execute('ALTER TABLE resumes ADD COLUMN content_hash TEXT')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_content_hash ON resumes (content_hash)')
+        
         conn.commit()
         conn.close()
 
-    def add_resume(self, name, content, filename=None, description=None):
+    def add_resume(self, name, content, filename=None, description=None, content_hash=None):
         """Add a new resume"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute('''
-            INSERT INTO resumes (name, filename, content, description, created_date)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (name, filename, content, description, datetime.now()))
+            INSERT INTO resumes (name, filename, content, description, created_date, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (name, filename, content, description, datetime.now(), content_hash))
         
         conn.commit()
         resume_id = cursor.lastrowid
@@ -228,6 +496,17 @@ class Database:
         
         return resume_id
 
+    def get_resume_by_hash(self, content_hash):
+        """Get the id of a resume uploaded with the same file content"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id FROM resumes WHERE content_hash = ? LIMIT 1', (content_hash,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return row[0] if row else None
+
     def get_all_resumes(self):
         """Get all saved resumes"""
         conn = sqlite3.connect(self.db_path)
@@ -258,6 +537,21 @@ class Database:
         
         return resume
 
+    def get_resume_contents(self):
+        """Get (id, content) for every saved resume, default resume first"""
+        self.create_resume_table()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, content FROM resumes
+            ORDER BY is_default DESC, created_date DESC
+        ''')
+        resumes = cursor.fetchall()
+        conn.close()
+        
+        return resumes
+
     def set_default_resume(self, resume_id):
         """Set a resume as default"""
         conn = sqlite3.connect(self.db_path)
@@ -270,4 +564,593 @@ class Database:
         cursor.execute('UPDATE resumes SET is_default = 1 WHERE id = ?', (resume_id,))
         
         conn.commit()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    def schedule_follow_ups(self, days, max_overdue_days=None):
+        """Give every application logged since the last call a follow-up `days` after applying
+
+        Only applications newer than the latest one already scheduled are read, so this stays
+        cheap however long the history is. Follow-ups that would already be more than
+        max_overdue_days late (the backlog of an existing database) are created cancelled.
+        Returns the number of follow-ups created.
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cutoff = None if max_overdue_days is None else datetime.now() - timedelta(days=max_overdue_days)
+        cursor.execute(f'''
+            INSERT INTO follow_ups (application_id, follow_up_date, status)
+            SELECT id, datetime(date_applied, ?),
+                   CASE WHEN status NOT IN ({', '.join('?' * len(FOLLOW_UP_STATUSES))}) THEN 'cancelled'
+                        WHEN ? IS NOT NULL AND datetime(date_applied, ?) < datetime(?) THEN 'cancelled'
+                        ELSE 'pending' END
+            FROM applications
+            WHERE id > (SELECT COALESCE(MAX(application_id), 0) FROM follow_ups) AND date_applied IS NOT NULL
+            ORDER BY id
+        ''', (f'+{days} days', *FOLLOW_UP_STATUSES, cutoff, f'+{days} days', cutoff))
+        count = cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        return count
+
+    def add_follow_up(self, application_id, follow_up_date, notes=None):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO follow_ups (application_id, follow_up_date, notes) VALUES (?, ?, ?)
+        ''', (application_id, follow_up_date, notes))
+        conn.commit()
+        follow_up_id = cursor.lastrowid
+        conn.close()
+        return follow_up_id
+
+    def get_due_follow_ups(self, until, limit=100, statuses=('pending',)):
+        """Follow-ups due by `until`, oldest first, with their application"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT f.id, f.application_id, f.follow_up_date, f.status, f.notes,
+                   a.company, a.position, a.job_url, a.date_applied, a.contact_email
+            FROM follow_ups f JOIN applications a ON a.id = f.application_id
+            WHERE f.status IN ({', '.join('?' * len(statuses))}) AND f.follow_up_date <= ?
+            ORDER BY f.follow_up_date, f.id
+            LIMIT ?
+        ''', (*statuses, until, limit))
+        
+        columns = [description[0] for description in cursor.description]
+        follow_ups = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        conn.close()
+        return follow_ups
+
+    def get_upcoming_follow_ups(self, limit=100):
+        """(follow_up_date, id) of the next pending follow-ups, soonest first"""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT follow_up_date, id FROM follow_ups
+            WHERE status = 'pending'
+            ORDER BY follow_up_date, id
+            LIMIT ?
+        ''', (limit,)).fetchall()
+        conn.close()
+        return rows
+
+    def count_due_follow_ups(self, until, statuses=('pending',)):
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute(f'''
+            SELECT COUNT(*) FROM follow_ups
+            WHERE status IN ({', '.join('?' * len(statuses))}) AND follow_up_date <= ?
+        ''', (*statuses, until)).fetchone()[0]
+        conn.close()
+        return count
+
+    def mark_follow_ups(self, follow_up_ids, status, notes=None):
+        """Set the status (and optionally notes) of several follow-ups in one statement"""
+        follow_up_ids = list(follow_up_ids)
+        if not follow_up_ids:
+            return
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(f'''
+            UPDATE follow_ups SET status = ?, notes = COALESCE(?, notes)
+            WHERE id IN ({', '.join('?' * len(follow_up_ids))})
+        ''', (status, notes, *follow_up_ids))
+        conn.commit()
+        conn.close()
+
+    def add_outbox_message(self, sender, recipient, subject, body, attachments=None, application_id=None):
+        """Queue an email; attachments is a list of file paths"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now()
+        cursor.execute('''
+            INSERT INTO outbox (sender, recipient, subject, body, attachments, application_id,
+                                next_attempt, created_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (sender, recipient, subject, body, json.dumps(attachments or []), application_id, now, now))
+        
+        conn.commit()
+        message_id = cursor.lastrowid
+        conn.close()
+        
+        return message_id
+
+    def claim_outbox_messages(self, limit=10, message_ids=None):
+        """Mark due pending messages as sending and return them"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        query = '''
+            UPDATE outbox SET status = 'sending', attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM outbox
+                WHERE status = 'pending' AND next_attempt <= ? {only}
+                ORDER BY next_attempt, id
+                LIMIT ?
+            )
+            RETURNING *
+        '''
+        params = [datetime.now()]
+        only = ''
+        if message_ids is not None:
+            only = f"AND id IN ({', '.join('?' * len(message_ids))})"
+            params.extend(message_ids)
+        params.append(limit)
+        cursor.execute(query.format(only=only), params)
+        
+        columns = [description[0] for description in cursor.description]
+        messages = []
+        for row in cursor.fetchall():
+            message = dict(zip(columns, row))
+            message['attachments'] = json.loads(message['attachments'] or '[]')
+            messages.append(message)
+        
+        conn.commit()
+        conn.close()
+        return messages
+
+    def mark_outbox_sent(self, message_id):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE outbox SET status = 'sent', sent_date = ?, last_error = NULL WHERE id = ?
+        ''', (datetime.now(), message_id))
+        conn.commit()
+        conn.close()
+
+    def mark_outbox_retry(self, message_id, error, next_attempt):
+        """Put a message back in the queue after a transient failure"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE outbox SET status = 'pending', last_error = ?, next_attempt = ? WHERE id = ?
+        ''', (error, next_attempt, message_id))
+        conn.commit()
+        conn.close()
+
+    def mark_outbox_failed(self, message_id, error):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE outbox SET status = 'failed', last_error = ? WHERE id = ?
+        ''', (error, message_id))
+        conn.commit()
+        conn.close()
+
+    def reset_interrupted_outbox(self):
+        """Messages left 'sending' by a crashed run go back to pending"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+        count = cursor.rowcount
+        conn.commit()
+        conn.close()
+        return count
+
+    def get_outbox_message(self, message_id):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM outbox WHERE id = ?', (message_id,))
+        row = cursor.fetchone()
+        columns = [description[0] for description in cursor.description]
+        conn.close()
+        
+        return dict(zip(columns, row)) if row else None
+
+    def get_outbox_counts(self):
+        """{status: count} for the outbox"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT status, COUNT(*) FROM outbox GROUP BY status')
+        counts = dict(cursor.fetchall())
+        conn.close()
+        
+        return counts
+
+    def enqueue_application_task(self, job_key, channel, payload):
+        """Queue an application; returns its id, or None if this job was queued before"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now()
+        cursor.execute('''
+            INSERT OR IGNORE INTO apply_queue (job_key, channel, payload, next_attempt, created_date, updated_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (job_key, channel, json.dumps(payload, ensure_ascii=False), now, now, now))
+        
+        conn.commit()
+        task_id = cursor.lastrowid if cursor.rowcount else None
+        conn.close()
+        
+        return task_id
+
+    def lease_application_tasks(self, owner, channels, lease_seconds=300, limit=1):
+        """Claim due queued tasks (or ones whose lease ran out) for a worker"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now()
+        placeholders = ', '.join('?' * len(channels))
+        cursor.execute(f'''
+            UPDATE apply_queue
+            SET status = 'in_progress', lease_owner = ?, lease_expires = ?,
+                attempts = attempts + 1, updated_date = ?
+            WHERE id IN (
+                SELECT id FROM apply_queue
+                WHERE channel IN ({placeholders})
+                  AND ((status = 'queued' AND next_attempt <= ?)
+                       OR (status = 'in_progress' AND lease_expires < ?))
+                ORDER BY next_attempt, id
+                LIMIT ?
+            )
+            RETURNING *
+        ''', [owner, now + timedelta(seconds=lease_seconds), now, *channels, now, now, limit])
+        
+        columns = [description[0] for description in cursor.description]
+        tasks = []
+        for row in cursor.fetchall():
+            task = dict(zip(columns, row))
+            task['payload'] = json.loads(task['payload'])
+            tasks.append(task)
+        
+        conn.commit()
+        conn.close()
+        return tasks
+
+    def finish_application_task(self, task_id, status, error=None, next_attempt=None, refund_attempt=False):
+        """Record a task outcome: 'sent', 'failed', or back to 'queued' with a retry time"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE apply_queue
+            SET status = ?, last_error = ?, next_attempt = COALESCE(?, next_attempt),
+                attempts = attempts - ?, lease_owner = NULL, lease_expires = NULL, updated_date = ?
+            WHERE id = ?
+        ''', (status, error, next_attempt, 1 if refund_attempt else 0, datetime.now(), task_id))
+        conn.commit()
+        conn.close()
+
+    def get_application_tasks(self, channel=None, status=None, limit=100):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        query = 'SELECT * FROM apply_queue WHERE 1 = 1'
+        params = []
+        if channel:
+            query += ' AND channel = ?'
+            params.append(channel)
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+        query += ' ORDER BY created_date LIMIT ?'
+        params.append(limit)
+        cursor.execute(query, params)
+        
+        columns = [description[0] for description in cursor.description]
+        tasks = []
+        for row in cursor.fetchall():
+            task = dict(zip(columns, row))
+            task['payload'] = json.loads(task['payload'])
+            tasks.append(task)
+        
+        conn.close()
+        return tasks
+
+    def count_application_tasks(self, since):
+        """Tasks queued since a given time, on every channel"""
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute('SELECT COUNT(*) FROM apply_queue WHERE created_date >= ?', (since,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def get_apply_queue_counts(self):
+        """{(channel, status): count} for the apply queue"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT channel, status, COUNT(*) FROM apply_queue GROUP BY channel, status')
+        counts = {(channel, status): count for channel, status, count in cursor.fetchall()}
+        conn.close()
+        
+        return counts
+
+    def take_daily_quota(self, name, limit, day):
+        """Atomically count one use if today's count is below limit; returns True if counted"""
+        if limit <= 0:
+            return False
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO daily_quotas (day, name, used) VALUES (?, ?, 1)
+            ON CONFLICT (day, name) DO UPDATE SET used = used + 1 WHERE used < ?
+            RETURNING used
+        ''', (day, name, limit))
+        taken = cursor.fetchone() is not None
+        
+        conn.commit()
+        conn.close()
+        return taken
+
+    def release_daily_quota(self, name, day):
+        """Give back one use counted by take_daily_quota"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE daily_quotas SET used = used - 1 WHERE day = ? AND name = ? AND used > 0
+        ''', (day, name))
+        conn.commit()
+        conn.close()
+
+    def get_daily_quota_used(self, name, day):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT used FROM daily_quotas WHERE day = ? AND name = ?', (day, name))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return row[0] if row else 0
+
+    def lock_scheduled_job(self, name, owner, lock_seconds):
+        """Start a run unless another owner holds an unexpired lock; returns True if locked"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        now = datetime.now()
+        expires = now + timedelta(seconds=lock_seconds)
+        cursor.execute('''
+            INSERT INTO scheduler_jobs (name, last_started, lock_owner, lock_expires) VALUES (?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE
+            SET last_started = excluded.last_started, lock_owner = excluded.lock_owner,
+                lock_expires = excluded.lock_expires
+            WHERE lock_owner IS NULL OR lock_expires < ?
+            RETURNING name
+        ''', (name, now, owner, expires, now))
+        locked = cursor.fetchone() is not None
+        
+        conn.commit()
+        conn.close()
+        return locked
+
+    def refresh_scheduled_job_lock(self, name, owner, lock_seconds):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE scheduler_jobs SET lock_expires = ? WHERE name = ? AND lock_owner = ?
+        ''', (datetime.now() + timedelta(seconds=lock_seconds), name, owner))
+        conn.commit()
+        conn.close()
+
+    def finish_scheduled_job(self, name, owner, status, error=None):
+        """Record a run outcome and release the lock"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE scheduler_jobs
+            SET last_finished = ?, last_status = ?, last_error = ?, run_count = run_count + 1,
+                lock_owner = NULL, lock_expires = NULL
+            WHERE name = ? AND lock_owner = ?
+        ''', (datetime.now(), status, error, name, owner))
+        conn.commit()
+        conn.close()
+
+    def get_scheduled_jobs(self):
+        """{name: row} with the persisted state of every scheduler job"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT * FROM scheduler_jobs')
+        columns = [description[0] for description in cursor.description]
+        jobs = {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+        conn.close()
+        
+        return jobs
+
+    def get_watermark(self, source, scope=''):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT last_posted, last_id, seen_ids FROM source_watermarks WHERE source = ? AND scope = ?
+        ''', (source, scope))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        return {'last_posted': row[0], 'last_id': row[1], 'seen_ids': json.loads(row[2] or '[]')}
+
+    def save_watermark(self, source, scope, last_posted, last_id, seen_ids):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            INSERT INTO source_watermarks (source, scope, last_posted, last_id, seen_ids, updated_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source, scope) DO UPDATE
+            SET last_posted = excluded.last_posted, last_id = excluded.last_id,
+                seen_ids = excluded.seen_ids, updated_date = excluded.updated_date
+        ''', (source, scope, last_posted, last_id, json.dumps(list(seen_ids)), datetime.now()))
+        conn.commit()
+        conn.close()
+
+    def carry_jobs(self, scope, jobs):
+        """Keep {job_key: job} for a later run; a job keeps the date it was first found"""
+        conn = sqlite3.connect(self.db_path)
+        now = datetime.now()
+        conn.executemany('''
+            INSERT INTO carried_jobs (scope, job_key, payload, found_date) VALUES (?, ?, ?, ?)
+            ON CONFLICT (scope, job_key) DO UPDATE SET payload = excluded.payload
+        ''', [(scope, key, json.dumps(job, ensure_ascii=False, default=str), now) for key, job in jobs.items()])
+        conn.commit()
+        conn.close()
+
+    def get_carried_jobs(self, scope, found_after):
+        """{job_key: job} carried over in scope since found_after; older ones are dropped"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DELETE FROM carried_jobs WHERE found_date < ?', (found_after,))
+        conn.commit()
+        rows = conn.execute('''
+            SELECT job_key, payload FROM carried_jobs WHERE scope = ? ORDER BY found_date
+        ''', (scope,)).fetchall()
+        conn.close()
+        return {key: json.loads(payload) for key, payload in rows}
+
+    def delete_carried_jobs(self, scope, job_keys):
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany('DELETE FROM carried_jobs WHERE scope = ? AND job_key = ?',
+                         [(scope, key) for key in job_keys])
+        conn.commit()
+        conn.close()
+
+    def add_saved_jobs(self, rows):
+        """Bulk insert (job_key, *SAVED_JOB_FIELDS, extra) rows, skipping job keys already saved
+
+        Returns how many rows were new.
+        """
+        conn = sqlite3.connect(self.db_path)
+        before = conn.total_changes
+        placeholders = ', '.join('?' * (len(SAVED_JOB_FIELDS) + 2))
+        conn.executemany(f'''
+            INSERT OR IGNORE INTO saved_jobs (job_key, {', '.join(SAVED_JOB_FIELDS)}, extra)
+            VALUES ({placeholders})
+        ''', rows)
+        conn.commit()
+        inserted = conn.total_changes - before
+        conn.close()
+        
+        return inserted
+
+    def get_saved_jobs(self, limit=None, offset=0):
+        """Saved jobs as dicts in the order they were added, without empty fields"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(f'''
+            SELECT {', '.join(SAVED_JOB_FIELDS)}, extra FROM saved_jobs ORDER BY id LIMIT ? OFFSET ?
+        ''', (-1 if limit is None else limit, offset))
+        
+        jobs = []
+        for row in cursor.fetchall():
+            job = json.loads(row[-1]) if row[-1] else {}
+            job.update((field, value) for field, value in zip(SAVED_JOB_FIELDS, row) if value)
+            jobs.append(job)
+        
+        conn.close()
+        return jobs
+
+    def delete_saved_job(self, job_key):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DELETE FROM saved_jobs WHERE job_key = ?', (job_key,))
+        conn.commit()
+        conn.close()
+
+    def count_saved_jobs(self):
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute('SELECT COUNT(*) FROM saved_jobs').fetchone()[0]
+        conn.close()
+        return count
+
+    def add_document(self, kind, content_hash, base_id, encoding, payload, size):
+        """Store a document; returns its id (the existing one if this content is already stored)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR IGNORE INTO documents
+            (kind, content_hash, base_id, encoding, payload, size, stored_size, created_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (kind, content_hash, base_id, encoding, payload, size, len(payload), datetime.now()))
+        conn.commit()
+        doc_id = cursor.execute('SELECT id FROM documents WHERE content_hash = ?', (content_hash,)).fetchone()[0]
+        conn.close()
+        return doc_id
+
+    def get_document(self, doc_id):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, kind, base_id, encoding, payload FROM documents WHERE id = ?', (doc_id,))
+        row = cursor.fetchone()
+        columns = [description[0] for description in cursor.description]
+        conn.close()
+        return dict(zip(columns, row)) if row else None
+
+    def get_document_id(self, content_hash):
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT id FROM documents WHERE content_hash = ?', (content_hash,)).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def get_document_sizes(self):
+        """Document count, text bytes and stored bytes per kind and encoding"""
+        return self.query('''
+            SELECT kind, encoding, COUNT(*) AS documents,
+                   SUM(size) AS text_bytes, SUM(stored_size) AS stored_bytes
+            FROM documents GROUP BY kind, encoding ORDER BY kind, encoding
+        ''')
+
+    def add_blob(self, content_hash, size, stored_size, compression):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            INSERT OR IGNORE INTO blobs (hash, size, stored_size, compression, created_date)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (content_hash, size, stored_size, compression, datetime.now()))
+        conn.commit()
+        conn.close()
+
+    def get_blob_stats(self):
+        """Blob count, content bytes and stored bytes"""
+        return self.query('''
+            SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS size, COALESCE(SUM(stored_size), 0) AS stored_size
+            FROM blobs
+        ''')[0]
+
+    def query(self, query, params=()):
+        """Run a read-only query and return the rows as dicts"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def get_column_types(self, table):
+        """(name, declared type) of a table's columns, in table order"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return [(row[1], row[2]) for row in conn.execute(f'PRAGMA table_info({table})')]
+        finally:
+            conn.close()
+
+    def stream_rows(self, query, params=(), chunksize=1000):
+        """Run a SELECT and yield (columns, rows) chunks, fetched incrementally from the cursor
+
+        The first chunk is always yielded (possibly empty) so callers get the columns.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query, params)
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchmany(chunksize)
+            yield columns, rows
+            while rows:
+                rows = cursor.fetchmany(chunksize)
+                if rows:
+                    yield columns, rows
+        finally:
+            conn.close()
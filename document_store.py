@@ -0,0 +1,200 @@
+"""
+Document store for generated resumes and cover letters
+A tailored resume is kept as a compressed line diff against the base resume it was made
+from; other documents as compressed full text. Identical documents are stored once.
+"""
+
+import difflib
+import hashlib
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_delta(base_lines, lines):
+    """Ops that rebuild lines from base_lines: [start, end] copies base lines, a string is new text"""
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base_lines, ops):
+    return ''.join(op if isinstance(op, str) else ''.join(base_lines[op[0]:op[1]]) for op in ops)
+
+
+class DocumentStore:
+    """Stores documents in the documents table and rebuilds them on read
+
+    Deltas always point at a full-text document, so reading one takes at most two
+    rows; recently used bases are kept split into lines.
+    """
+
+    def __init__(self, db=None, level=9, cache_size=16):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.db = db
+        self.level = level
+        self.cache_size = cache_size
+        self._bases = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _base_lines(self, doc_id):
+        with self._lock:
+            lines = self._bases.get(doc_id)
+            if lines is not None:
+                self._bases.move_to_end(doc_id)
+                return lines
+        lines = self.get(doc_id).splitlines(keepends=True)
+        with self._lock:
+            self._bases[doc_id] = lines
+            while len(self._bases) > self.cache_size:
+                self._bases.popitem(last=False)
+        return lines
+
+    def put(self, text, kind, base_id=None):
+        """Store a document (as a diff against base_id when that is smaller); returns its id"""
+        text = text or ''
+        digest = content_hash(text)
+        existing = self.db.get_document_id(digest)
+        if existing is not None:
+            return existing
+
+        encoding, payload = 'zlib', zlib.compress(text.encode('utf-8'), self.level)
+        if base_id is not None:
+            base = self.db.get_document(base_id)
+            if base['encoding'] == 'delta':
+                base_id = base['base_id']
+            ops = make_delta(self._base_lines(base_id), text.splitlines(keepends=True))
+            delta = zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), self.level)
+            if len(delta) < len(payload):
+                encoding, payload = 'delta', delta
+        return self.db.add_document(kind, digest, base_id if encoding == 'delta' else None,
+                                    encoding, payload, len(text.encode('utf-8')))
+
+    def put_base(self, text):
+        """Store the resume tailored documents are diffed against"""
+        return self.put(text, 'base_resume')
+
+    def get(self, doc_id):
+        """Full text of a document, or None if there is no such document"""
+        doc = self.db.get_document(doc_id)
+        if doc is None:
+            return None
+        data = zlib.decompress(doc['payload']).decode('utf-8')
+        if doc['encoding'] == 'delta':
+            return apply_delta(self._base_lines(doc['base_id']), json.loads(data))
+        return data
+
+    def size_report(self):
+        """Documents, their text size and what is stored, overall and per kind/encoding"""
+        rows = self.db.get_document_sizes()
+        text = sum(row['text_bytes'] for row in rows)
+        stored = sum(row['stored_bytes'] for row in rows)
+        return {
+            'documents': sum(row['documents'] for row in rows),
+            'text_bytes': text,
+            'stored_bytes': stored,
+            'ratio': round(text / stored, 1) if stored else None,
+            'by_kind': rows,
+        }
+
+
+def sample_documents(applications, seed=7):
+    """A base resume plus tailored resumes and cover letters like ResumeTailor produces"""
+    import random
+    rng = random.Random(seed)
+    skills = ['Python', 'Django', 'Flask', 'FastAPI', 'SQL', 'PostgreSQL', 'Docker', 'Kubernetes',
+              'AWS', 'Redis', 'Celery', 'pandas', 'REST APIs', 'CI/CD', 'Git', 'Linux', 'React', 'TypeScript']
+    experience = [
+        f"- {verb} {thing} for {who}, {result}\n"
+        for verb, thing, who, result in zip(
+            ['Built', 'Designed', 'Maintained', 'Migrated', 'Optimised', 'Led', 'Automated', 'Shipped'] * 4,
+            ['a REST API', 'the data pipeline', 'the billing service', 'legacy jobs', 'SQL queries',
+             'a team of three', 'the deployment', 'a reporting dashboard'] * 4,
+            ['an e-commerce platform', 'internal tools', 'a logistics company', 'mobile clients'] * 8,
+            ['cutting response times by 40%', 'serving 2M requests a day', 'saving 10 hours a week',
+             'with 95% test coverage'] * 8,
+        )
+    ]
+    base = ''.join([
+        "JOHN DOE\nPython Developer | Thessaloniki, Greece | john@example.com\n\n",
+        "SUMMARY\nBackend developer with 5 years of experience building web services.\n\n",
+        "SKILLS\n", ', '.join(skills), "\n\n",
+        "EXPERIENCE\n", *experience, "\n",
+        "EDUCATION\nBSc Computer Science, Aristotle University of Thessaloniki\n",
+    ])
+    base_lines = base.splitlines(keepends=True)
+    for i in range(applications):
+        company, position = f"Company {i}", rng.choice(['Python Developer', 'Backend Engineer', 'Data Engineer'])
+        lines = list(base_lines)
+        # Tailoring rewrites the summary, reorders skills and rephrases a few bullets
+        lines[4] = f"{position} with 5 years of experience, excited to help {company} with {rng.choice(skills)}.\n"
+        lines[7] = ', '.join(rng.sample(skills, len(skills))) + '\n'
+        for n in rng.sample(range(10, 10 + len(experience)), 3):
+            lines[n] = lines[n].rstrip('\n') + f", relevant to {company}'s {rng.choice(skills)} stack\n"
+        resume = ''.join(lines)
+        cover = (f"Dear {company} Hiring Team,\n\nI am excited to apply for the {position} position. "
+                 f"With my experience in {', '.join(rng.sample(skills, 3))}, I believe I would be a strong fit.\n\n"
+                 + ''.join(rng.sample(experience, 4))
+                 + "\nThank you for considering my application.\n\nBest regards,\nJohn Doe\n")
+        yield base, resume, cover
+
+
+def benchmark(applications=5000, block=4096):
+    """Disk used by one .txt file per document vs the document store, and read speed"""
+    import os
+    import shutil
+    import tempfile
+    from database import Database
+
+    folder = tempfile.mkdtemp()
+    try:
+        store = DocumentStore(Database(os.path.join(folder, 'applications.db')))
+        files_bytes = files_disk = 0
+        ids = []
+        start = time.perf_counter()
+        for base, resume, cover in sample_documents(applications):
+            base_id = store.put_base(base)
+            ids.append(store.put(resume, 'resume', base_id))
+            ids.append(store.put(cover, 'cover_letter'))
+            for text in (resume, cover):
+                size = len(text.encode('utf-8'))
+                files_bytes += size
+                files_disk += -(-size // block) * block
+        write = time.perf_counter() - start
+
+        report = store.size_report()
+        db_size = os.path.getsize(store.db.db_path)
+        print(f"📊 {applications:,} applications ({len(ids):,} documents), stored in {write:.1f}s")
+        print(f"   .txt files: {files_bytes / 1024 / 1024:.1f} MB of text, "
+              f"{files_disk / 1024 / 1024:.1f} MB on disk in {block // 1024} KB blocks")
+        print(f"   document store: {report['stored_bytes'] / 1024 / 1024:.2f} MB of payloads "
+              f"({report['ratio']}x smaller), database file {db_size / 1024 / 1024:.1f} MB "
+              f"({files_disk / db_size:.1f}x less disk)")
+        for row in report['by_kind']:
+            print(f"     {row['kind']} ({row['encoding']}): {row['documents']:,} docs, "
+                  f"{row['text_bytes'] / row['documents']:,.0f} → {row['stored_bytes'] / row['documents']:,.0f} bytes each")
+
+        start = time.perf_counter()
+        for doc_id in ids:
+            store.get(doc_id)
+        read = time.perf_counter() - start
+        print(f"   reconstruction: {read / len(ids) * 1e6:.0f} µs per document")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark()
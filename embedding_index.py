@@ -0,0 +1,199 @@
+"""
+Offline embedding index for semantic job matching
+Vectors live in a memory-mapped .npy file with a JSON id map alongside
+"""
+
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+
+from relevance import tokenize
+
+
+class HashingEmbedder:
+    """Hashing-trick embeddings over unigrams and bigrams; needs no model"""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.model_id = 'hashing'
+
+    def _features(self, text):
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode('utf-8'))
+                vectors[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return normalize(vectors)
+
+
+class LocalModelEmbedder:
+    """Embeddings from a locally installed sentence-transformers model"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.model_id = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), convert_to_numpy=True)
+        return normalize(vectors.astype(np.float32))
+
+
+def normalize(vectors):
+    """L2-normalise rows so a dot product is a cosine similarity"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def get_embedder():
+    """Configured local model if available, hashing-trick vectors otherwise"""
+    from config import Config
+    if Config.EMBEDDING_MODEL:
+        try:
+            return LocalModelEmbedder(Config.EMBEDDING_MODEL)
+        except Exception as e:
+            print(f"⚠️ Could not load embedding model {Config.EMBEDDING_MODEL}: {e}")
+            print("   Falling back to hashing-trick embeddings")
+    return HashingEmbedder()
+
+
+class EmbeddingIndex:
+    """Vectors from one embedder; a different model or dimension rebuilds the index"""
+
+    def __init__(self, path, dim=256, model=None, initial_capacity=1024):
+        self.path = path
+        self.vectors_path = f"{path}.npy"
+        self.ids_path = f"{path}_ids.json"
+        self.dim = dim
+        self.model = model
+        self.ids = []
+        self.positions = {}
+        self.vectors = None
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._load(initial_capacity)
+
+    def _load(self, initial_capacity):
+        if os.path.exists(self.vectors_path) and os.path.exists(self.ids_path):
+            with open(self.ids_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get('dim') == self.dim and meta.get('model') == self.model:
+                self.ids = meta['ids']
+                self.positions = {item_id: i for i, item_id in enumerate(self.ids)}
+                self.vectors = np.load(self.vectors_path, mmap_mode='r+')
+                return
+            if meta.get('model') != self.model:
+                # Vectors from another model aren't comparable, even at the same dimension
+                print(f"⚠️ Embedding model changed ({meta.get('model')} -> {self.model}), rebuilding index")
+            else:
+                print(f"⚠️ Embedding dimension changed ({meta.get('dim')} -> {self.dim}), rebuilding index")
+
+        self.vectors = np.lib.format.open_memmap(
+            self.vectors_path, mode='w+', dtype=np.float32, shape=(initial_capacity, self.dim)
+        )
+        self._save_ids()
+
+    def _save_ids(self):
+        tmp_path = f"{self.ids_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'dim': self.dim, 'model': self.model, 'ids': self.ids}, f)
+        os.replace(tmp_path, self.ids_path)
+
+    def _grow(self, needed):
+        capacity = self.vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        old = self.vectors
+        tmp_path = f"{self.path}.grow.npy"
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=np.float32, shape=(capacity, self.dim)
+        )
+        grown[:len(self.ids)] = old[:len(self.ids)]
+        grown.flush()
+        del old, grown
+        self.vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self.vectors = np.load(self.vectors_path, mmap_mode='r+')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return item_id in self.positions
+
+    def add(self, ids, vectors):
+        """Add or replace vectors; existing ids are updated in place
+
+        An id repeated within the batch keeps its first vector.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        first = {}
+        for i, item_id in enumerate(ids):
+            first.setdefault(item_id, i)
+        if len(first) < len(ids):
+            ids, vectors = list(first), vectors[list(first.values())]
+        new_ids = [item_id for item_id in ids if item_id not in self.positions]
+        self._grow(len(self.ids) + len(new_ids))
+
+        for item_id in new_ids:
+            self.positions[item_id] = len(self.ids)
+            self.ids.append(item_id)
+
+        rows = [self.positions[item_id] for item_id in ids]
+        self.vectors[rows] = vectors
+        self.vectors.flush()
+        self._save_ids()
+
+    def search(self, vector, k=10):
+        """Top-k (id, cosine score) pairs for a normalised query vector"""
+        count = len(self.ids)
+        if count == 0:
+            return []
+        scores = self.vectors[:count] @ np.asarray(vector, dtype=np.float32).ravel()
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+
+def benchmark(num_jobs=100000, dim=256):
+    """Time a top-10 query over a synthetic 100k-vector index"""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = EmbeddingIndex(os.path.join(tmp, 'jobs'), dim=dim)
+        rng = np.random.default_rng(0)
+        batch = 10000
+        start = time.perf_counter()
+        for offset in range(0, num_jobs, batch):
+            vectors = normalize(rng.standard_normal((batch, dim)).astype(np.float32))
+            index.add([f"job-{offset + i}" for i in range(batch)], vectors)
+        build_time = time.perf_counter() - start
+
+        query = HashingEmbedder(dim).embed(['python backend developer django'])[0]
+        index.search(query, k=10)  # warm the page cache
+        start = time.perf_counter()
+        runs = 20
+        for _ in range(runs):
+            index.search(query, k=10)
+        query_time = (time.perf_counter() - start) / runs
+
+        print(f"📊 {num_jobs} vectors x {dim} dims")
+        print(f"   Build: {build_time * 1000:.0f} ms")
+        print(f"   Top-10 query: {query_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,152 @@
+"""
+Bulk export of applications, follow-ups and saved jobs
+Rows are read from the database in chunks and written as CSV, JSONL or Parquet
+(pyarrow) one chunk at a time, so a large history is never held in memory
+"""
+
+import csv
+import io
+import json
+import os
+
+from database import Database
+
+DATASETS = {
+    'applications': 'applications',
+    'follow_ups': 'follow_ups',
+    'jobs': 'saved_jobs',
+}
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+def _parquet_modules():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export needs pyarrow: pip install pyarrow")
+    return pa, pq
+
+
+def arrow_type(pa, declared):
+    """Arrow type for a declared SQLite column type, following SQLite's affinity rules"""
+    declared = (declared or '').upper()
+    if 'INT' in declared or 'BOOL' in declared:
+        return pa.int64()
+    if any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+        return pa.float64()
+    if declared == 'BLOB':
+        return pa.binary()
+    # TEXT, and TIMESTAMP columns, which hold ISO-formatted strings
+    return pa.string()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose contents are taken out after each Parquet row group"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def take(self):
+        data, self.buffer = bytes(self.buffer), bytearray()
+        return data
+
+
+class Exporter:
+    def __init__(self, db=None, chunksize=5000):
+        self.db = db or Database()
+        self.chunksize = chunksize
+
+    def chunks(self, dataset):
+        return self.db.stream_rows(f'SELECT * FROM {DATASETS[dataset]} ORDER BY id', chunksize=self.chunksize)
+
+    def parquet_schema(self, dataset):
+        """Schema from the table's declared column types, so it holds for every chunk"""
+        pa, _ = _parquet_modules()
+        return pa.schema([pa.field(name, arrow_type(pa, declared))
+                          for name, declared in self.db.get_column_types(DATASETS[dataset])])
+
+    def iter_csv(self, dataset):
+        """CSV text, one piece per chunk (header first)"""
+        for index, (columns, rows) in enumerate(self.chunks(dataset)):
+            out = io.StringIO()
+            writer = csv.writer(out)
+            if index == 0:
+                writer.writerow(columns)
+            writer.writerows(rows)
+            yield out.getvalue()
+
+    def iter_jsonl(self, dataset):
+        """One JSON object per line, one piece per chunk"""
+        for columns, rows in self.chunks(dataset):
+            yield ''.join(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n' for row in rows)
+
+    def iter_parquet(self, dataset):
+        """Parquet bytes, one row group per chunk"""
+        pa, pq = _parquet_modules()
+        schema = self.parquet_schema(dataset)
+        sink = _Drain()
+        writer = None
+        try:
+            for columns, rows in self.chunks(dataset):
+                arrays = []
+                for index, name in enumerate(columns):
+                    values = [row[index] for row in rows]
+                    field = schema.field(name)
+                    if pa.types.is_string(field.type):
+                        values = [value if value is None or isinstance(value, str) else str(value)
+                                  for value in values]
+                    arrays.append(pa.array(values, type=field.type))
+                table = pa.Table.from_arrays(arrays, schema=schema)
+                if writer is None:
+                    writer = pq.ParquetWriter(sink, schema)
+                writer.write_table(table)
+                yield sink.take()
+        finally:
+            if writer is not None:
+                writer.close()
+        yield sink.take()
+
+    def iter_export(self, dataset, fmt):
+        """Chunks of the export as str (csv, jsonl) or bytes (parquet)
+
+        Bad arguments and a missing pyarrow raise ExportError here, before anything is streamed.
+        """
+        if dataset not in DATASETS:
+            raise ExportError(f"Unknown dataset {dataset!r}; choose from {', '.join(DATASETS)}")
+        if fmt not in FORMATS:
+            raise ExportError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+        if fmt == 'parquet':
+            _parquet_modules()
+        return getattr(self, f'iter_{fmt}')(dataset)
+
+    def export(self, dataset, fmt, path=None):
+        """Write an export file; returns its path"""
+        path = path or os.path.join('data', 'exports', f"{dataset}.{fmt}")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        pieces = self.iter_export(dataset, fmt)
+        if fmt == 'parquet':
+            with open(path, 'wb') as f:
+                for piece in pieces:
+                    f.write(piece)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for piece in pieces:
+                    f.write(piece)
+        return path
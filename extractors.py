@@ -0,0 +1,328 @@
+"""
+Declarative extractor registry for job-board HTML
+Each site is a spec of card selectors and per-field selector fallbacks with transforms,
+compiled once and applied in a single pass per document
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+# Selector that refers to the card element itself
+SELF = None
+
+
+def _text(value, context):
+    return ' '.join(value.split()) if value else None
+
+
+def _truncate_300(value, context):
+    return value[:300] if value else value
+
+
+def _absolute_url(value, context):
+    base_url = context.get('base_url')
+    return urljoin(base_url, value) if value and base_url else value
+
+
+# Named transforms usable from specs; applied left to right after whitespace cleanup
+TRANSFORMS = {
+    'text': _text,
+    'truncate_300': _truncate_300,
+    'absolute_url': _absolute_url,
+}
+
+SITE_SPECS = {
+    'indeed': {
+        'cards': [
+            'div.job_seen_beacon',
+            'div.jobsearch-SerpJobCard',
+            'div.slider_container',
+            'div.cardOutline',
+            'div[data-jk]',
+            'td.resultContent',
+            'div[id*="job_"]',
+        ],
+        'fields': {
+            'title': {'selectors': [
+                ('h2.jobTitle span[title]', 'title'),
+                ('h2.jobTitle a span', None),
+                ('a[data-testid="job-title"]', None),
+                ('h2.jobTitle', None),
+                ('span[title]', 'title'),
+            ]},
+            'company': {'selectors': [
+                ('span.companyName', None),
+                ('[data-testid="company-name"]', None),
+                ('div.companyName', None),
+            ]},
+            'location': {'selectors': [
+                ('div.companyLocation', None),
+                ('[data-testid="text-location"]', None),
+            ]},
+            'salary': {'selectors': [
+                ('div.salary-snippet', None),
+                ('[data-testid="attribute_snippet_testid"]', None),
+            ]},
+            'job_key': {'selectors': [
+                (SELF, 'data-jk'),
+                ('a[data-jk]', 'data-jk'),
+            ]},
+            'url': {'selectors': [
+                ('h2.jobTitle a', 'href'),
+                ('a[data-jk]', 'href'),
+            ], 'transforms': ['absolute_url']},
+            'description': {'selectors': [
+                (SELF, None),
+            ], 'transforms': ['truncate_300']},
+        },
+        'links': {
+            'next_page': [
+                'a[data-testid="pagination-page-next"]',
+                'a[aria-label="Next Page"]',
+                'a[aria-label="Next"]',
+            ],
+        },
+    },
+    # A job's own page: the whole document is the single "card"
+    'indeed_detail': {
+        'cards': ['body'],
+        'fields': {
+            'title': {'selectors': [
+                ('h1.jobsearch-JobInfoHeader-title', None),
+                ('[data-testid="jobsearch-JobInfoHeader-title"]', None),
+                ('h1', None),
+            ]},
+            'company': {'selectors': [
+                ('[data-testid="inlineHeader-companyName"]', None),
+                ('[data-company-name="true"]', None),
+            ]},
+            'description': {'selectors': [
+                ('#jobDescriptionText', None),
+                ('div.jobsearch-jobDescriptionText', None),
+                ('[data-testid="jobDescriptionText"]', None),
+            ]},
+        },
+    },
+    'ycombinator': {
+        'cards': ['a.job-listing'],
+        'fields': {
+            'title': {'selectors': [('h3', None)]},
+            'company': {'selectors': [('div.company', None)]},
+            'url': {'selectors': [(SELF, 'href')], 'transforms': ['absolute_url']},
+            'description': {'selectors': [(SELF, None)]},
+        },
+    },
+    'linkedin': {
+        'cards': ['.job-card-container', 'li.jobs-search-results__list-item'],
+        'fields': {
+            'title': {'selectors': [('.job-card-list__title', None), ('a.job-card-container__link', None)]},
+            'company': {'selectors': [('.job-card-container__company-name', None),
+                                      ('.job-card-container__primary-description', None)]},
+            'location': {'selectors': [('.job-card-container__metadata-item', None)]},
+            'url': {'selectors': [('a.job-card-container__link', 'href')], 'transforms': ['absolute_url']},
+        },
+    },
+}
+
+
+# Runs inside the page: one round-trip returns every card plus the winning selector per field
+EXTRACT_CARDS_JS = """
+const config = arguments[0];
+let cards = [];
+let matched = null;
+for (const selector of config.cards) {
+    cards = Array.from(document.querySelectorAll(selector));
+    if (cards.length) { matched = selector; break; }
+}
+if (config.limit) { cards = cards.slice(0, config.limit); }
+return JSON.stringify({matched: matched, cards: cards.map(card => {
+    const job = {}, wins = {};
+    for (const [field, options] of Object.entries(config.fields)) {
+        job[field] = null;
+        wins[field] = 'missing';
+        for (const [selector, attribute] of options) {
+            const el = selector === null ? card : card.querySelector(selector);
+            if (!el) continue;
+            const value = attribute ? el.getAttribute(attribute) : el.textContent;
+            if (value && value.trim()) { job[field] = value; wins[field] = selector || 'self'; break; }
+        }
+    }
+    return {job: job, wins: wins};
+})});
+"""
+
+
+class CompiledSpec:
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.cards = [(selector, CSSSelector(selector)) for selector in spec['cards']]
+        self.fields = {}
+        for field, field_spec in spec['fields'].items():
+            options = [
+                (selector or 'self', CSSSelector(selector) if selector else None, attribute)
+                for selector, attribute in field_spec['selectors']
+            ]
+            transforms = [TRANSFORMS['text']] + [TRANSFORMS[t] for t in field_spec.get('transforms', [])]
+            self.fields[field] = (options, transforms)
+
+        self.links = {
+            name: [(selector, CSSSelector(selector)) for selector in selectors]
+            for name, selectors in spec.get('links', {}).items()
+        }
+
+        self.documents = 0
+        self.card_wins = Counter()
+        self.field_wins = {field: Counter() for field in self.fields}
+        self._lock = threading.Lock()
+
+    def _value(self, card, options):
+        for label, selector, attribute in options:
+            elements = [card] if selector is None else selector(card)
+            for element in elements:
+                value = element.get(attribute) if attribute else element.text_content()
+                if value and value.strip():
+                    return label, value
+        return 'missing', None
+
+    def extract(self, root, limit=None, base_url=None):
+        """Apply the spec to a parsed document; returns a list of field dicts"""
+        context = {'base_url': base_url}
+        cards = []
+        card_label = 'none'
+        for selector_text, selector in self.cards:
+            cards = selector(root)
+            if cards:
+                card_label = selector_text
+                break
+        if limit:
+            cards = cards[:limit]
+
+        results = []
+        wins = []
+        for card in cards:
+            record = {}
+            for field, (options, transforms) in self.fields.items():
+                label, value = self._value(card, options)
+                for transform in transforms:
+                    value = transform(value, context)
+                record[field] = value
+                wins.append((field, label))
+            results.append(record)
+
+        self._record(card_label, wins)
+        return results
+
+    def link(self, root, name, base_url=None):
+        """First href matched by a page-level link spec (e.g. next_page), made absolute"""
+        for _, selector in self.links.get(name, []):
+            for element in selector(root):
+                href = element.get('href')
+                if href:
+                    return urljoin(base_url, href) if base_url else href
+        return None
+
+    def extract_in_browser(self, driver, limit=None):
+        """Same spec evaluated inside the page with a single execute_script call"""
+        config = {
+            'cards': [selector for selector, _ in self.cards],
+            'fields': {field: field_spec['selectors'] for field, field_spec in self.spec['fields'].items()},
+            'limit': limit,
+        }
+        result = json.loads(driver.execute_script(EXTRACT_CARDS_JS, config))
+        context = {'base_url': driver.current_url}
+
+        results = []
+        wins = []
+        for card in result['cards']:
+            record = {}
+            for field, (_, transforms) in self.fields.items():
+                value = card['job'].get(field)
+                for transform in transforms:
+                    value = transform(value, context)
+                record[field] = value
+                wins.append((field, card['wins'].get(field, 'missing')))
+            results.append(record)
+
+        self._record(result['matched'] or 'none', wins)
+        return results
+
+    def _record(self, card_label, wins):
+        with self._lock:
+            self.documents += 1
+            self.card_wins[card_label] += 1
+            for field, label in wins:
+                self.field_wins[field][label] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'documents': self.documents,
+                'cards': dict(self.card_wins),
+                'fields': {field: dict(counter) for field, counter in self.field_wins.items()}
+            }
+
+    def unused_selectors(self):
+        """Selectors that never won so far; candidates for pruning"""
+        with self._lock:
+            unused = {'cards': [s for s, _ in self.cards if not self.card_wins[s]]}
+            for field, (options, _) in self.fields.items():
+                unused[field] = [label for label, _, _ in options if not self.field_wins[field][label]]
+        return unused
+
+
+class ExtractorRegistry:
+    def __init__(self, specs=None):
+        self.sites = {}
+        for name, spec in (specs or {}).items():
+            self.register(name, spec)
+
+    def register(self, name, spec):
+        """Compile and register a site spec"""
+        self.sites[name] = CompiledSpec(name, spec)
+        return self.sites[name]
+
+    def get(self, name):
+        return self.sites[name]
+
+    def extract(self, site, document, limit=None, base_url=None):
+        """Parse HTML (str/bytes) once and extract every card for a site"""
+        if isinstance(document, (str, bytes)):
+            if not document.strip():
+                return []
+            root = lxml_html.fromstring(document)
+        else:
+            root = document
+        return self.sites[site].extract(root, limit=limit, base_url=base_url)
+
+    def parse(self, document):
+        """Parse once, to run several specs or link lookups over the same tree"""
+        return lxml_html.fromstring(document)
+
+    def extract_in_browser(self, site, driver, limit=None):
+        """Extract every card for a site from the driver's current page"""
+        return self.sites[site].extract_in_browser(driver, limit=limit)
+
+    def report(self):
+        """Print which selectors won, so slow fallbacks can be pruned"""
+        for name, compiled in self.sites.items():
+            stats = compiled.stats()
+            if not stats['documents']:
+                continue
+            print(f"🧩 {name}: {stats['documents']} documents, cards via {stats['cards']}")
+            for field, wins in stats['fields'].items():
+                print(f"   {field}: {wins}")
+
+    def save_stats(self, path='data/extractor_stats.json'):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({name: compiled.stats() for name, compiled in self.sites.items()}, f, indent=2)
+
+
+registry = ExtractorRegistry(SITE_SPECS)
@@ -0,0 +1,184 @@
+"""
+Follow-ups for applications
+Every application gets a follow-up Config.FOLLOW_UP_DAYS after it was sent. Due ones are
+found with one indexed range query and emailed in batches through the mailer's outbox;
+those without a contact email are left as reminders on the dashboard and in the CLI
+"""
+
+import heapq
+import time
+from datetime import datetime
+
+from config import Config
+
+
+def follow_up_message(follow_up):
+    """Subject and body of the follow-up email for one application"""
+    applied = (follow_up.get('date_applied') or '')[:10]
+    subject = f"Following up on my application for {follow_up['position']}"
+    body = (
+        f"Dear {follow_up['company']} Hiring Team,\n\n"
+        f"I applied for the {follow_up['position']} position{f' on {applied}' if applied else ''} "
+        f"and wanted to follow up on my application.\n\n"
+        f"I am still very interested in the role and would welcome the chance to discuss "
+        f"how I could contribute to your team. Please let me know if you need anything else from me.\n\n"
+        f"Thank you for your time and consideration.\n\n"
+        f"Best regards"
+    )
+    return subject, body
+
+
+class FollowUpEngine:
+    """Schedules follow-ups and sends the ones that are due
+
+    The dates of the next pending follow-ups are kept in a heap, so asking whether
+    anything is due costs nothing until the soonest one comes up. The heap is reloaded
+    from the index every refresh_seconds to pick up applications logged elsewhere.
+    """
+
+    def __init__(self, db=None, days=None, batch_size=50, window=100, refresh_seconds=900, max_overdue_days=None):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.db = db
+        self.days = Config.FOLLOW_UP_DAYS if days is None else days
+        self.max_overdue_days = Config.FOLLOW_UP_MAX_OVERDUE_DAYS if max_overdue_days is None else max_overdue_days
+        self.batch_size = batch_size
+        self.window = window
+        self.refresh_seconds = refresh_seconds
+        self._heap = []
+        self._loaded_at = None
+
+    def sync(self):
+        """Schedule follow-ups for applications logged since the last sync; returns how many"""
+        added = self.db.schedule_follow_ups(self.days, self.max_overdue_days)
+        if added:
+            self._loaded_at = None
+        return added
+
+    def refresh(self):
+        self._heap = [(str(date), follow_up_id) for date, follow_up_id in self.db.get_upcoming_follow_ups(self.window)]
+        heapq.heapify(self._heap)
+        self._loaded_at = time.monotonic()
+
+    def schedule(self, application_id, when, notes=None):
+        """Add an extra follow-up, e.g. a second one after no reply"""
+        follow_up_id = self.db.add_follow_up(application_id, when, notes)
+        heapq.heappush(self._heap, (str(when), follow_up_id))
+        return follow_up_id
+
+    def next_due(self):
+        """When the soonest pending follow-up is due (as stored), or None"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self.sync()
+            self.refresh()
+        return self._heap[0][0] if self._heap else None
+
+    def reminders(self, limit=10, now=None):
+        """(count, first follow-ups) due by now, including those waiting to be done by hand"""
+        self.sync()
+        now = now or datetime.now()
+        statuses = ('pending', 'manual')
+        return (self.db.count_due_follow_ups(now, statuses),
+                self.db.get_due_follow_ups(now, limit, statuses))
+
+    def run(self, mailer=None, sender=None, now=None):
+        """Email every due follow-up that has a contact address; the rest become manual reminders
+
+        Messages go into the outbox a batch at a time and are flushed once at the end.
+        Returns {'queued': n, 'manual': n}.
+        """
+        now = now or datetime.now()
+        stats = {'queued': 0, 'manual': 0}
+        next_due = self.next_due()
+        if next_due is None or next_due > str(now):
+            return stats
+
+        while True:
+            batch = self.db.get_due_follow_ups(now, self.batch_size)
+            if not batch:
+                break
+            queued = []
+            manual = []
+            for follow_up in batch:
+                if mailer is None or not follow_up['contact_email']:
+                    manual.append(follow_up['id'])
+                    continue
+                subject, body = follow_up_message(follow_up)
+                mailer.enqueue(sender, follow_up['contact_email'], subject, body,
+                               application_id=follow_up['application_id'])
+                queued.append(follow_up['id'])
+            self.db.mark_follow_ups(queued, 'sent', f"Emailed on {now.strftime('%Y-%m-%d')}")
+            self.db.mark_follow_ups(manual, 'manual')
+            stats['queued'] += len(queued)
+            stats['manual'] += len(manual)
+
+        if stats['queued']:
+            mailer.flush()
+        self.refresh()
+        return stats
+
+
+def benchmark(applications=200000, due_fraction=0.01):
+    """Due follow-ups via the indexed query vs scanning every application in Python"""
+    import os
+    import random
+    import shutil
+    import sqlite3
+    import tempfile
+    from datetime import timedelta
+    from database import Database
+
+    folder = tempfile.mkdtemp()
+    try:
+        db = Database(os.path.join(folder, 'applications.db'))
+        now = datetime.now()
+        due = int(applications * due_fraction)
+        # Old applications have had their reply; only the last `due` are still waiting
+        rows = []
+        for i in range(applications):
+            applied = now - timedelta(days=400 * (applications - i) / applications)
+            status = 'applied' if i >= applications - due or i % 2 else 'rejected'
+            rows.append((f'Company {i}', 'Python Developer', applied, status,
+                         f'hr{i}@example.com' if random.random() < 0.8 else None))
+        conn = sqlite3.connect(db.db_path)
+        conn.executemany('''
+            INSERT INTO applications (company, position, date_applied, status, contact_email)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+
+        engine = FollowUpEngine(db)
+        start = time.perf_counter()
+        scheduled = engine.sync()
+        print(f"📊 {applications:,} applications: scheduled {scheduled:,} follow-ups in {time.perf_counter() - start:.2f}s")
+        start = time.perf_counter()
+        engine.sync()
+        print(f"   incremental sync with nothing new: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        count = db.count_due_follow_ups(now)
+        first = db.get_due_follow_ups(now, 50)
+        indexed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cutoff = str(now - timedelta(days=engine.days))
+        scanned = [app for app in db.get_applications(limit=applications)
+                   if app['status'] in ('pending', 'applied') and str(app['date_applied']) <= cutoff]
+        scan = time.perf_counter() - start
+        print(f"   due follow-ups: {count:,} (first batch {len(first)}) in {indexed * 1000:.1f} ms indexed "
+              f"vs {scan * 1000:.0f} ms scanning all applications ({len(scanned):,})")
+
+        start = time.perf_counter()
+        next_due = engine.next_due()
+        checks = 10000
+        for _ in range(checks):
+            engine.next_due()
+        print(f"   next due {next_due}: heap check {(time.perf_counter() - start) / checks * 1e6:.1f} µs")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,163 +1,127 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import time
 from datetime import datetime
+from urllib.parse import urlencode
+from browser_pool import BrowserPool
+from selenium_waits import WaitStrategy, get_step_timings
+from card_extraction import extract_cards_from_html, extract_cards_in_browser, to_job
+from extractors import registry
+from crawl_frontier import CrawlFrontier, IndeedCrawler, pool_fetcher
 
-def search_indeed_with_selenium(job_title, location):
-    """Use Selenium to bypass Indeed's bot detection"""
+INDEED_BASE_URL = "https://gr.indeed.com"
+
+# Any of these means the results list has rendered
+RESULT_LOCATORS = [
+    (By.CSS_SELECTOR, 'div.job_seen_beacon'),
+    (By.CSS_SELECTOR, 'div[data-jk]'),
+    (By.CSS_SELECTOR, 'td.resultContent'),
+]
+
+# Any of these means a job's own page has rendered
+DETAIL_LOCATORS = [
+    (By.CSS_SELECTOR, '#jobDescriptionText'),
+    (By.CSS_SELECTOR, '[data-testid="jobDescriptionText"]'),
+]
+
+def build_search_url(base_url, job_title, location):
+    """Indeed search URL; file:// fixtures are used as-is"""
+    if base_url.startswith('file://'):
+        return base_url
+    return f"{base_url}/jobs?{urlencode({'q': job_title, 'l': location})}"
+
+def search_indeed_with_selenium(job_title, location, driver=None, base_url=INDEED_BASE_URL):
+    """Use Selenium to bypass Indeed's bot detection
     
-    print("🌐 Starting browser for Indeed search...")
+    Pass a driver leased from a BrowserPool to reuse a warm session;
+    otherwise a one-off headless browser is started.
+    """
+    if driver is None:
+        with BrowserPool(size=1, warm_url=base_url) as pool:
+            with pool.driver() as pooled_driver:
+                return search_indeed_with_selenium(job_title, location, pooled_driver, base_url)
     
-    # Setup Chrome options
-    options = Options()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-blink-features=AutomationControlled')
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    # Show browser window so you can see what's happening
-    # options.add_argument('--headless')  # Uncomment to hide browser
+    waits = WaitStrategy(driver)
     
     try:
-        # Start browser
-        print("🚀 Launching Chrome browser...")
-        driver = webdriver.Chrome(options=options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Search for jobs
+        print(f"🔍 Searching for {job_title} in {location}...")
+        driver.get(build_search_url(base_url, job_title, location))
         
-        # Go to Indeed Greece
-        print("📍 Navigating to Indeed Greece...")
-        driver.get("https://gr.indeed.com")
-        time.sleep(3)
+        # Wait for results (or give up quickly on an empty/blocked page)
+        waits.any_element('indeed_results', RESULT_LOCATORS, required=False)
         
         # Accept cookies if prompted
         try:
-            cookie_button = driver.find_element(By.ID, "onetrust-accept-btn-handler")
-            cookie_button.click()
+            driver.find_element(By.ID, "onetrust-accept-btn-handler").click()
             print("  ✓ Accepted cookies")
         except:
             pass
         
-        # Search for jobs
-        print(f"🔍 Searching for {job_title} in {location}...")
-        
-        # Find search boxes
-        what_box = driver.find_element(By.ID, "text-input-what")
-        what_box.clear()
-        what_box.send_keys(job_title)
-        
-        where_box = driver.find_element(By.ID, "text-input-where")
-        where_box.clear()
-        where_box.send_keys(location)
-        
-        # Click search button
-        search_button = driver.find_element(By.CLASS_NAME, "yosegi-InlineWhatWhere-primaryButton")
-        search_button.click()
-        
-        # Wait for results
-        time.sleep(5)
+        # One round-trip returns every card; fall back to lxml on the page source
+        try:
+            cards = extract_cards_in_browser(driver)
+        except Exception as e:
+            print(f"  ⚠️ In-browser extraction failed ({e}), parsing page source")
+            cards = extract_cards_from_html(driver.page_source, base_url=driver.current_url)
         
-        # Get page source
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        print(f"📊 Found {len(cards)} job cards")
         
-        # Find job cards - Indeed uses different class names
         jobs = []
+        for card in cards:
+            # Only add if we got at least title or company
+            if card['title'] or card['company']:
+                job_data = to_job(card, default_location=location, source='Indeed Greece')
+                jobs.append(job_data)
+                print(f"  ✓ Found: {card['title'] or 'Unknown'} at {card['company'] or 'Unknown'}")
+            else:
+                print(f"  ⚠️ Could not extract job details from card")
+        
+        if not cards:
+            # Take screenshot for debugging
+            driver.save_screenshot('data/indeed_screenshot.png')
+            print("  📸 Screenshot saved to data/indeed_screenshot.png")
         
-        # Try multiple selectors
-        selectors = [
-            'div.job_seen_beacon',
-            'div.jobsearch-SerpJobCard',
-            'div.slider_container',
-            'div[data-jk]',
-            'td.resultContent'
-        ]
-        
-        job_cards = []
-        for selector in selectors:
-            job_cards = soup.select(selector)[:10]
-            if job_cards:
-                print(f"  ✓ Found job cards using selector: {selector}")
-                break
-        
-        print(f"📊 Found {len(job_cards)} job cards")
-        
-        for card in job_cards:
-            try:
-                # Multiple ways to extract job info from Indeed's structure
-                title = None
-                company = None
-                
-                # Method 1: Direct selection
-                title_elem = card.select_one('h2.jobTitle span[title]')
-                if title_elem:
-                    title = title_elem.get('title')
-                
-                # Method 2: Alternative title selection
-                if not title:
-                    title_elem = card.select_one('h2.jobTitle a span')
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                
-                # Method 3: Any span with title attribute
-                if not title:
-                    title_elem = card.select_one('span[title]')
-                    if title_elem:
-                        title = title_elem.get('title')
-                
-                # Extract company
-                company_elem = card.select_one('span.companyName')
-                if company_elem:
-                    company = company_elem.get_text(strip=True)
-                
-                # Alternative company selector
-                if not company:
-                    company_elem = card.select_one('[data-testid="company-name"]')
-                    if company_elem:
-                        company = company_elem.get_text(strip=True)
-                
-                # Extract location
-                location_elem = card.select_one('div.companyLocation')
-                job_location = location_elem.get_text(strip=True) if location_elem else location
-                
-                # Extract salary if available
-                salary_elem = card.select_one('div.salary-snippet')
-                salary = salary_elem.get_text(strip=True) if salary_elem else None
-                
-                # Only add if we got at least title or company
-                if title or company:
-                    job_data = {
-                        'title': title or 'Title not found',
-                        'company': company or 'Company not found',
-                        'location': job_location,
-                        'salary': salary,
-                        'found_date': datetime.now().isoformat(),
-                        'source': 'Indeed Greece'
-                    }
-                    jobs.append(job_data)
-                    print(f"  ✓ Found: {title or 'Unknown'} at {company or 'Unknown'}")
-                else:
-                    print(f"  ⚠️ Could not extract job details from card")
-                    # Debug: print what we got
-                    print(f"     HTML preview: {str(card)[:200]}")
-            
-            except Exception as e:
-                print(f"  ❌ Error extracting job: {e}")
-                continue
-        
-        # Take screenshot for debugging
-        driver.save_screenshot('data/indeed_screenshot.png')
-        print("  📸 Screenshot saved to data/indeed_screenshot.png")
-        
-        driver.quit()
         return jobs
         
     except Exception as e:
         print(f"❌ Selenium error: {e}")
         return []
 
+def search_indeed_many(searches, pool_size=3, base_url=INDEED_BASE_URL, headless=True):
+    """Run (job_title, location) searches concurrently on a pool of warm browsers"""
+    print(f"🌐 Starting {pool_size} browsers for {len(searches)} Indeed searches...")
+    
+    with BrowserPool(size=pool_size, headless=headless, warm_url=base_url) as pool:
+        results = pool.map(
+            lambda driver, search: search_indeed_with_selenium(search[0], search[1], driver, base_url),
+            searches
+        )
+    
+    get_step_timings().save()
+    registry.save_stats()
+    return [job for jobs in results for job in jobs]
+
+def crawl_indeed(searches, pool_size=3, base_url=INDEED_BASE_URL, headless=True, max_depth=4,
+                 max_pages=100, state_path='data/crawl_state_indeed.json'):
+    """Crawl every results page and job page for the searches across a browser pool
+    
+    Progress is saved to state_path, so an interrupted crawl picks up where it stopped.
+    """
+    print(f"🌐 Crawling {len(searches)} Indeed searches with {pool_size} browsers...")
+    
+    def ready(driver, url):
+        WaitStrategy(driver).any_element('indeed_page', RESULT_LOCATORS + DETAIL_LOCATORS, required=False)
+    
+    frontier = CrawlFrontier(state_path=state_path, max_depth=max_depth, max_pages=max_pages)
+    with BrowserPool(size=pool_size, headless=headless, warm_url=base_url) as pool:
+        crawler = IndeedCrawler(pool_fetcher(pool, ready), frontier=frontier, workers=pool_size,
+                                source='Indeed Greece')
+        jobs = crawler.crawl([(build_search_url(base_url, title, location), location)
+                              for title, location in searches])
+    
+    get_step_timings().save()
+    registry.save_stats()
+    return jobs
+
 if __name__ == "__main__":
     # Try different searches
     searches = [
@@ -173,14 +137,7 @@ if __name__ == "__main__":
         ("AI Engineer", "Thessaloniki")
     ]
     
-    all_jobs = []
-    for job_title, location in searches:
-        print(f"\n🔍 Trying: {job_title} in {location}")
-        jobs = search_indeed_with_selenium(job_title, location)
-        all_jobs.extend(jobs)
-        
-        if jobs:
-            break  # Found jobs, stop searching
+    all_jobs = crawl_indeed(searches)
     
     # At the end of the main section, after finding jobs:
     if all_jobs:
@@ -195,9 +152,9 @@ if __name__ == "__main__":
         
         for i, job in enumerate(all_jobs, 1):
             print(f"{i}. {job['title']} at {job['company']} ({job['location']})")
-        else:
-            print("\n❌ No jobs found on Indeed")
-            print("\n💡 Try these alternatives:")
-            print("1. Search on LinkedIn.com/jobs")
-            print("2. Check Kariera.gr (Greek job site)")
-            print("3. Try RemoteOK.io for remote jobs")
+    else:
+        print("\n❌ No jobs found on Indeed")
+        print("\n💡 Try these alternatives:")
+        print("1. Search on LinkedIn.com/jobs")
+        print("2. Check Kariera.gr (Greek job site)")
+        print("3. Try RemoteOK.io for remote jobs")
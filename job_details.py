@@ -0,0 +1,175 @@
+"""
+Job detail pages
+Fetches each job's own page concurrently, strips boilerplate and caches the description by URL
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from extractors import SITE_SPECS
+
+# Where the description lives: the registry's Indeed detail selectors, then generic markup
+CONTENT_SELECTORS = [
+    selector for selector, _ in SITE_SPECS['indeed_detail']['fields']['description']['selectors']
+] + [
+    '.job-description',
+    '#job-description',
+    '[itemprop="description"]',
+    'article',
+    'main',
+    '[role="main"]',
+]
+
+# Never part of a description
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'template', 'iframe', 'svg',
+                    'nav', 'header', 'footer', 'aside', 'form', 'button']
+BOILERPLATE_PATTERN = re.compile(
+    r'cookie|consent|banner|breadcrumb|share|social|related|similar|recommend|newsletter|signup|login|modal|popup',
+    re.IGNORECASE
+)
+BOILERPLATE_LINES = re.compile(
+    r'^(apply now|apply on company site|save job|report job|share( this job)?|show more|show less)$',
+    re.IGNORECASE
+)
+
+BLOCK_TAGS = {'p', 'div', 'section', 'article', 'br', 'li', 'ul', 'ol', 'tr', 'table',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre', 'dd', 'dt'}
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+_content_selectors = [CSSSelector(selector) for selector in CONTENT_SELECTORS]
+
+
+def _is_boilerplate(element):
+    marker = f"{element.get('id', '')} {element.get('class', '')} {element.get('role', '')}"
+    return bool(marker.strip()) and BOILERPLATE_PATTERN.search(marker) is not None
+
+
+def extract_description(page_html):
+    """Main description text of a job page, one line per block, boilerplate removed"""
+    if not page_html or not page_html.strip():
+        return None
+    root = lxml_html.fromstring(page_html)
+
+    for element in list(root.iter(*BOILERPLATE_TAGS)):
+        element.drop_tree()
+
+    content = root.find('body') if root.find('body') is not None else root
+    for selector in _content_selectors:
+        matches = selector(root)
+        if matches:
+            content = matches[0]
+            break
+
+    for element in [e for e in content.iterdescendants() if isinstance(e.tag, str) and _is_boilerplate(e)]:
+        element.drop_tree()
+
+    # Keep block boundaries as line breaks so lists and paragraphs don't run together
+    for element in content.iter():
+        if isinstance(element.tag, str) and element.tag in BLOCK_TAGS:
+            element.tail = '\n' + (element.tail or '')
+            if element.tag == 'li':
+                element.text = '• ' + (element.text or '')
+
+    lines = []
+    for line in content.text_content().split('\n'):
+        line = ' '.join(line.split())
+        if line and not BOILERPLATE_LINES.match(line):
+            lines.append(line)
+    return '\n'.join(lines) or None
+
+
+def job_description_text(job):
+    """What the tailoring prompts get: the header fields plus the full description when known"""
+    location = job.get('location') or 'Thessaloniki'
+    header = f"Position: {job['title']}\nCompany: {job['company']}\nLocation: {location}"
+    if job.get('description'):
+        return f"{header}\n\n{job['description']}"
+    return f"{header}\n\nThis is a {job['title']} position at {job['company']} based in {location}."
+
+
+class DetailFetcher:
+    def __init__(self, fetch=None, cache_folder='data/detail_cache', max_workers=4, max_age_days=7, timeout=10):
+        self.fetch = fetch or self._fetch_with_requests
+        self.cache_folder = cache_folder
+        self.max_workers = max_workers
+        self.max_age = max_age_days * 86400
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(cache_folder, exist_ok=True)
+
+    def _fetch_with_requests(self, url):
+        # One session per worker thread keeps connections alive
+        if not hasattr(self._local, 'session'):
+            import requests
+            self._local.session = requests.Session()
+            self._local.session.headers.update(REQUEST_HEADERS)
+        response = self._local.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def _cache_path(self, url):
+        return os.path.join(self.cache_folder, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.txt")
+
+    def get_cached(self, url):
+        """Cached description for a URL, or None if missing or stale"""
+        path = self._cache_path(url)
+        if os.path.exists(path) and time.time() - os.path.getmtime(path) < self.max_age:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+
+    def _store(self, url, text):
+        path = self._cache_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def description(self, url):
+        """Full description for a job URL, from the cache or the page itself"""
+        cached = self.get_cached(url)
+        if cached is not None:
+            return cached
+        text = extract_description(self.fetch(url))
+        if text:
+            self._store(url, text)
+        return text
+
+    def _enrich_one(self, job):
+        url = job.get('detail_url') or job.get('url')
+        try:
+            text = self.description(url)
+        except Exception as e:
+            print(f"   ⚠️ Could not fetch details for {job.get('title')}: {e}")
+            return False
+        job['detail_fetched'] = True
+        # Never replace a description with something shorter
+        if text and len(text) > len(job.get('description') or ''):
+            job['description'] = text
+            job['detail_url'] = url
+            return True
+        return False
+
+    def enrich(self, jobs):
+        """Fill in full descriptions in place, fetching pages concurrently; returns jobs"""
+        pending = [job for job in jobs if (job.get('detail_url') or job.get('url')) and not job.get('detail_fetched')]
+        if not pending:
+            return jobs
+
+        print(f"🔎 Fetching details for {len(pending)} jobs...")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='details') as executor:
+            results = list(executor.map(self._enrich_one, pending))
+        print(f"   ✅ Full descriptions for {sum(results)}/{len(pending)} jobs")
+        return jobs
@@ -1,13 +1,33 @@
-import requests
 from datetime import datetime
 import json
 import time
 import os
+from database import Database, SAVED_JOB_FIELDS
+
+# Where jobs were saved before they moved into the database
+LEGACY_JOBS_PATH = 'data/saved_jobs.json'
+
+def job_key(job):
+    """Stable identifier for a job record"""
+    return job.get('url') or f"{job.get('company', '')}_{job.get('title', '')}"
+
+def saved_job_row(job):
+    """saved_jobs row for a job dict; fields without a column go into `extra`"""
+    extra = {k: v for k, v in job.items() if k not in SAVED_JOB_FIELDS}
+    return (job_key(job), *(job.get(field) for field in SAVED_JOB_FIELDS),
+            json.dumps(extra, ensure_ascii=False) if extra else None)
 
 class JobFinder:
-    def __init__(self):
+    def __init__(self, db=None, max_loaded=None):
+        from config import Config
+        self.db = db or Database()
+        # Only the newest saved jobs are held in memory; an import can add millions
+        self.max_loaded = Config.SAVED_JOBS_LOADED if max_loaded is None else max_loaded
+        self.total_jobs = 0
         self.jobs = []
         self.search_history = []
+        self.embedder = None
+        self.index = None
         self.load_jobs()
     
     def manual_add_job(self):
@@ -61,58 +81,94 @@ class JobFinder:
         return example_jobs
     
     def import_from_csv(self, csv_path):
-        """Import jobs from a CSV file"""
+        """Import jobs from a CSV (or JSONL) file, streamed in chunks; jobs already saved are skipped"""
+        from job_import import JobImporter
         try:
-            import pandas as pd
-            df = pd.read_csv(csv_path)
-            
-            imported_count = 0
-            for _, row in df.iterrows():
-                job = {
-                    'title': row.get('title', 'Unknown'),
-                    'company': row.get('company', 'Unknown'),
-                    'location': row.get('location', ''),
-                    'url': row.get('url', ''),
-                    'description': row.get('description', ''),
-                    'date_found': datetime.now().isoformat()
-                }
-                self.jobs.append(job)
-                imported_count += 1
-            
-            print(f"✅ Imported {imported_count} jobs from CSV")
-            self.save_jobs()
+            stats = JobImporter(self.db).import_file(csv_path)
+            print(f"✅ Imported {stats['imported']} jobs from {os.path.basename(csv_path)}"
+                  f" ({stats['duplicates']} already saved or repeated)")
+            self.load_jobs()
             
         except Exception as e:
             print(f"❌ Error importing CSV: {e}")
             print("Make sure CSV has columns: title, company, location, url, description")
     
     def save_jobs(self):
-        """Save jobs to JSON file"""
+        """Save new jobs to the database"""
         try:
-            with open('data/saved_jobs.json', 'w') as f:
-                json.dump(self.jobs, f, indent=2)
+            self.total_jobs += self.db.add_saved_jobs(saved_job_row(job) for job in self.jobs)
         except Exception as e:
             print(f"Error saving jobs: {e}")
+        
+        try:
+            self.update_index()
+        except Exception as e:
+            print(f"Error updating job index: {e}")
+    
+    def get_index(self):
+        """Open the job embedding index on first use"""
+        if self.index is None:
+            from config import Config
+            from embedding_index import EmbeddingIndex, get_embedder
+            self.embedder = get_embedder()
+            self.index = EmbeddingIndex(Config.EMBEDDING_INDEX_PATH, dim=self.embedder.dim,
+                                        model=self.embedder.model_id)
+        return self.index
+    
+    def update_index(self):
+        """Embed saved jobs that aren't in the index yet"""
+        from relevance import job_text
+        index = self.get_index()
+        new_jobs = [job for job in self.jobs if job_key(job) not in index]
+        if new_jobs:
+            vectors = self.embedder.embed([job_text(job) for job in new_jobs])
+            index.add([job_key(job) for job in new_jobs], vectors)
+    
+    def most_similar(self, text, k=20):
+        """Saved jobs most similar to a resume or query, as (score, job)"""
+        self.update_index()
+        by_key = {job_key(job): job for job in self.jobs}
+        query = self.embedder.embed([text])[0]
+        
+        # Over-fetch: the index may still hold jobs that were removed
+        results = []
+        for item_id, score in self.index.search(query, k=k * 2):
+            if item_id in by_key:
+                results.append((score, by_key[item_id]))
+        return results[:k]
     
     def load_jobs(self):
-        """Load saved jobs from file"""
+        """Load the newest max_loaded saved jobs from the database"""
         try:
-            if os.path.exists('data/saved_jobs.json'):
-                with open('data/saved_jobs.json', 'r') as f:
-                    self.jobs = json.load(f)
-                    if self.jobs:
-                        print(f"✅ Loaded {len(self.jobs)} saved jobs")
+            self.migrate_json_jobs()
+            self.total_jobs = self.db.count_saved_jobs()
+            self.jobs = self.db.get_saved_jobs(self.max_loaded, max(0, self.total_jobs - self.max_loaded))
+            if len(self.jobs) < self.total_jobs:
+                print(f"✅ Loaded the newest {len(self.jobs)} of {self.total_jobs} saved jobs")
+            elif self.jobs:
+                print(f"✅ Loaded {len(self.jobs)} saved jobs")
         except Exception as e:
             print(f"Error loading jobs: {e}")
             self.jobs = []
     
+    def migrate_json_jobs(self):
+        """Move jobs from the old saved_jobs.json into the database (once)"""
+        if not os.path.exists(LEGACY_JOBS_PATH):
+            return
+        with open(LEGACY_JOBS_PATH, 'r') as f:
+            jobs = json.load(f)
+        imported = self.db.add_saved_jobs(saved_job_row(job) for job in jobs)
+        os.replace(LEGACY_JOBS_PATH, LEGACY_JOBS_PATH + '.migrated')
+        print(f"📦 Moved {imported} saved jobs from {LEGACY_JOBS_PATH} into the database")
+    
     def list_jobs(self):
         """Display all jobs"""
         if not self.jobs:
             print("❌ No jobs in the list. Add some first!")
             return
         
-        print(f"\n📋 SAVED JOBS ({len(self.jobs)} total)")
+        shown = f"newest {len(self.jobs)} of {self.total_jobs}" if self.total_jobs > len(self.jobs) else f"{len(self.jobs)} total"
+        print(f"\n📋 SAVED JOBS ({shown})")
         print("=" * 60)
         
         for i, job in enumerate(self.jobs, 1):
@@ -129,7 +185,7 @@ class JobFinder:
         try:
             if 0 <= job_index < len(self.jobs):
                 removed = self.jobs.pop(job_index)
-                self.save_jobs()
+                self.db.delete_saved_job(job_key(removed))
                 print(f"✅ Removed: {removed['title']} at {removed['company']}")
                 return True
         except Exception as e:
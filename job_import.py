@@ -0,0 +1,168 @@
+"""
+Bulk job import
+Streams CSV/JSONL files in chunks, normalises columns with vectorised pandas operations,
+skips jobs already saved (via the saved_jobs job_key index) and bulk-inserts the rest
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+from database import Database, SAVED_JOB_FIELDS
+
+# Other spellings seen in exported job lists
+COLUMN_ALIASES = {
+    'position': 'title', 'job_title': 'title', 'job title': 'title',
+    'company_name': 'company', 'employer': 'company',
+    'link': 'url', 'job_url': 'url', 'apply_url': 'url',
+    'salary_range': 'salary', 'type': 'job_type',
+}
+
+
+def read_chunks(path, chunksize=50000):
+    """DataFrames of up to chunksize rows, all values as strings"""
+    import pandas as pd
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        for chunk in pd.read_json(path, lines=True, chunksize=chunksize, dtype=False):
+            yield chunk.astype(object).where(chunk.notna(), '')
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+
+def normalize_chunk(df, date_found=None):
+    """Map a raw chunk onto the saved_jobs columns plus job_key and extra, deduped within the chunk
+
+    Columns without a saved_jobs field are kept in `extra` as JSON, like JobFinder saves them.
+    """
+    import pandas as pd
+    df = df.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()))
+
+    jobs = pd.DataFrame(index=df.index)
+    for field in SAVED_JOB_FIELDS:
+        # A field can arrive under several names (e.g. title and position); first non-empty wins
+        block = df.loc[:, df.columns == field].astype(str).apply(lambda column: column.str.strip())
+        if block.shape[1] == 0:
+            jobs[field] = ''
+        elif block.shape[1] == 1:
+            jobs[field] = block.iloc[:, 0]
+        else:
+            jobs[field] = block.mask(block == '').bfill(axis=1).iloc[:, 0].fillna('')
+    for field in ('title', 'company'):
+        jobs[field] = jobs[field].mask(jobs[field] == '', 'Unknown')
+    jobs['date_found'] = jobs['date_found'].mask(jobs['date_found'] == '', date_found or datetime.now().isoformat())
+
+    # Same key as job_finder.job_key: the URL, else company_title
+    jobs.insert(0, 'job_key', jobs['url'].mask(jobs['url'] == '', jobs['company'] + '_' + jobs['title']))
+
+    others = df.loc[:, ~df.columns.duplicated() & ~df.columns.isin(SAVED_JOB_FIELDS)]
+    if others.shape[1]:
+        jobs['extra'] = [
+            json.dumps(extra, ensure_ascii=False) if extra else None
+            for extra in ({k: v for k, v in row.items() if v != '' and v is not None}
+                          for row in others.to_dict('records'))
+        ]
+    else:
+        jobs['extra'] = None
+    return jobs.drop_duplicates('job_key')
+
+
+class JobImporter:
+    def __init__(self, db=None, chunksize=50000):
+        self.db = db or Database()
+        self.chunksize = chunksize
+
+    def import_file(self, path):
+        """Import a .csv or .jsonl file; returns counts of rows read, new jobs and duplicates"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        started = time.perf_counter()
+        date_found = datetime.now().isoformat()
+        stats = {'rows': 0, 'imported': 0, 'duplicates': 0, 'chunks': 0}
+
+        for chunk in read_chunks(path, self.chunksize):
+            jobs = normalize_chunk(chunk, date_found)
+            rows = zip(*(jobs[column].tolist() for column in ['job_key', *SAVED_JOB_FIELDS, 'extra']))
+            imported = self.db.add_saved_jobs(rows)
+
+            stats['rows'] += len(chunk)
+            stats['imported'] += imported
+            stats['duplicates'] += len(chunk) - imported
+            stats['chunks'] += 1
+
+        stats['seconds'] = time.perf_counter() - started
+        return stats
+
+
+def legacy_import(path):
+    """The previous JobFinder.import_from_csv loop: whole file in memory, iterrows"""
+    import pandas as pd
+    jobs = []
+    for _, row in pd.read_csv(path).iterrows():
+        jobs.append({
+            'title': row.get('title', 'Unknown'),
+            'company': row.get('company', 'Unknown'),
+            'location': row.get('location', ''),
+            'url': row.get('url', ''),
+            'description': row.get('description', ''),
+            'date_found': datetime.now().isoformat()
+        })
+    return jobs
+
+
+def write_sample_csv(path, rows, duplicate_every=10):
+    """CSV in the template's format; every duplicate_every-th row repeats an earlier job"""
+    import csv
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['title', 'company', 'location', 'url', 'description', 'salary'])
+        for i in range(rows):
+            n = i - 1 if duplicate_every and i % duplicate_every == duplicate_every - 1 else i
+            writer.writerow([
+                f'Python Developer {n % 500}', f'Company {n % 20000}', 'Remote',
+                f'https://example.com/jobs/{n}', f'Python, Django and SQL role number {n}.', '$80k-100k'
+            ])
+
+
+def benchmark(rows=1000000, legacy_rows=50000, chunksize=50000):
+    """Import a large CSV in chunks vs the legacy iterrows loop; reports time and peak memory"""
+    import resource
+    import shutil
+    import tempfile
+
+    def peak_rss_mb():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, 'jobs.csv')
+        write_sample_csv(path, rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"📊 Importing {rows:,} rows ({size_mb:.0f} MB CSV), chunks of {chunksize:,}")
+
+        # Load pandas before taking the baseline so only the import itself is measured
+        import pandas
+        baseline = peak_rss_mb()
+        importer = JobImporter(Database(os.path.join(folder, 'applications.db')), chunksize=chunksize)
+        stats = importer.import_file(path)
+        print(f"   chunked import: {stats['seconds']:.1f}s ({stats['rows'] / stats['seconds']:,.0f} rows/s), "
+              f"{stats['imported']:,} new, {stats['duplicates']:,} duplicates, "
+              f"peak RSS {peak_rss_mb():.0f} MB (+{peak_rss_mb() - baseline:.0f} MB)")
+
+        again = importer.import_file(path)
+        print(f"   re-import (all duplicates): {again['seconds']:.1f}s, {again['imported']} new")
+
+        sample = os.path.join(folder, 'sample.csv')
+        write_sample_csv(sample, legacy_rows)
+        start = time.perf_counter()
+        legacy_import(sample)
+        legacy = time.perf_counter() - start
+        chunked = JobImporter(Database(os.path.join(folder, 'sample.db')), chunksize=chunksize).import_file(sample)
+        print(f"   {legacy_rows:,} rows: iterrows {legacy:.2f}s ({legacy_rows / legacy:,.0f} rows/s) vs "
+              f"chunked {chunked['seconds']:.2f}s ({legacy_rows / chunked['seconds']:,.0f} rows/s, with dedupe and insert)")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark()
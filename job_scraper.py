@@ -1,23 +1,36 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import time
 from datetime import datetime
+from extractors import registry
+from watermarks import scope_key
 
 class JobScraper:
-    def __init__(self):
+    def __init__(self, watermarks=None):
         self.jobs = []
+        # With a WatermarkStore, each source only emits postings newer than its last scrape
+        self.watermarks = watermarks
+    
+    def _watermark(self, source, scope):
+        return self.watermarks.get(source, scope) if self.watermarks else None
     
     def scrape_remote_ok(self, keywords):
         """Scrape RemoteOK for remote jobs"""
         url = f"https://remoteok.io/api"
+        watermark = self._watermark('remoteok', scope_key(keywords))
         
         try:
             response = requests.get(url)
             jobs_data = response.json()
             
+            found = 0
             for job in jobs_data[1:20]:  # Skip first item (metadata)
+                if watermark:
+                    if not watermark.is_new(job.get('id'), job.get('date')):
+                        continue
+                    watermark.record(job.get('id'), job.get('date'))
                 if any(kw.lower() in job.get('position', '').lower() for kw in keywords):
+                    found += 1
                     self.jobs.append({
                         'title': job.get('position'),
                         'company': job.get('company'),
@@ -29,7 +42,9 @@ class JobScraper:
                         'tags': job.get('tags', [])
                     })
             
-            print(f"✅ Found {len(self.jobs)} jobs on RemoteOK")
+            if watermark:
+                self.watermarks.save(watermark)
+            print(f"✅ Found {found} {'new ' if watermark else ''}jobs on RemoteOK")
             
         except Exception as e:
             print(f"Error scraping RemoteOK: {e}")
@@ -40,16 +55,14 @@ class JobScraper:
         
         try:
             response = requests.get(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            job_listings = soup.find_all('a', class_='job-listing')
+            job_listings = registry.extract('ycombinator', response.content, base_url=url)
             
             for listing in job_listings[:10]:
                 self.jobs.append({
-                    'title': listing.find('h3').text.strip(),
-                    'company': listing.find('div', class_='company').text.strip(),
-                    'url': f"https://www.ycombinator.com{listing['href']}",
-                    'description': listing.text.strip()
+                    'title': listing['title'],
+                    'company': listing['company'],
+                    'url': listing['url'],
+                    'description': listing['description']
                 })
             
             print(f"✅ Found {len(job_listings)} jobs on YC")
@@ -57,33 +70,54 @@ class JobScraper:
         except Exception as e:
             print(f"Error scraping YC: {e}")
     
-    def use_adzuna_api(self, what, where, api_id, api_key):
-        """Use Adzuna API (free tier available)"""
-        url = f"https://api.adzuna.com/v1/api/jobs/us/search/1"
+    def use_adzuna_api(self, what, where, api_id, api_key, max_pages=5):
+        """Use Adzuna API (free tier available)
+        
+        Pages are requested newest first; paging stops at the first page that
+        only holds postings seen by the previous scrape.
+        """
+        watermark = self._watermark('adzuna', scope_key(what, where))
         
         params = {
             'app_id': api_id,
             'app_key': api_key,
             'what': what,
             'where': where,
-            'results_per_page': 20
+            'results_per_page': 20,
+            'sort_by': 'date'
         }
         
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            for job in data.get('results', []):
-                self.jobs.append({
-                    'title': job.get('title'),
-                    'company': job.get('company', {}).get('display_name'),
-                    'url': job.get('redirect_url'),
-                    'description': job.get('description'),
-                    'salary': job.get('salary_min'),
-                    'location': job.get('location', {}).get('display_name')
-                })
+            found = 0
+            for page in range(1, max_pages + 1):
+                url = f"https://api.adzuna.com/v1/api/jobs/us/search/{page}"
+                response = requests.get(url, params=params)
+                results = response.json().get('results', [])
+                
+                seen = 0
+                for job in results:
+                    if watermark:
+                        if not watermark.is_new(job.get('id'), job.get('created')):
+                            seen += 1
+                            continue
+                        watermark.record(job.get('id'), job.get('created'))
+                    found += 1
+                    self.jobs.append({
+                        'title': job.get('title'),
+                        'company': job.get('company', {}).get('display_name'),
+                        'url': job.get('redirect_url'),
+                        'description': job.get('description'),
+                        'salary': job.get('salary_min'),
+                        'location': job.get('location', {}).get('display_name'),
+                        'date': job.get('created')
+                    })
+                
+                if len(results) < params['results_per_page'] or (watermark and watermark.end_page(len(results), seen)):
+                    break
             
-            print(f"✅ Found {len(self.jobs)} jobs via Adzuna API")
+            if watermark:
+                self.watermarks.save(watermark)
+            print(f"✅ Found {found} {'new ' if watermark else ''}jobs via Adzuna API")
             
         except Exception as e:
             print(f"Error using Adzuna API: {e}")
\ No newline at end of file
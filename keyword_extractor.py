@@ -0,0 +1,279 @@
+"""
+Keyword extraction with a compiled Aho-Corasick automaton
+Matches a whole skills taxonomy (terms + synonyms) in one pass over the text
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+
+# Canonical skill -> synonyms. Used when no taxonomy file is available.
+DEFAULT_SKILLS = {
+    'python': ['python3', 'py'],
+    'java': ['java se', 'java ee', 'j2ee'],
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': ['ts'],
+    'sql': ['t-sql', 'pl/sql'],
+    'aws': ['amazon web services'],
+    'docker': ['containers', 'containerization'],
+    'kubernetes': ['k8s'],
+    'react': ['react.js', 'reactjs'],
+    'node': ['node.js', 'nodejs'],
+    'git': ['github', 'gitlab'],
+    'agile': [],
+    'scrum': [],
+    'mongodb': ['mongo'],
+    'postgresql': ['postgres'],
+    'redis': [],
+    'flask': [],
+    'django': [],
+    'fastapi': [],
+    'machine learning': ['ml'],
+    'data science': [],
+}
+
+# Characters that count as part of a word when checking match boundaries
+WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_')
+
+# Separator placed between documents in a batch; never part of a word
+DOC_SEPARATOR = '\n'
+
+
+class SkillsTaxonomy:
+    def __init__(self, skills=None):
+        # term (lowercase) -> canonical skill
+        self.terms = {}
+        # canonical skills in insertion order
+        self.skills = []
+        for skill, synonyms in (skills or DEFAULT_SKILLS).items():
+            self.add_skill(skill, synonyms)
+
+    def add_skill(self, skill, synonyms=None):
+        """Register a canonical skill and its synonyms"""
+        skill = skill.strip().lower()
+        if not skill:
+            return
+        if skill not in self.terms:
+            self.skills.append(skill)
+        self.terms[skill] = skill
+        for synonym in synonyms or []:
+            synonym = synonym.strip().lower()
+            if synonym:
+                self.terms.setdefault(synonym, skill)
+
+    @classmethod
+    def load(cls, path):
+        """Load a taxonomy from JSON
+
+        Accepts either {"skill": ["synonym", ...]} or a plain list of skills.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if isinstance(data, list):
+            data = {skill: [] for skill in data}
+
+        taxonomy = cls(skills={})
+        for skill, synonyms in data.items():
+            taxonomy.add_skill(skill, synonyms)
+        print(f"✅ Loaded skills taxonomy: {len(taxonomy.skills)} skills, {len(taxonomy.terms)} terms")
+        return taxonomy
+
+    def save(self, path):
+        """Save taxonomy to JSON"""
+        data = {skill: [] for skill in self.skills}
+        for term, skill in self.terms.items():
+            if term != skill:
+                data[skill].append(term)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def __len__(self):
+        return len(self.terms)
+
+
+class KeywordAutomaton:
+    def __init__(self, taxonomy=None):
+        self.taxonomy = taxonomy or SkillsTaxonomy()
+        self.compile()
+
+    def compile(self):
+        """Build goto/fail/output tables for every term in the taxonomy"""
+        goto = [{}]
+        output = [[]]
+
+        for term, skill in self.taxonomy.terms.items():
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    output.append([])
+                state = next_state
+            output[state].append((len(term), skill))
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                f = fail[state]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                candidate = goto[f].get(char, 0)
+                fail[next_state] = candidate if candidate != next_state else 0
+                output[next_state] = output[next_state] + output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def iter_matches(self, text):
+        """Yield (start, end, skill) for every word-bounded term occurrence"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare unicode case changes alter length; fall back to char-wise lowering
+            lowered = ''.join(c.lower()[0] for c in text)
+        length = len(lowered)
+
+        state = 0
+        for i, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = i + 1
+            for term_length, skill in output[state]:
+                start = end - term_length
+                if start > 0 and lowered[start - 1] in WORD_CHARS and lowered[start] in WORD_CHARS:
+                    continue
+                if end < length and lowered[end] in WORD_CHARS and lowered[end - 1] in WORD_CHARS:
+                    continue
+                yield start, end, skill
+
+    def find_all(self, text):
+        """Leftmost-longest, non-overlapping matches as (start, end, skill)
+
+        "react.js" counts once as react rather than as react + js.
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -m[1]))
+        resolved = []
+        last_end = 0
+        for match in matches:
+            if match[0] >= last_end:
+                resolved.append(match)
+                last_end = match[1]
+        return resolved
+
+    def extract(self, text):
+        """Return {skill: {'count': n, 'positions': [(start, end), ...]}}"""
+        hits = {}
+        for start, end, skill in self.find_all(text or ''):
+            hit = hits.get(skill)
+            if hit is None:
+                hit = hits[skill] = {'count': 0, 'positions': []}
+            hit['count'] += 1
+            hit['positions'].append((start, end))
+        return hits
+
+    def extract_batch(self, texts):
+        """Extract hits for many documents with a single automaton pass
+
+        Positions are relative to each document.
+        """
+        texts = [text or '' for text in texts]
+        offsets = []
+        offset = 0
+        for text in texts:
+            offsets.append(offset)
+            offset += len(text) + len(DOC_SEPARATOR)
+
+        results = [{} for _ in texts]
+        for start, end, skill in self.find_all(DOC_SEPARATOR.join(texts)):
+            doc = bisect_right(offsets, start) - 1
+            base = offsets[doc]
+            hit = results[doc].get(skill)
+            if hit is None:
+                hit = results[doc][skill] = {'count': 0, 'positions': []}
+            hit['count'] += 1
+            hit['positions'].append((start - base, end - base))
+        return results
+
+    def keywords(self, text):
+        """List matched skills in taxonomy order"""
+        hits = self.extract(text)
+        return [skill for skill in self.taxonomy.skills if skill in hits]
+
+
+_default_automaton = None
+
+
+def get_default_automaton():
+    """Shared automaton over data/skills_taxonomy.json (or the built-in skills)"""
+    global _default_automaton
+    if _default_automaton is None:
+        from config import Config
+        path = Config.SKILLS_TAXONOMY_PATH
+        taxonomy = SkillsTaxonomy.load(path) if os.path.exists(path) else SkillsTaxonomy()
+        _default_automaton = KeywordAutomaton(taxonomy)
+    return _default_automaton
+
+
+def _legacy_extract(job_description, tech_keywords):
+    """The original per-keyword substring loop, kept for benchmarking"""
+    keywords = []
+    job_lower = job_description.lower()
+    for keyword in tech_keywords:
+        if keyword in job_lower:
+            keywords.append(keyword)
+    return keywords
+
+
+def benchmark(num_terms=5000, num_docs=500):
+    """Compare the automaton against the substring loop on a large taxonomy"""
+    import random
+
+    random.seed(42)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'
+    skills = dict(DEFAULT_SKILLS)
+    while len(skills) < num_terms:
+        word = ''.join(random.choice(alphabet) for _ in range(random.randint(4, 10)))
+        skills[word] = [word + 'js']
+    taxonomy = SkillsTaxonomy(skills)
+    terms = list(taxonomy.terms)
+
+    vocabulary = terms[:200] + ['team', 'experience', 'years', 'build', 'we', 'are', 'looking', 'for']
+    docs = [' '.join(random.choice(vocabulary) for _ in range(300)) for _ in range(num_docs)]
+
+    start = time.perf_counter()
+    automaton = KeywordAutomaton(taxonomy)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for doc in docs:
+        _legacy_extract(doc, terms)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    automaton.extract_batch(docs)
+    automaton_time = time.perf_counter() - start
+
+    print(f"📊 {len(terms)} terms, {num_docs} documents")
+    print(f"   Compile automaton: {compile_time * 1000:.1f} ms")
+    print(f"   Substring loop:    {legacy_time * 1000:.1f} ms")
+    print(f"   Automaton (batch): {automaton_time * 1000:.1f} ms")
+    print(f"   Speedup: {legacy_time / automaton_time:.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
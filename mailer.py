@@ -0,0 +1,380 @@
+"""
+Email sending for applications
+Pooled, auto-reconnecting SMTP connections, a rate-limited send pace instead of fixed sleeps,
+retries on transient 4xx replies and an outbox table so queued mail survives restarts
+"""
+
+import mimetypes
+import os
+import queue
+import smtplib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email import encoders
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from config import Config
+from rate_limiter import get_rate_limiter
+
+
+class PooledSMTP:
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """A few logged-in SMTP sessions, checked before reuse and reopened when dropped"""
+
+    def __init__(self, host=None, port=None, username=None, password=None, use_tls=None, size=None,
+                 max_messages_per_connection=100, idle_timeout=60, timeout=30, acquire_timeout=120,
+                 smtp_factory=smtplib.SMTP):
+        self.host = host or Config.SMTP_HOST
+        self.port = port or Config.SMTP_PORT
+        self.username = username
+        self.password = password
+        self.use_tls = Config.SMTP_USE_TLS if use_tls is None else use_tls
+        self.size = size or Config.SMTP_POOL_SIZE
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.acquire_timeout = acquire_timeout
+        self.smtp_factory = smtp_factory
+        self.connects = 0
+        self._idle = queue.LifoQueue()
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        smtp = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.use_tls:
+            smtp.starttls()
+            smtp.ehlo()
+        if self.username and self.password:
+            smtp.login(self.username, self.password)
+        with self._lock:
+            self.connects += 1
+        return PooledSMTP(smtp)
+
+    def _close(self, conn):
+        try:
+            conn.smtp.quit()
+        except Exception:
+            try:
+                conn.smtp.close()
+            except Exception:
+                pass
+
+    def _usable(self, conn):
+        if conn.messages >= self.max_messages_per_connection:
+            return False
+        if time.monotonic() - conn.last_used > self.idle_timeout:
+            # Servers drop idle sessions; make sure this one is still there
+            try:
+                return conn.smtp.noop()[0] == 250
+            except Exception:
+                return False
+        return True
+
+    def check(self):
+        """Open (or reuse) a connection to verify host and credentials"""
+        self.release(self.acquire())
+
+    def acquire(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._usable(conn):
+                return conn
+            self._close(conn)
+            with self._lock:
+                self._open -= 1
+
+        with self._lock:
+            can_open = self._open < self.size
+            if can_open:
+                self._open += 1
+        if not can_open:
+            try:
+                return self._idle.get(timeout=self.acquire_timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No SMTP connection free after {self.acquire_timeout}s")
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+
+    def release(self, conn, broken=False):
+        if broken:
+            self._close(conn)
+            with self._lock:
+                self._open -= 1
+        else:
+            conn.last_used = time.monotonic()
+            self._idle.put(conn)
+
+    def send(self, message):
+        """Send on a pooled connection; a dropped connection is reopened once"""
+        for attempt in range(2):
+            conn = self.acquire()
+            try:
+                conn.smtp.send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                self.release(conn, broken=True)
+                if attempt:
+                    raise
+                print(f"🔌 SMTP connection dropped ({e}), reconnecting...")
+                continue
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The session itself is fine after a rejected message
+                self.release(conn)
+                raise
+            except Exception:
+                self.release(conn, broken=True)
+                raise
+            conn.messages += 1
+            self.release(conn)
+            return
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(conn)
+            with self._lock:
+                self._open -= 1
+
+
+def _smtp_code(error):
+    """Reply code of an SMTP error, or None when the connection itself failed"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return max(codes) if codes else None
+    return getattr(error, 'smtp_code', None)
+
+
+# OSErrors that come from local files (e.g. an attachment), not the network
+LOCAL_ERRORS = (FileNotFoundError, PermissionError, IsADirectoryError, NotADirectoryError)
+
+
+def is_transient(error):
+    code = _smtp_code(error)
+    if code is None:
+        if isinstance(error, LOCAL_ERRORS):
+            return False
+        return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, OSError))
+    return 400 <= code < 500
+
+
+def encode_part(filename, data):
+    """Bytes as a base64-encoded MIME attachment"""
+    maintype, subtype = (mimetypes.guess_type(filename)[0] or 'application/octet-stream').split('/')
+    attach = MIMEBase(maintype, subtype)
+    attach.set_payload(data)
+    encoders.encode_base64(attach)
+    attach.add_header('Content-Disposition', 'attachment', filename=filename)
+    return attach
+
+
+def encode_attachment(attachment, blobs=None):
+    """A file path, or a {'blob', 'filename'} reference into the blobstore, as a MIME part"""
+    if isinstance(attachment, dict):
+        return encode_part(attachment['filename'], blobs.get(attachment['blob']))
+    with open(attachment, 'rb') as f:
+        return encode_part(os.path.basename(attachment), f.read())
+
+
+class AttachmentCache:
+    """Encoded MIME parts keyed by (path, mtime, size) or blob hash; the same resume is encoded once
+
+    Parts are only read while messages are serialized, so one part can be
+    attached to any number of messages.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._parts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, attachment, blobs=None):
+        if isinstance(attachment, dict):
+            # Blobs never change, so there is nothing to go stale
+            key = ('blob', attachment['blob'], attachment['filename'])
+        else:
+            stat = os.stat(attachment)
+            key = (os.path.abspath(attachment), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            part = self._parts.get(key)
+            if part is not None:
+                self._parts.move_to_end(key)
+                self.hits += 1
+                return part
+
+        part = encode_attachment(attachment, blobs)
+        with self._lock:
+            self.misses += 1
+            self._parts[key] = part
+            if key[0] != 'blob':
+                # A rewritten file gets a new key; drop the stale encodings of that path
+                for stale in [k for k in self._parts if k[0] == key[0] and k != key]:
+                    del self._parts[stale]
+            while len(self._parts) > self.max_entries:
+                self._parts.popitem(last=False)
+        return part
+
+
+def build_message(sender, recipient, subject, body, attachments=(), attachment_cache=None, blobs=None):
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = recipient
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+
+    for attachment in attachments:
+        msg.attach(attachment_cache.get(attachment, blobs) if attachment_cache else encode_attachment(attachment, blobs))
+    return msg
+
+
+class Mailer:
+    """Outbox-backed sender
+
+    With a blobstore, attachments are copied into it when a message is queued, so a
+    retry days later sends exactly what was queued even if the file has changed;
+    generated attachments can then be passed as {'filename', 'data'} without a file.
+    """
+
+    def __init__(self, pool, db=None, rate=None, max_attempts=5, retry_delay=60, workers=None, blobs=None):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.pool = pool
+        self.db = db
+        self.rate = rate or get_rate_limiter().bucket('email')
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.workers = workers or pool.size
+        self.attachments = AttachmentCache()
+        self.blobs = blobs
+
+        interrupted = self.db.reset_interrupted_outbox()
+        if interrupted:
+            print(f"📤 Re-queued {interrupted} emails from an interrupted run")
+
+    def enqueue(self, sender, recipient, subject, body, attachments=None, application_id=None):
+        """Store a message in the outbox; returns its id"""
+        if attachments and self.blobs is not None:
+            attachments = [self.blobs.attachment(attachment) for attachment in attachments]
+        elif any(isinstance(attachment, dict) and 'data' in attachment for attachment in attachments or ()):
+            raise ValueError("Attachments given as data need a blobstore")
+        return self.db.add_outbox_message(sender, recipient, subject, body, attachments, application_id)
+
+    def _deliver(self, message):
+        try:
+            # A missing attachment won't appear by retrying
+            msg = build_message(
+                message['sender'], message['recipient'], message['subject'],
+                message['body'], message['attachments'], self.attachments, self.blobs
+            )
+        except Exception as e:
+            self.db.mark_outbox_failed(message['id'], f"{type(e).__name__}: {e}")
+            print(f"❌ Could not build the message to {message['recipient']}: {e}")
+            return 'failed'
+
+        self.rate.wait()
+        try:
+            self.pool.send(msg)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if is_transient(e) and message['attempts'] < self.max_attempts:
+                delay = self.retry_delay * 2 ** (message['attempts'] - 1)
+                self.db.mark_outbox_retry(message['id'], error, datetime.now() + timedelta(seconds=delay))
+                print(f"⏳ Temporary failure sending to {message['recipient']}, retrying in {delay}s: {e}")
+                return 'retry'
+            self.db.mark_outbox_failed(message['id'], error)
+            print(f"❌ Failed to send to {message['recipient']}: {e}")
+            return 'failed'
+
+        self.db.mark_outbox_sent(message['id'])
+        return 'sent'
+
+    def flush(self, limit=100, message_ids=None):
+        """Send due outbox messages over the pooled connections; returns {id: outcome}"""
+        messages = self.db.claim_outbox_messages(limit, message_ids)
+        if not messages:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='mailer') as executor:
+            outcomes = list(executor.map(self._deliver, messages))
+        return {message['id']: outcome for message, outcome in zip(messages, outcomes)}
+
+    def send(self, sender, recipient, subject, body, attachments=None, application_id=None):
+        """Queue one message and try to send it now; returns 'sent', 'retry' or 'failed'"""
+        message_id = self.enqueue(sender, recipient, subject, body, attachments, application_id)
+        return self.flush(message_ids=[message_id]).get(message_id, 'retry')
+
+    def close(self):
+        self.pool.close()
+
+
+def benchmark(messages=500, size_mb=2, alloc_samples=50):
+    """Build and serialize messages with a large PDF, encoding it per message vs once"""
+    import random
+    import shutil
+    import tempfile
+    import tracemalloc
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'resume.pdf')
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4\n' + random.randbytes(size_mb * 1024 * 1024))
+
+    def per_message(_):
+        return encode_attachment(path)
+    strategies = {'encode per message': per_message, 'attachment cache': AttachmentCache().get}
+
+    try:
+        print(f"📊 {messages} messages with a {size_mb}MB PDF attached")
+        for name, get_part in strategies.items():
+            def build():
+                msg = build_message('me@example.com', 'jobs@example.com', 'Application', 'Hello')
+                msg.attach(get_part(path))
+                return msg
+
+            start = time.process_time()
+            for _ in range(messages):
+                build().as_bytes()
+            cpu = time.process_time() - start
+
+            # Allocation of building one message (what differs between the two), sampled
+            tracemalloc.start()
+            peaks = []
+            for _ in range(alloc_samples):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                msg = build()
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                del msg
+            tracemalloc.stop()
+
+            print(f"   {name}: {cpu:.2f}s CPU total ({cpu / messages * 1000:.1f} ms/message), "
+                  f"{sum(peaks) / len(peaks) / 1024 / 1024:.2f} MB allocated per message build")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -7,17 +7,16 @@ Your personal assistant for managing job applications
 import os
 import sys
 from datetime import datetime, timedelta
-from database import Database
-from resume_tailor import ResumeTailor
-from job_finder import JobFinder
 from config import Config
+from app_context import get_app_context
 
 class JobApplicationAssistant:
-    def __init__(self):
+    def __init__(self, context=None):
         print("\n🚀 Initializing Job Application Assistant...")
-        self.db = Database()
-        self.tailor = ResumeTailor()
-        self.finder = JobFinder()
+        self.context = context or get_app_context()
+        self.db = self.context.db
+        self.tailor = self.context.tailor
+        self.finder = self.context.finder
         
         print("✅ Ready to help you land your dream job!")
         print("=" * 60)
@@ -137,28 +136,14 @@ class JobApplicationAssistant:
             tailored_resume = self.tailor.base_resume
             cover_letter = self.tailor.get_cover_letter_template(company, position)
         
-        # Save to files
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_company = "".join(c for c in company if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
-        safe_position = "".join(c for c in position if c.isalnum() or c in (' ', '-', '_')).rstrip()[:20]
-        
-        resume_filename = f"data/resumes/{safe_company}_{safe_position}_{timestamp}_resume.txt"
-        cover_filename = f"data/resumes/{safe_company}_{safe_position}_{timestamp}_cover.txt"
-        
-        os.makedirs('data/resumes', exist_ok=True)
-        
+        # Store the documents, the resume as a diff against the base resume
         try:
-            with open(resume_filename, 'w') as f:
-                f.write(tailored_resume)
-            
-            with open(cover_filename, 'w') as f:
-                f.write(cover_letter)
-            
+            documents = self.context.documents
+            resume_doc_id = documents.put(tailored_resume, 'resume', documents.put_base(self.tailor.base_resume))
+            cover_doc_id = documents.put(cover_letter, 'cover_letter')
             print("\n✅ Documents generated successfully!")
-            print(f"📄 Resume saved: {resume_filename}")
-            print(f"📄 Cover letter saved: {cover_filename}")
         except Exception as e:
-            print(f"Error saving files: {e}")
+            print(f"Error saving documents: {e}")
             return
         
         # Show preview
@@ -173,26 +158,28 @@ class JobApplicationAssistant:
             company=company,
             position=position,
             job_url=job_url,
-            resume=resume_filename,
-            cover_letter=cover_filename,
             notes=f"Applied on {datetime.now().strftime('%Y-%m-%d %H:%M')}",
             salary_range=salary_range,
             location=location,
-            job_type=job_type
+            job_type=job_type,
+            source='cli',
+            resume_doc_id=resume_doc_id,
+            cover_doc_id=cover_doc_id
         )
         
         print(f"\n🎉 Application logged! ID: {app_id}")
+        print(f"📄 Resume and cover letter: http://localhost:5000/application/{app_id} (python app.py)")
         
         # Set reminder
-        print("\n📅 Don't forget to follow up in 1 week!")
-        follow_up_date = datetime.now() + timedelta(days=7)
-        print(f"   Suggested follow-up date: {follow_up_date.strftime('%Y-%m-%d')}")
+        print(f"\n📅 Follow-up reminder set for {Config.FOLLOW_UP_DAYS} days from now!")
+        follow_up_date = datetime.now() + timedelta(days=Config.FOLLOW_UP_DAYS)
+        print(f"   Follow-up date: {follow_up_date.strftime('%Y-%m-%d')}")
         
         print("\n📋 NEXT STEPS:")
-        print("1. Review and polish the generated documents")
+        print("1. Review and polish the generated documents in the web app")
         print("2. Submit through the company's website")
         print("3. Update status to 'applied' in the tracker")
-        print("4. Set a calendar reminder for follow-up")
+        print("4. Check 'Application Statistics' for follow-ups that are due")
         
         if job_url:
             print(f"\n🔗 Apply here: {job_url}")
@@ -333,19 +320,42 @@ class JobApplicationAssistant:
                 }.get(status, '❓')
                 print(f"   {emoji} {status.capitalize()}: {count}")
         
-        # Calculate response rate
-        if stats['total'] > 0:
-            responses = sum(count for status, count in stats['by_status'] 
-                          if status in ['interview', 'rejected', 'offer', 'accepted'])
-            response_rate = (responses / stats['total']) * 100
-            print(f"\n📬 Response Rate: {response_rate:.1f}%")
+        # Funnel from the status history (an interview that ended in a rejection still counts)
+        report = self.context.analytics.report()
+        overall = report['overall']
+        if overall:
+            print(f"\n📬 Response Rate: {overall['response_rate']:.1f}%")
+            if overall['interviews'] > 0:
+                print(f"🎤 Interview Rate: {overall['interview_rate']:.1f}%")
+            if overall['median_days_to_response'] is not None:
+                print(f"⏱️  Median Time to Response: {overall['median_days_to_response']:.1f} days")
+            
+            print("\n🔻 Funnel:")
+            for stage in report['funnel'][1:]:
+                if stage['conversion'] is not None:
+                    print(f"   {stage['stage'].capitalize()}: {stage['count']} "
+                          f"({stage['conversion']:.1f}% of previous stage)")
+            
+            if len(report['by_source']) > 1:
+                print("\n🧭 By Source:")
+                for row in report['by_source']:
+                    print(f"   {row['name']}: {row['applications']} applications, "
+                          f"{row['response_rate']:.1f}% response, {row['interview_rate']:.1f}% interview")
             
-            # Interview conversion
-            interviews = sum(count for status, count in stats['by_status'] 
-                           if status in ['interview', 'offer', 'accepted'])
-            if interviews > 0:
-                interview_rate = (interviews / stats['total']) * 100
-                print(f"🎤 Interview Rate: {interview_rate:.1f}%")
+            if len(report['by_resume']) > 1:
+                print("\n📄 By Resume:")
+                for row in report['by_resume']:
+                    print(f"   {row['name']}: {row['applications']} applications, "
+                          f"{row['response_rate']:.1f}% response, {row['interview_rate']:.1f}% interview")
+        
+        # Follow-ups that are due
+        due_count, due = self.context.follow_ups.reminders(limit=5)
+        if due_count:
+            print(f"\n📅 Follow-ups Due: {due_count}")
+            for follow_up in due:
+                contact = follow_up['contact_email'] or 'follow up by hand'
+                print(f"   • {follow_up['position']} at {follow_up['company']} "
+                      f"(applied {(follow_up['date_applied'] or '')[:10]}) - {contact}")
         
         print("\n💡 Insights & Tips:")
         if stats['total'] == 0:
@@ -358,7 +368,6 @@ class JobApplicationAssistant:
             print("• Great pace! Keep the momentum going!")
         
         if stats['total'] > 20:
-            print("• Remember to follow up on applications older than 1 week.")
             print("• Consider refining your resume if response rate is low.")
     
     def run(self):
@@ -401,7 +410,31 @@ class JobApplicationAssistant:
                 print("Returning to menu...")
                 continue
 
+def run_export(context, argv):
+    """Non-interactive export: python main.py --export applications --format parquet [--output PATH]"""
+    import argparse
+    from exporter import Exporter, ExportError, DATASETS, FORMATS
+
+    parser = argparse.ArgumentParser(description="Export applications, follow-ups or saved jobs")
+    parser.add_argument('--export', required=True, choices=list(DATASETS))
+    parser.add_argument('--format', default='csv', choices=list(FORMATS))
+    parser.add_argument('--output', help="File to write (default data/exports/<dataset>.<format>)")
+    args = parser.parse_args(argv)
+
+    try:
+        path = Exporter(context.db).export(args.export, args.format, args.output)
+    except ExportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Exported {args.export} to {path}")
+
 if __name__ == "__main__":
+    context = get_app_context().open()
+    
+    if '--export' in sys.argv[1:]:
+        run_export(context, sys.argv[1:])
+        sys.exit(0)
+    
     # Clear screen for better presentation
     os.system('clear' if os.name == 'posix' else 'cls')
     
@@ -431,5 +464,8 @@ if __name__ == "__main__":
     print("\n    Starting application...\n")
     
     # Run the app
-    app = JobApplicationAssistant()
-    app.run()
\ No newline at end of file
+    app = JobApplicationAssistant(context)
+    try:
+        app.run()
+    finally:
+        context.close()
\ No newline at end of file
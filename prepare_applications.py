@@ -6,14 +6,16 @@ No more CAPTCHA loops!
 
 import json
 from datetime import datetime
-from resume_tailor import ResumeTailor
-from database import Database
-import os
+from job_details import job_description_text
+from app_context import get_app_context
 
 class ApplicationPreparer:
-    def __init__(self):
-        self.tailor = ResumeTailor()
-        self.db = Database()
+    def __init__(self, context=None):
+        self.context = context or get_app_context()
+        self.tailor = self.context.tailor
+        self.db = self.context.db
+        self.details = self.context.details
+        self.documents = self.context.documents
         
     def save_found_jobs(self, jobs):
         """Save jobs to JSON file"""
@@ -45,17 +47,16 @@ class ApplicationPreparer:
         
         applications = []
         
+        # Full descriptions from each job's page, fetched concurrently up front
+        self.details.enrich(jobs)
+        
+        # Tailored resumes are stored as diffs against this one
+        base_id = self.documents.put_base(self.tailor.base_resume)
+        
         for i, job in enumerate(jobs, 1):
             print(f"\n📝 {i}/{len(jobs)}: {job['title']} at {job['company']}")
             
-            # Create a job description from what we have
-            job_description = f"""
-            Position: {job['title']}
-            Company: {job['company']}
-            Location: {job.get('location', 'Thessaloniki')}
-            
-            This is a {job['title']} position at {job['company']} based in {job.get('location', 'Thessaloniki')}.
-            """
+            job_description = job_description_text(job)
             
             try:
                 # Generate tailored resume
@@ -74,36 +75,26 @@ class ApplicationPreparer:
                     position=job['title']
                 )
                 
-                # Save individual files
-                safe_company = "".join(c for c in job['company'] if c.isalnum() or c in ' -_').strip()[:30]
-                safe_title = "".join(c for c in job['title'] if c.isalnum() or c in ' -_').strip()[:30]
-                
-                resume_file = f"data/resumes/{i}_{safe_company}_{safe_title}_resume.txt"
-                cover_file = f"data/resumes/{i}_{safe_company}_{safe_title}_cover.txt"
-                
-                os.makedirs('data/resumes', exist_ok=True)
-                
-                with open(resume_file, 'w', encoding='utf-8') as f:
-                    f.write(tailored_resume)
-                
-                with open(cover_file, 'w', encoding='utf-8') as f:
-                    f.write(cover_letter)
+                # Store the documents
+                resume_doc_id = self.documents.put(tailored_resume, 'resume', base_id)
+                cover_doc_id = self.documents.put(cover_letter, 'cover_letter')
                 
                 # Log to database
                 app_id = self.db.add_application(
                     company=job['company'],
                     position=job['title'],
                     location=job.get('location', 'Thessaloniki'),
-                    resume=resume_file,
-                    cover_letter=cover_file,
-                    notes=f"Prepared on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+                    notes=f"Prepared on {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+                    source='prepared',
+                    resume_doc_id=resume_doc_id,
+                    cover_doc_id=cover_doc_id
                 )
                 
                 applications.append({
                     'app_id': app_id,
                     'job': job,
-                    'resume_file': resume_file,
-                    'cover_file': cover_file
+                    'resume_doc_id': resume_doc_id,
+                    'cover_doc_id': cover_doc_id
                 })
                 
                 print(f"   ✅ Application #{app_id} prepared")
@@ -119,12 +110,13 @@ class ApplicationPreparer:
         
         print(f"\n✅ COMPLETE!")
         print(f"📊 Prepared: {len(applications)}/{len(jobs)} applications")
-        print(f"📁 Files saved in: data/resumes/")
+        print(f"📁 Documents stored in the database; open them at http://localhost:5000/application/<id>")
         print(f"📋 Summary saved to: {summary_file}")
         
         return applications
 
 def main():
+    context = get_app_context().open()
     # The jobs from your indeed_selenium.py run
     jobs_from_search = [
         {'title': 'Junior Java Web Developer / Tester (Remote/Thessaloniki)', 'company': 'EUROPEAN DYNAMICS', 'location': 'Thessaloniki'},
@@ -144,7 +136,7 @@ def main():
     ╚════════════════════════════════════════════════════╝
     """)
     
-    preparer = ApplicationPreparer()
+    preparer = ApplicationPreparer(context)
     
     # Save the jobs
     preparer.save_found_jobs(jobs_from_search)
@@ -163,14 +155,14 @@ def main():
         ==================
         • {len(applications)} tailored resumes ready
         • {len(applications)} custom cover letters ready
-        • All saved in: data/resumes/
+        • All viewable in the web app (python app.py)
         
         HOW TO APPLY:
         =============
         1. Go to Indeed.com
         2. Search for each company/position
         3. Click "Apply"
-        4. Copy/paste your tailored resume & cover letter
+        4. Copy/paste your tailored resume & cover letter from the application page
         5. Submit!
         
         YOUR APPLICATIONS:
@@ -180,8 +172,7 @@ def main():
         for i, app in enumerate(applications, 1):
             print(f"{i}. {app['job']['title']}")
             print(f"   Company: {app['job']['company']}")
-            print(f"   Resume: {app['resume_file']}")
-            print(f"   Cover: {app['cover_file']}")
+            print(f"   Documents: http://localhost:5000/application/{app['app_id']}")
             print()
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+"""
+Rate limiting for scraping and applications
+Token buckets per channel (and optionally per host) plus daily quotas persisted in the database
+"""
+
+import threading
+import time
+from datetime import date
+
+from config import Config
+
+
+class QuotaExceeded(Exception):
+    """A daily quota is used up; try again tomorrow"""
+
+
+class TokenBucket:
+    """Allows bursts up to `burst` events, refilling at `per_minute`
+
+    wait() reserves a token even when none is available yet, so concurrent
+    callers are spaced out evenly instead of waking up together.
+    """
+
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take a token; returns how long to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def try_take(self):
+        """Take a token only if one is available right now"""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimiter:
+    def __init__(self, limits=None, quotas=None, db=None):
+        self.limits = Config.RATE_LIMITS if limits is None else limits
+        self.quotas = Config.DAILY_QUOTAS if quotas is None else quotas
+        self._db = db
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from database import Database
+            self._db = Database()
+        return self._db
+
+    def bucket(self, channel, host=None):
+        """Bucket for a channel, or for one host within it (each host gets the channel's limits)"""
+        key = (channel, host)
+        with self._lock:
+            if key not in self._buckets:
+                per_minute, burst = self.limits.get(channel, (0, 1))
+                self._buckets[key] = TokenBucket(per_minute, burst)
+            return self._buckets[key]
+
+    def acquire(self, channel, host=None):
+        """Block until the channel (and host) may be used again; returns seconds waited"""
+        return self.bucket(channel, host).wait()
+
+    def try_acquire(self, channel, host=None):
+        return self.bucket(channel, host).try_take()
+
+    def take_daily(self, name, raise_error=False):
+        """Count one use against today's quota; False (or QuotaExceeded) once it is used up"""
+        limit = self.quotas.get(name)
+        if limit is None:
+            return True
+        if self.db.take_daily_quota(name, limit, date.today().isoformat()):
+            return True
+        if raise_error:
+            raise QuotaExceeded(f"Daily {name} quota of {limit} reached")
+        return False
+
+    def refund(self, name, day=None):
+        """Give back a use taken by take_daily when the attempt didn't go through"""
+        if self.quotas.get(name) is not None:
+            self.db.release_daily_quota(name, day or date.today().isoformat())
+
+    def remaining(self, name):
+        limit = self.quotas.get(name)
+        if limit is None:
+            return None
+        return max(0, limit - self.db.get_daily_quota_used(name, date.today().isoformat()))
+
+
+_shared_limiter = None
+
+
+def get_rate_limiter():
+    """Limiter shared by every loop in this process"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
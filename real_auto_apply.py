@@ -4,24 +4,28 @@ REAL Auto-Apply System - Actually sends applications!
 Uses your existing resume and applies to jobs automatically
 """
 
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-import time
+from selenium.webdriver.support import expected_conditions as EC
 import json
 import os
 from datetime import datetime
-import PyPDF2
 import re
 import getpass
+from browser_pool import BrowserPool
+from selenium_waits import WaitStrategy
+from app_context import get_app_context
+
+# Easy Apply modal buttons, in priority order (Submit must stay first)
+EASY_APPLY_BUTTONS = [
+    (By.XPATH, "//button[contains(@aria-label, 'Submit')]"),
+    (By.XPATH, "//button[contains(@aria-label, 'Continue')]"),
+    (By.XPATH, "//button[contains(@aria-label, 'Review')]"),
+]
 
 class RealAutoApply:
-    def __init__(self, config_path='auto_apply_config.json'):
+    def __init__(self, config_path='auto_apply_config.json', context=None):
+        self.context = context or get_app_context()
         # Load config
         with open(config_path, 'r') as f:
             self.config = json.load(f)
@@ -29,6 +33,7 @@ class RealAutoApply:
         self.email = self.config['email']
         self.resume_path = self.config['resume_path']  # Your PDF resume
         self.applied_jobs = self.load_applied_history()
+        self.limiter = self.context.limiter
         
         # Check if resume exists
         if not os.path.exists(self.resume_path):
@@ -61,12 +66,13 @@ class RealAutoApply:
             json.dump(self.applied_jobs, f, indent=2)
     
     def setup_email(self, password):
-        """Setup Gmail SMTP"""
+        """Setup Gmail SMTP (pooled, reconnects on its own)"""
         try:
-            self.smtp = smtplib.SMTP('smtp.gmail.com', 587)
-            self.smtp.starttls()
-            self.smtp.login(self.email, password)
+            self.mailer = self.context.mailer(self.email, password)
+            self.mailer.pool.check()
             print("✅ Email connected successfully!")
+            # Anything still queued from an earlier run goes out first
+            self.mailer.flush()
             return True
         except Exception as e:
             print(f"❌ Email connection failed: {e}")
@@ -81,15 +87,14 @@ class RealAutoApply:
             print(f"⏭️  Already applied to {position} at {company_name}")
             return False
         
+        if not self.limiter.take_daily('applications'):
+            print(f"⏸️ Daily application limit reached, not applying to {company_name}")
+            return False
+        
+        sent = False
         try:
             print(f"📧 Applying to {position} at {company_name}...")
             
-            # Create email
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = company_email
-            msg['Subject'] = f"Application for {position} Position"
-            
             # Email body
             if custom_message:
                 body = custom_message
@@ -117,19 +122,20 @@ Evangelos Chatziantoniou
 {self.email}
 LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
             
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach resume PDF
-            with open(self.resume_path, 'rb') as f:
-                attach = MIMEApplication(f.read(), _subtype="pdf")
-                attach.add_header('Content-Disposition', 'attachment', 
-                                filename=os.path.basename(self.resume_path))
-                msg.attach(attach)
-            
-            # Send email
-            self.smtp.send_message(msg)
+            # Queue in the outbox and send with the resume attached
+            outcome = self.mailer.send(
+                self.email, company_email, f"Application for {position} Position",
+                body, attachments=[self.resume_path]
+            )
+            if outcome == 'failed':
+                self.limiter.refund('applications')
+                return False
+            sent = True
             
-            print(f"✅ Application sent to {company_email}!")
+            if outcome == 'sent':
+                print(f"✅ Application sent to {company_email}!")
+            else:
+                print(f"📤 Application to {company_email} queued for retry")
             
             # Save to history
             self.save_applied_job(job_id, 'email', company_name, position)
@@ -137,6 +143,8 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
             return True
             
         except Exception as e:
+            if not sent:
+                self.limiter.refund('applications')
             print(f"❌ Failed to send application: {e}")
             return False
     
@@ -145,24 +153,25 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
         print("\n🔗 LINKEDIN EASY APPLY")
         print("=" * 50)
         
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
+        # Visible browser so 2FA can be completed by hand
+        pool = BrowserPool(size=1, headless=False)
+        pooled = pool.acquire()
+        driver = pooled.driver
         
-        driver = webdriver.Chrome(options=options)
+        waits = WaitStrategy(driver)
         
         try:
             # Login to LinkedIn
             print("🔐 Logging into LinkedIn...")
             driver.get("https://www.linkedin.com/login")
-            time.sleep(2)
             
             # Enter credentials
-            driver.find_element(By.ID, "username").send_keys(email)
+            waits.element('linkedin_login_form', By.ID, "username").send_keys(email)
             driver.find_element(By.ID, "password").send_keys(password)
+            login_url = driver.current_url
             driver.find_element(By.XPATH, "//button[@type='submit']").click()
             
-            time.sleep(5)
+            waits.url_changes('linkedin_login', login_url)
             
             # Check for 2FA
             if "checkpoint" in driver.current_url:
@@ -179,12 +188,15 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
                     # Search URL with Easy Apply filter
                     search_url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}&location={location}&f_AL=true"
                     driver.get(search_url)
-                    time.sleep(3)
                     
                     # Find Easy Apply jobs
+                    if not waits.element('linkedin_results', By.CSS_SELECTOR, ".job-card-container", required=False):
+                        print("  ⚠️ No job cards loaded")
+                        continue
                     job_cards = driver.find_elements(By.CSS_SELECTOR, ".job-card-container")[:5]
                     
                     for card in job_cards:
+                        reserved = submitted = False
                         try:
                             # Get job info
                             title = card.find_element(By.CSS_SELECTOR, ".job-card-list__title").text
@@ -195,52 +207,44 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
                                 print(f"  ⏭️ Already applied to {title} at {company}")
                                 continue
                             
+                            if not self.limiter.take_daily('applications'):
+                                print("  ⏸️ Daily application limit reached")
+                                return
+                            reserved = True
+                            
+                            # Don't spam applications
+                            self.limiter.acquire('linkedin')
                             print(f"\n  🎯 Applying to {title} at {company}")
                             
                             # Click job card
                             card.click()
-                            time.sleep(2)
                             
                             # Click Easy Apply button
                             try:
-                                easy_apply_btn = driver.find_element(By.CSS_SELECTOR, ".jobs-apply-button")
-                                easy_apply_btn.click()
-                                time.sleep(2)
+                                waits.clickable('linkedin_job_details', By.CSS_SELECTOR, ".jobs-apply-button").click()
                                 
                                 # Handle application flow
                                 # This varies by job, but try common patterns
                                 
-                                # Try to click Next/Submit buttons
+                                # Click Next/Review until Submit appears
                                 max_steps = 5
                                 for step in range(max_steps):
-                                    time.sleep(1)
+                                    found = waits.first_clickable('linkedin_apply_step', EASY_APPLY_BUTTONS, required=False)
+                                    if not found:
+                                        break
                                     
-                                    # Check for submit button
-                                    try:
-                                        submit_btn = driver.find_element(By.XPATH, "//button[contains(@aria-label, 'Submit')]")
-                                        submit_btn.click()
+                                    index, button = found
+                                    button.click()
+                                    
+                                    if index == 0:
                                         print(f"    ✅ Application submitted!")
+                                        submitted = True
                                         self.save_applied_job(job_id, 'linkedin', company, title)
-                                        time.sleep(2)
+                                        waits.gone('linkedin_submit', By.XPATH, EASY_APPLY_BUTTONS[0][1], required=False)
                                         break
-                                    except:
-                                        pass
-                                    
-                                    # Check for next button
-                                    try:
-                                        next_btn = driver.find_element(By.XPATH, "//button[contains(@aria-label, 'Continue')]")
-                                        next_btn.click()
-                                        continue
-                                    except:
-                                        pass
                                     
-                                    # Check for review button
-                                    try:
-                                        review_btn = driver.find_element(By.XPATH, "//button[contains(@aria-label, 'Review')]")
-                                        review_btn.click()
-                                        continue
-                                    except:
-                                        pass
+                                    # Let the next form step replace this one
+                                    waits.until('linkedin_step_transition', EC.staleness_of(button), required=False)
                                 
                                 # Close modal if still open
                                 try:
@@ -255,11 +259,15 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
                         except Exception as e:
                             print(f"  ❌ Error with job card: {e}")
                             continue
-                        
-                        time.sleep(5)  # Don't spam applications
+                        finally:
+                            # Only submitted applications count against the daily limit
+                            if reserved and not submitted:
+                                self.limiter.refund('applications')
             
         finally:
-            driver.quit()
+            waits.report()
+            pool.release(pooled)
+            pool.close()
     
     def search_jobs_with_emails(self):
         """Find jobs that accept email applications"""
@@ -299,6 +307,7 @@ LinkedIn: linkedin.com/in/vangelis-chatziantoniou"""
         return email_jobs
 
 def main():
+    context = get_app_context().open()
     print("""
     ╔═══════════════════════════════════════════════════════════╗
     ║   🚀 REAL AUTO-APPLY SYSTEM                              ║
@@ -306,7 +315,7 @@ def main():
     ╚═══════════════════════════════════════════════════════════╝
     """)
     
-    applier = RealAutoApply()
+    applier = RealAutoApply(context=context)
     
     print("\nChoose application method:")
     print("1. Email applications (automated)")
@@ -329,12 +338,14 @@ def main():
                 
                 if confirm.lower() == 'y':
                     for job in email_jobs:
+                        # Spaced out by the mailer's send rate
                         applier.apply_via_email(
                             company_email=job['email'],
                             position=job['position'],
                             company_name=job['company']
                         )
-                        time.sleep(10)  # Wait between applications
+                
+                applier.mailer.close()
     
     if choice in ['2', '3']:
         # LinkedIn Easy Apply
@@ -0,0 +1,281 @@
+"""
+Resume text extraction
+Content-hash cache, process-pool PDF parsing and background extraction
+"""
+
+import atexit
+import codecs
+import hashlib
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _extract_pdf_pages(data, start, stop):
+    """Worker: extract text for pages [start, stop) of a PDF"""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+class ResumeTextExtractor:
+    def __init__(self, cache_folder='data/extract_cache', parallel_threshold=20,
+                 pages_per_task=8, max_workers=None):
+        self.cache_folder = cache_folder
+        self.parallel_threshold = parallel_threshold
+        self.pages_per_task = pages_per_task
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._process_pool = None
+        self._thread_pool = None
+        os.makedirs(cache_folder, exist_ok=True)
+
+    @staticmethod
+    def content_hash(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _cache_path(self, digest):
+        return os.path.join(self.cache_folder, f"{digest}.txt")
+
+    def get_cached(self, digest):
+        """Previously extracted text for a content hash, or None"""
+        path = self._cache_path(digest)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        return None
+
+    def _store(self, digest, text):
+        path = self._cache_path(digest)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def extract_bytes(self, data, extension, digest=None):
+        """Extract text from file bytes, reusing the cache for identical content"""
+        digest = digest or self.content_hash(data)
+        cached = self.get_cached(digest)
+        if cached is not None:
+            return cached
+
+        extension = extension.lower().lstrip('.')
+        try:
+            if extension == 'txt':
+                text = data.decode('utf-8', errors='replace')
+            elif extension == 'pdf':
+                text = self._extract_pdf(data)
+            elif extension in ['doc', 'docx']:
+                import docx2txt
+                text = docx2txt.process(io.BytesIO(data))
+            else:
+                return None
+        except Exception as e:
+            print(f"Error extracting text: {e}")
+            return None
+
+        if text:
+            self._store(digest, text)
+        return text
+
+    def extract_file(self, filepath, digest=None):
+        """Extract text from a file on disk
+
+        With a known content hash, cached text is returned without reading the file.
+        """
+        if digest:
+            cached = self.get_cached(digest)
+            if cached is not None:
+                return cached
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        return self.extract_bytes(data, filepath.rsplit('.', 1)[-1], digest=digest)
+
+    def _extract_pdf(self, data):
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        num_pages = len(reader.pages)
+
+        if num_pages < self.parallel_threshold or self.max_workers < 2:
+            pages = [page.extract_text() or '' for page in reader.pages]
+        else:
+            pool = self._get_process_pool()
+            ranges = [(start, min(start + self.pages_per_task, num_pages))
+                      for start in range(0, num_pages, self.pages_per_task)]
+            futures = [pool.submit(_extract_pdf_pages, data, start, stop) for start, stop in ranges]
+            pages = [text for future in futures for text in future.result()]
+
+        return '\n'.join(pages)
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._process_pool
+
+    def submit_file(self, filepath, digest=None):
+        """Extract on a background thread; returns a Future with the text"""
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='extract')
+        return self._thread_pool.submit(self.extract_file, filepath, digest)
+
+    def save_stream(self, stream, folder, extension, chunk_size=64 * 1024):
+        """Write an upload to disk in chunks, hashing and extracting as it arrives
+
+        The file is stored as <sha256>.<extension>, so identical uploads share
+        one file. Returns (digest, filepath, text); text is None when the
+        format needs the whole file and extraction should run afterwards.
+        """
+        extension = extension.lower().lstrip('.')
+        os.makedirs(folder, exist_ok=True)
+        hasher = hashlib.sha256()
+        incremental = IncrementalExtraction(extension)
+
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    incremental.feed(chunk)
+                    f.write(chunk)
+
+            digest = hasher.hexdigest()
+            filepath = os.path.join(folder, f"{digest}.{extension}")
+            if os.path.exists(filepath):
+                os.remove(tmp_path)  # Duplicate upload, keep the existing file
+            else:
+                os.replace(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        text = self.get_cached(digest)
+        if text is None:
+            text = incremental.close()
+            if text:
+                self._store(digest, text)
+        return digest, filepath, text
+
+    def shutdown(self):
+        if self._thread_pool:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._process_pool:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+
+
+class IncrementalExtraction:
+    """Consumes upload chunks; plain text is decoded as it streams in
+
+    PDF and Word files need the complete document, so they return None
+    from close() and are parsed from the stored file instead.
+    """
+
+    def __init__(self, extension):
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace') if extension == 'txt' else None
+        self.parts = []
+
+    def feed(self, chunk):
+        if self.decoder:
+            self.parts.append(self.decoder.decode(chunk))
+
+    def close(self):
+        if not self.decoder:
+            return None
+        self.parts.append(self.decoder.decode(b'', final=True))
+        return ''.join(self.parts)
+
+
+_default_extractor = None
+
+
+def get_extractor():
+    """Shared extractor so the process pool and cache are reused"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = ResumeTextExtractor()
+        atexit.register(_default_extractor.shutdown)
+    return _default_extractor
+
+
+def make_sample_pdf(num_pages, lines_per_page=40):
+    """Build a plain-text PDF in memory (used for benchmarks)"""
+    objects = []
+    font_id = 3
+    page_ids = []
+    for page in range(num_pages):
+        lines = [f"Page {page + 1} line {line}: Experienced Python developer, Django, SQL, AWS."
+                 for line in range(lines_per_page)]
+        text_ops = ' '.join(f"({line}) Tj 0 -16 Td" for line in lines)
+        stream = f"BT /F1 10 Tf 40 800 Td {text_ops} ET".encode('latin-1')
+        content_id = 4 + page * 2
+        page_id = content_id + 1
+        objects.append((content_id, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"))
+        objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode('latin-1')))
+        page_ids.append(page_id)
+
+    kids = ' '.join(f"{pid} 0 R" for pid in page_ids)
+    objects = [
+        (1, b"<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode('latin-1')),
+        (3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"),
+    ] + objects
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id, body in objects:
+        offsets[obj_id] = out.tell()
+        out.write(b"%d 0 obj\n" % obj_id + body + b"\nendobj\n")
+    xref = out.tell()
+    size = len(objects) + 1
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for obj_id in range(1, size):
+        out.write(b"%010d 00000 n \n" % offsets[obj_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+    return out.getvalue()
+
+
+def benchmark(num_pages=50):
+    """Compare the old sequential += loop with parallel and cached extraction"""
+    import PyPDF2
+
+    data = make_sample_pdf(num_pages)
+
+    start = time.perf_counter()
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text()
+    legacy_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = ResumeTextExtractor(cache_folder=tmp)
+        if extractor.max_workers > 1:
+            # Start the worker processes so the timing covers parsing only
+            extractor._get_process_pool().submit(int).result()
+        start = time.perf_counter()
+        extractor.extract_bytes(data, 'pdf')
+        cold_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extractor.extract_bytes(data, 'pdf')
+        cached_time = time.perf_counter() - start
+        extractor.shutdown()
+
+    print(f"📊 {num_pages}-page PDF ({len(data) // 1024} KB)")
+    print(f"   Sequential +=:      {legacy_time * 1000:.1f} ms")
+    print(f"   Parallel ({extractor.max_workers} procs): {cold_time * 1000:.1f} ms")
+    print(f"   Cached re-upload:   {cached_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
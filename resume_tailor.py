@@ -1,5 +1,5 @@
-import openai
 from config import Config
+from keyword_extractor import get_default_automaton
 import json
 import os
 from datetime import datetime
@@ -7,6 +7,8 @@ from datetime import datetime
 class ResumeTailor:
     def __init__(self):
         if Config.OPENAI_API_KEY:
+            # Imported here: the openai package alone takes a few hundred ms to load
+            import openai
             # Try new OpenAI client format first (v1.0+)
             try:
                 self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
@@ -85,6 +87,7 @@ PROJECTS
                 return response.choices[0].message.content
             else:
                 # Old API format (v0.28)
+                import openai
                 response = openai.ChatCompletion.create(
                     model="gpt-3.5-turbo",
                     messages=messages,
@@ -211,15 +214,8 @@ Best regards,
     def extract_keywords(self, job_description):
         """Extract key skills and requirements from job description"""
         # Simple keyword extraction without AI
-        keywords = []
-        tech_keywords = ['python', 'java', 'javascript', 'sql', 'aws', 'docker', 
-                       'kubernetes', 'react', 'node', 'git', 'agile', 'scrum',
-                       'typescript', 'mongodb', 'postgresql', 'redis', 'flask',
-                       'django', 'fastapi', 'machine learning', 'data science']
-        
-        job_lower = job_description.lower()
-        for keyword in tech_keywords:
-            if keyword in job_lower:
-                keywords.append(keyword)
-        
-        return keywords
\ No newline at end of file
+        return get_default_automaton().keywords(job_description)
+    
+    def extract_keyword_hits(self, job_description):
+        """Skill hit counts and positions for a job description"""
+        return get_default_automaton().extract(job_description)
\ No newline at end of file
@@ -5,27 +5,48 @@ Auto Apply Bot - Automatically apply to jobs matching your criteria
 
 from auto_applier import JobAutoApplier
 from job_scraper import JobScraper
+from config import Config
+from apply_queue import ApplyQueue, ApplyWorkerPool, MANUAL_CHANNEL
+from scheduler import Scheduler, parse_interval
+from app_context import get_app_context
 import json
-import time
+import threading
 from datetime import datetime
-import schedule
 import os
 
 class AutoApplyBot:
-    def __init__(self):
+    # Watermark and carry-over scope of the bot's searches
+    scope = 'auto_apply_bot'
+    
+    def __init__(self, context=None):
         # Load configuration
         with open('auto_apply_config.json', 'r') as f:
             self.config = json.load(f)
         
+        self.context = context or get_app_context()
         self.applier = JobAutoApplier(
             email=self.config['email'],
-            email_password=self.config['email_password']
+            email_password=self.config['email_password'],
+            context=self.context
         )
         
         self.applier.keywords = self.config['keywords']
         self.applier.locations = self.config['locations']
         self.applier.exclude_companies = self.config.get('exclude_companies', [])
         self.applier.min_salary = self.config.get('min_salary')
+        
+        # Discovery only queues applications; worker threads send them at their own pace
+        self.queue = ApplyQueue(db=self.applier.db)
+        self.workers = ApplyWorkerPool(
+            self.queue,
+            handlers={'email': self.send_email_application},
+            limiter=self.context.limiter,
+            workers=self.config.get('apply_workers', 2),
+            poll_interval=parse_interval(Config.SCHEDULES['apply'])
+        )
+        self._email_ready = False
+        self._email_lock = threading.Lock()
+        self._carry_lock = threading.Lock()
     
     def run_job_search_and_apply(self):
         """Main job search and apply process"""
@@ -33,25 +54,63 @@ class AutoApplyBot:
         print(f"🤖 AUTO-APPLY BOT RUN - {datetime.now()}")
         print(f"{'='*50}")
         
-        # Search for jobs
-        scraper = JobScraper()
+        # Search for jobs posted since the last run
+        scraper = JobScraper(watermarks=self.context.watermarks)
+        
+        # One feed request covers every keyword
+        self.context.limiter.acquire('scrape', 'remoteok.io')  # Be respectful
+        scraper.scrape_remote_ok(self.config['keywords'])
+        
+        # Jobs earlier runs found but had no budget for compete with the new ones
+        with self._carry_lock:
+            self.queue_best_matches(scraper.jobs)
+    
+    def queue_best_matches(self, scraped):
+        """Queue the best new and carried-over matches that fit today's budget; carry over the rest"""
+        watermarks = self.context.watermarks
+        carried = watermarks.carried_over(self.scope)
+        jobs = {self.job_key(job): job for job in list(carried.values()) + scraped}
+        candidates = {key: job for key, job in jobs.items() if self.should_apply(job)}
+        
+        # Spend what is left of today's budget on the best matches for your resumes
+        budget = self.config.get('max_daily_applications', Config.MAX_APPLICATIONS_PER_DAY)
+        budget = max(0, budget - self.queue.queued_today())
+        if candidates and not budget:
+            print("⏸️ Today's applications are already queued")
+        chosen = self.applier.rank_jobs(list(candidates.values()))[:budget]
+        for score, resume_id, job in chosen:
+            print(f"📈 Match score {score:.2f}")
+            self.apply_to_job(job, resume_id)
         
-        # Search different sources
-        for keyword in self.config['keywords']:
-            scraper.scrape_remote_ok([keyword])
-            time.sleep(5)  # Be respectful
+        # The watermark has moved past the rest, so keep them for the next run
+        queued = {self.job_key(job) for _, _, job in chosen}
+        waiting = {key: job for key, job in candidates.items() if key not in queued}
+        watermarks.carry_over(self.scope, waiting)
+        watermarks.consumed(self.scope, set(carried) - set(waiting))
+        if waiting:
+            print(f"🗂️ {len(waiting)} matching jobs carried over to the next run")
+    
+    def enrich_jobs(self):
+        """Fetch full descriptions for carried-over jobs, so the next scrape ranks them on the whole posting"""
+        watermarks = self.context.watermarks
+        pending = {key: job for key, job in watermarks.carried_over(self.scope).items()
+                   if not job.get('detail_fetched')}
+        if not pending:
+            return
+        self.context.details.enrich(list(pending.values()))
         
-        # Apply to matching jobs
-        for job in scraper.jobs:
-            if self.should_apply(job):
-                self.apply_to_job(job)
-                time.sleep(60)  # Wait 1 minute between applications
+        # A scrape may have queued some of them while the pages were loading
+        with self._carry_lock:
+            still_carried = watermarks.carried_over(self.scope)
+            watermarks.carry_over(self.scope, {key: job for key, job in pending.items() if key in still_carried})
+    
+    def job_key(self, job):
+        return f"{job['company']}_{job['title']}"
     
     def should_apply(self, job):
         """Check if we should apply to this job"""
         # Check if already applied
-        job_id = f"{job['company']}_{job['title']}"
-        if job_id in self.applier.applied_jobs:
+        if self.job_key(job) in self.applier.applied_jobs:
             return False
         
         # Check salary if specified
@@ -61,42 +120,73 @@ class AutoApplyBot:
         
         return True
     
-    def apply_to_job(self, job):
-        """Apply to a specific job"""
-        print(f"\n🎯 Applying to: {job['title']} at {job['company']}")
+    def apply_to_job(self, job, resume_id=None):
+        """Queue an application to a specific job; resume_id is the saved resume it matched best"""
+        job_id = self.job_key(job)
         
         # If email application available
         if job.get('apply_email'):
-            resume_path = self.config['resume_path']
-            self.applier.auto_apply_email(job, resume_path)
+            task_id = self.queue.enqueue(job_id, 'email', {
+                'job': dict(job, id=job_id, email=job['apply_email']),
+                'resume_path': self.config['resume_path'],
+                'resume_id': resume_id
+            })
+            print(f"📨 Queued email application: {job['title']} at {job['company']}" if task_id
+                  else f"⏭️  Already queued: {job['title']} at {job['company']}")
         
-        # If URL only, log it for manual application
+        # If URL only, keep it for manual application
         else:
-            with open('data/manual_apply_queue.json', 'a') as f:
-                json.dump({
-                    'job': job,
-                    'timestamp': datetime.now().isoformat()
-                }, f)
-                f.write('\n')
-            print(f"📋 Added to manual apply queue: {job['url']}")
+            if self.queue.enqueue(job_id, MANUAL_CHANNEL, {'job': job, 'resume_id': resume_id}):
+                print(f"📋 Added to manual apply queue: {job['url']}")
+    
+    def ensure_email(self):
+        """Log in to SMTP on first use, shared by the apply and follow-up pipelines"""
+        with self._email_lock:
+            if not self._email_ready:
+                self.applier.setup_email()
+                self._email_ready = True
+    
+    def send_email_application(self, payload):
+        """Worker handler for the 'email' channel"""
+        self.ensure_email()
+        return self.applier.auto_apply_email(payload['job'], payload['resume_path'],
+                                             resume_id=payload.get('resume_id'))
+    
+    def flush_outbox(self):
+        """Retry emails that hit a temporary failure"""
+        if self._email_ready:
+            self.applier.mailer.flush()
+    
+    def send_follow_ups(self):
+        """Email the follow-ups that are due; ones without a contact email become reminders"""
+        engine = self.context.follow_ups
+        next_due = engine.next_due()
+        if next_due is None or next_due > str(datetime.now()):
+            return
+        self.ensure_email()
+        stats = engine.run(self.applier.mailer, self.config['email'])
+        if stats['queued'] or stats['manual']:
+            print(f"📅 Follow-ups: {stats['queued']} emailed, {stats['manual']} to do by hand")
     
     def run_scheduled(self):
-        """Run on schedule"""
-        # Schedule runs
-        schedule.every(4).hours.do(self.run_job_search_and_apply)
+        """Run the scrape, enrich, outbox and follow-up pipelines on their own schedules, with apply workers alongside"""
+        scheduler = Scheduler(db=self.applier.db)
+        scheduler.add('scrape', self.run_job_search_and_apply, every=Config.SCHEDULES['scrape'], jitter='10m')
+        scheduler.add('enrich', self.enrich_jobs, every=Config.SCHEDULES['enrich'])
+        scheduler.add('outbox', self.flush_outbox, every=Config.SCHEDULES['outbox'])
+        scheduler.add('follow_up', self.send_follow_ups, every=Config.SCHEDULES['follow_up'])
         
         print("🤖 Auto-Apply Bot Started!")
-        print(f"Will run every 4 hours")
         print(f"Keywords: {self.config['keywords']}")
         print(f"Locations: {self.config['locations']}")
         
-        # Run once immediately
-        self.run_job_search_and_apply()
-        
-        # Keep running
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        # The workers drain queued applications, including any left from earlier runs,
+        # and check for new ones every SCHEDULES['apply'] while idle
+        self.workers.start()
+        try:
+            scheduler.run()
+        finally:
+            self.workers.stop(timeout=30)
 
 if __name__ == "__main__":
     # Create config file if it doesn't exist
@@ -121,5 +211,6 @@ if __name__ == "__main__":
         exit()
     
     # Run the bot
-    bot = AutoApplyBot()
-    bot.run_scheduled()
\ No newline at end of file
+    with get_app_context() as context:
+        bot = AutoApplyBot(context)
+        bot.run_scheduled()
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Pipeline scheduler
+Runs independent jobs (scrape, apply, outbox, ...) concurrently on an asyncio loop,
+each on its own interval with jitter, never overlapping itself (even across processes),
+with the last run persisted so a restart doesn't re-run everything at once
+"""
+
+import asyncio
+import os
+import random
+import re
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from database import Database
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(spec):
+    """Seconds in an interval like 90, '90s', '15m', '4h', '1d' or '1h30m'"""
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    if not re.fullmatch(r'(\s*\d+(\.\d+)?\s*[smhd])+\s*', spec.lower()):
+        raise ValueError(f"Invalid interval: {spec!r}")
+    parts = re.findall(r'(\d+(?:\.\d+)?)\s*([smhd])', spec.lower())
+    return float(sum(float(value) * UNITS[unit] for value, unit in parts))
+
+
+class ScheduledJob:
+    """A function run every `every`, or daily at `at` ('HH:MM'), plus up to `jitter` of random delay
+
+    Plain functions run on a worker thread; coroutine functions run on the loop.
+    """
+
+    def __init__(self, name, func, every=None, at=None, jitter=0, lock_timeout=None, run_on_start=True):
+        if (every is None) == (at is None):
+            raise ValueError(f"Job {name} needs exactly one of every= or at=")
+        self.name = name
+        self.func = func
+        self.every = parse_interval(every) if every is not None else None
+        self.at = datetime.strptime(at, '%H:%M').time() if at is not None else None
+        self.jitter = parse_interval(jitter)
+        # A lock outlives a crashed run by this long before another process may take over
+        self.lock_timeout = parse_interval(lock_timeout) if lock_timeout else max(self.every or 0, 3600)
+        self.run_on_start = run_on_start
+        self.delay = random.uniform(0, self.jitter)
+        self.added = datetime.now()
+
+    def describe(self):
+        when = f"every {timedelta(seconds=self.every)}" if self.every else f"daily at {self.at:%H:%M}"
+        return when + (f" (+ up to {timedelta(seconds=self.jitter)} jitter)" if self.jitter else '')
+
+    def next_run(self, last_started, now=None):
+        """When the job is next due, given when it last started (None if never)"""
+        now = now or datetime.now()
+        jitter = timedelta(seconds=self.delay)
+        if self.every:
+            if last_started is None:
+                return self.added + (timedelta() if self.run_on_start else timedelta(seconds=self.every)) + jitter
+            return last_started + timedelta(seconds=self.every) + jitter
+
+        after = last_started or now
+        due = datetime.combine(after.date(), self.at)
+        if due <= after:
+            due += timedelta(days=1)
+        return due + jitter
+
+
+class Scheduler:
+    def __init__(self, db=None, owner=None, retry_interval=60):
+        self.db = db or Database()
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.retry_interval = retry_interval
+        self.jobs = {}
+        self._stopping = None
+        self._loop = None
+
+    def add(self, name, func, every=None, at=None, jitter=0, lock_timeout=None, run_on_start=True):
+        self.jobs[name] = ScheduledJob(name, func, every, at, jitter, lock_timeout, run_on_start)
+        return self.jobs[name]
+
+    def last_started(self, name):
+        state = self.db.get_scheduled_jobs().get(name)
+        if not state or not state['last_started']:
+            return None
+        return datetime.fromisoformat(state['last_started'])
+
+    def due_times(self):
+        """{name: next run} for every job"""
+        return {name: job.next_run(self.last_started(name)) for name, job in self.jobs.items()}
+
+    async def run_job(self, job):
+        """Run the job once if nobody else is running it; returns 'ok', 'error' or 'locked'"""
+        if not self.db.lock_scheduled_job(job.name, self.owner, job.lock_timeout):
+            return 'locked'
+
+        print(f"⏰ Running {job.name} ({datetime.now():%Y-%m-%d %H:%M})")
+        if asyncio.iscoroutinefunction(job.func):
+            task = asyncio.ensure_future(job.func())
+        else:
+            task = asyncio.ensure_future(asyncio.to_thread(job.func))
+
+        # Keep the lock while a long run is still going
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=job.lock_timeout / 2)
+            if done:
+                break
+            self.db.refresh_scheduled_job_lock(job.name, self.owner, job.lock_timeout)
+
+        error = None
+        try:
+            task.result()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"❌ {job.name} failed: {error}")
+        self.db.finish_scheduled_job(job.name, self.owner, 'error' if error else 'ok', error)
+        job.delay = random.uniform(0, job.jitter)
+        return 'error' if error else 'ok'
+
+    async def _run_forever(self, job):
+        while not self._stopping.is_set():
+            wait = (job.next_run(self.last_started(job.name)) - datetime.now()).total_seconds()
+            if wait <= 0 and await self.run_job(job) == 'locked':
+                # Still running elsewhere; look again later
+                wait = self.retry_interval
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def serve(self):
+        """Run every job on its schedule until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        await asyncio.gather(*(self._run_forever(job) for job in self.jobs.values()))
+
+    def stop(self):
+        """Stop after the runs in progress finish; safe to call from any thread"""
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    def run(self):
+        for name, when in self.due_times().items():
+            print(f"   {name}: {self.jobs[name].describe()}, next run {when:%Y-%m-%d %H:%M}")
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("\n👋 Scheduler stopped")
+
+
+if __name__ == "__main__":
+    state = Database().get_scheduled_jobs()
+    print("📅 Scheduler jobs:")
+    for name, job in sorted(state.items()):
+        print(f"   {name:<10} last started {job['last_started']}, {job['last_status'] or 'running'}"
+              f" ({job['run_count']} runs)" + (f" - {job['last_error']}" if job['last_error'] else ''))
@@ -0,0 +1,202 @@
+"""
+Explicit wait strategies for Selenium flows
+Element/URL/network-idle conditions with timeouts adapted from measured step timings
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Returns [readyState, number of resource entries loaded so far]
+NETWORK_STATE_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+class StepTimings:
+    """Rolling per-step latency samples, persisted between runs
+
+    A timed-out wait is not a latency sample; it is counted in `timeouts` and
+    doubles the step's backoff, so a slow site raises the timeout instead of
+    failing forever.
+    """
+
+    def __init__(self, path='data/wait_timings.json', max_samples=50):
+        self.path = path
+        self.max_samples = max_samples
+        self.samples = {}
+        self.timeouts = {}
+        self.backoff = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                for step, values in data.get('samples', {}).items():
+                    self.samples[step] = deque(values, maxlen=self.max_samples)
+                self.timeouts = data.get('timeouts', {})
+                self.backoff = data.get('backoff', {})
+            except Exception as e:
+                print(f"⚠️ Could not load wait timings: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'samples': {step: list(values) for step, values in self.samples.items()},
+                'timeouts': dict(self.timeouts),
+                'backoff': dict(self.backoff)
+            }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def record(self, step, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts[step] = self.timeouts.get(step, 0) + 1
+                self.backoff[step] = round(max(seconds, self.backoff.get(step, 0)) * 2, 3)
+            else:
+                self.samples.setdefault(step, deque(maxlen=self.max_samples)).append(round(seconds, 3))
+                self.backoff.pop(step, None)
+
+    def percentile(self, step, pct):
+        with self._lock:
+            values = sorted(self.samples.get(step, []))
+        if not values:
+            return None
+        index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+        return values[index]
+
+    def summary(self):
+        """{step: {'count', 'median', 'p95', 'timeouts'}}"""
+        steps = set(self.samples) | set(self.timeouts)
+        return {
+            step: {
+                'count': len(self.samples.get(step, [])),
+                'median': self.percentile(step, 50),
+                'p95': self.percentile(step, 95),
+                'timeouts': self.timeouts.get(step, 0)
+            }
+            for step in sorted(steps)
+        }
+
+
+_shared_timings = None
+
+
+def get_step_timings():
+    """Timings shared by every flow in this process"""
+    global _shared_timings
+    if _shared_timings is None:
+        _shared_timings = StepTimings()
+    return _shared_timings
+
+
+class WaitStrategy:
+    def __init__(self, driver, timings=None, min_timeout=2.0, max_timeout=30.0,
+                 headroom=3.0, poll_frequency=0.1):
+        self.driver = driver
+        self.timings = timings or get_step_timings()
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom
+        self.poll_frequency = poll_frequency
+
+    def timeout_for(self, step):
+        """Adaptive timeout: a multiple of the step's p95, or the backoff after a timeout, clamped to [min, max]"""
+        p95 = self.timings.percentile(step, 95)
+        if p95 is None:
+            return self.max_timeout
+        timeout = max(p95 * self.headroom, self.timings.backoff.get(step, 0))
+        return max(self.min_timeout, min(self.max_timeout, timeout))
+
+    def until(self, step, condition, timeout=None, required=True):
+        """Wait for condition(driver) to be truthy and record how long it took
+
+        Returns the condition's value, or None on timeout when not required.
+        """
+        timeout = timeout or self.timeout_for(step)
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            self.timings.record(step, time.perf_counter() - start, timed_out=True)
+            if required:
+                raise
+            return None
+        self.timings.record(step, time.perf_counter() - start)
+        return result
+
+    def element(self, step, by, selector, **kwargs):
+        return self.until(step, EC.presence_of_element_located((by, selector)), **kwargs)
+
+    def clickable(self, step, by, selector, **kwargs):
+        return self.until(step, EC.element_to_be_clickable((by, selector)), **kwargs)
+
+    def gone(self, step, by, selector, **kwargs):
+        return self.until(step, EC.invisibility_of_element_located((by, selector)), **kwargs)
+
+    def any_element(self, step, locators, **kwargs):
+        """Wait until any (by, selector) matches; returns (index, elements)"""
+        def condition(driver):
+            for i, (by, selector) in enumerate(locators):
+                elements = driver.find_elements(by, selector)
+                if elements:
+                    return i, elements
+            return False
+        return self.until(step, condition, **kwargs)
+
+    def first_clickable(self, step, locators, **kwargs):
+        """Wait until any locator is clickable; returns (index, element)"""
+        def condition(driver):
+            for i, locator in enumerate(locators):
+                element = EC.element_to_be_clickable(locator)(driver)
+                if element:
+                    return i, element
+            return False
+        return self.until(step, condition, **kwargs)
+
+    def url_contains(self, step, fragments, **kwargs):
+        """Wait until the current URL contains any of the fragments"""
+        if isinstance(fragments, str):
+            fragments = [fragments]
+        return self.until(step, lambda d: any(f in d.current_url for f in fragments), **kwargs)
+
+    def url_changes(self, step, old_url, **kwargs):
+        return self.until(step, EC.url_changes(old_url), **kwargs)
+
+    def network_idle(self, step, quiet_period=0.5, **kwargs):
+        """Wait for readyState complete and no new resource loads for quiet_period"""
+        state = {'count': -1, 'since': time.perf_counter()}
+
+        def condition(driver):
+            ready, count = driver.execute_script(NETWORK_STATE_JS)
+            now = time.perf_counter()
+            if ready != 'complete' or count != state['count']:
+                state['count'] = count
+                state['since'] = now
+                return False
+            return now - state['since'] >= quiet_period
+        return self.until(step, condition, **kwargs)
+
+    def report(self):
+        """Print and persist per-step timings"""
+        summary = self.timings.summary()
+        if summary:
+            print("⏱️ Page-ready timings:")
+            for step, stats in summary.items():
+                if stats['count']:
+                    print(f"   {step}: median {stats['median']:.2f}s, p95 {stats['p95']:.2f}s "
+                          f"({stats['count']} samples, {stats['timeouts']} timeouts)")
+                else:
+                    print(f"   {step}: {stats['timeouts']} timeouts")
+        self.timings.save()
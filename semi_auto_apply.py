@@ -4,19 +4,21 @@ Semi-automated job application system
 Searches for jobs, prepares applications, but lets you handle CAPTCHAs
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 import time
 from datetime import datetime
 import json
-from resume_tailor import ResumeTailor
-from database import Database
+from browser_pool import BrowserPool
+from selenium_waits import WaitStrategy
+from indeed_selenium import RESULT_LOCATORS, DETAIL_LOCATORS, build_search_url
+from crawl_frontier import CrawlFrontier, IndeedCrawler
+from job_details import job_description_text
+from app_context import get_app_context
 
 class SemiAutoApply:
-    def __init__(self):
-        self.tailor = ResumeTailor()
-        self.db = Database()
+    def __init__(self, context=None):
+        self.context = context or get_app_context()
+        self.tailor = self.context.tailor
+        self.db = self.context.db
         self.jobs_found = []
         
     def search_indeed_semi_auto(self):
@@ -25,17 +27,14 @@ class SemiAutoApply:
         print("=" * 50)
         print("ℹ️ I'll help you search, but you handle CAPTCHAs!")
         
-        options = Options()
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
         # Keep browser visible so user can solve CAPTCHA
+        pool = BrowserPool(size=1, headless=False, warm_url="https://gr.indeed.com")
+        pooled = pool.acquire()
+        driver = pooled.driver
         
-        driver = webdriver.Chrome(options=options)
+        waits = WaitStrategy(driver)
         
         try:
-            # Go to Indeed
-            driver.get("https://gr.indeed.com")
-            
             print("\n📝 INSTRUCTIONS:")
             print("1. I'll fill in the search fields")
             print("2. You solve any CAPTCHA if it appears")
@@ -48,69 +47,36 @@ class SemiAutoApply:
                 ("Software Engineer", "Thessaloniki")
             ]
             
-            for job_title, location in search_terms:
-                print(f"\n🔍 Searching: {job_title} in {location}")
-                
-                # Navigate to search page
-                driver.get(f"https://gr.indeed.com/jobs?q={job_title}&l={location}")
-                
-                # Wait for user to handle CAPTCHA if needed
-                input("   ⏸️ Solve CAPTCHA if shown, then press Enter...")
-                
-                # Now extract jobs from the page
-                jobs = self.extract_jobs_from_page(driver)
-                self.jobs_found.extend(jobs)
-                
-                if len(self.jobs_found) >= 10:
-                    break
+            def fetch(url):
+                driver.get(url)
+                # Only ask for help when nothing renders (usually a CAPTCHA)
+                if not waits.any_element('indeed_page', RESULT_LOCATORS + DETAIL_LOCATORS, required=False):
+                    input("   ⏸️ Solve CAPTCHA if shown, then press Enter...")
+                return driver.page_source
+            
+            # Every results page plus each job's own page, one visible browser
+            crawler = IndeedCrawler(
+                fetch,
+                frontier=CrawlFrontier(state_path='data/crawl_state_semi_auto.json', max_depth=2),
+                workers=1
+            )
+            start_urls = [
+                (build_search_url("https://gr.indeed.com", job_title, location), location)
+                for job_title, location in search_terms
+            ]
+            for job in crawler.crawl(start_urls):
+                self.jobs_found.append(job)
+                print(f"   ✓ Found: {job['title']} at {job['company']}")
             
             print(f"\n✅ Total jobs found: {len(self.jobs_found)}")
             
         finally:
-            driver.quit()
+            waits.report()
+            pool.release(pooled)
+            pool.close()
         
         return self.jobs_found
     
-    def extract_jobs_from_page(self, driver):
-        """Extract job details from current Indeed page"""
-        jobs = []
-        
-        try:
-            # Get all job cards
-            job_elements = driver.find_elements(By.CSS_SELECTOR, '.job_seen_beacon')
-            
-            for element in job_elements[:10]:
-                try:
-                    # Extract with Selenium (more reliable than BeautifulSoup for dynamic content)
-                    title = element.find_element(By.CSS_SELECTOR, 'h2.jobTitle span').text
-                    company = element.find_element(By.CSS_SELECTOR, '.companyName').text
-                    location = element.find_element(By.CSS_SELECTOR, '.companyLocation').text
-                    
-                    # Try to get salary
-                    try:
-                        salary = element.find_element(By.CSS_SELECTOR, '.salary-snippet').text
-                    except:
-                        salary = None
-                    
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'salary': salary,
-                        'source': 'Indeed'
-                    }
-                    
-                    jobs.append(job)
-                    print(f"   ✓ Found: {title} at {company}")
-                    
-                except Exception as e:
-                    continue
-                    
-        except Exception as e:
-            print(f"   ❌ Error extracting jobs: {e}")
-        
-        return jobs
-    
     def prepare_applications(self):
         """Generate tailored resumes for found jobs"""
         if not self.jobs_found:
@@ -121,20 +87,22 @@ class SemiAutoApply:
         print("=" * 50)
         
         applications = []
+        jobs = self.context.details.enrich(self.jobs_found[:5])  # Prepare first 5
         
-        for i, job in enumerate(self.jobs_found[:5], 1):  # Prepare first 5
+        for i, job in enumerate(jobs, 1):
             print(f"\n{i}. Preparing for: {job['title']} at {job['company']}")
+            job_description = job_description_text(job)
             
             # Generate tailored resume
             tailored_resume = self.tailor.tailor_resume(
-                job_description=job.get('title', ''),
+                job_description=job_description,
                 company_name=job['company'],
                 position=job['title']
             )
             
             # Generate cover letter
             cover_letter = self.tailor.generate_cover_letter(
-                job_description=job.get('title', ''),
+                job_description=job_description,
                 company_name=job['company'],
                 position=job['title']
             )
@@ -145,7 +113,8 @@ class SemiAutoApply:
                 position=job['title'],
                 location=job.get('location'),
                 salary_range=job.get('salary'),
-                notes="Found via semi-automated search"
+                notes="Found via semi-automated search",
+                source='semi_auto'
             )
             
             applications.append({
@@ -170,6 +139,7 @@ class SemiAutoApply:
         return applications
 
 def main():
+    context = get_app_context().open()
     print("""
     ╔════════════════════════════════════════════╗
     ║   🤖 SEMI-AUTOMATED JOB APPLICATION        ║
@@ -177,7 +147,7 @@ def main():
     ╚════════════════════════════════════════════╝
     """)
     
-    applier = SemiAutoApply()
+    applier = SemiAutoApply(context)
     
     # Step 1: Search for jobs
     jobs = applier.search_indeed_semi_auto()
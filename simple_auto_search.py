@@ -4,9 +4,11 @@ Simple job search without email sending
 """
 
 from auto_applier import JobAutoApplier
+from app_context import get_app_context
 import json
 
 def main():
+    context = get_app_context().open()
     # Load config
     with open('auto_apply_config.json', 'r') as f:
         config = json.load(f)
@@ -14,7 +16,8 @@ def main():
     # Create applier (without email for now)
     applier = JobAutoApplier(
         email=config['email'],
-        email_password="not_needed_for_search_only"
+        email_password="not_needed_for_search_only",
+        context=context
     )
     
     # Set criteria
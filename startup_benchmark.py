@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and reports the median cold import time plus the slowest dependencies
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ENTRY_POINTS = ['main', 'simple_auto_search', 'run_auto_apply', 'app']
+
+
+def import_times(module, cwd=None):
+    """{package: cumulative microseconds} for one cold import of module"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)), PYTHONDONTWRITEBYTECODE='1')
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    # Each import is listed after its own nested imports; keep only module's subtree,
+    # not what the interpreter loaded at startup (site, encodings, ...)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+        if not name[1:].startswith(' ') and name.strip() != module:
+            times = {}
+    return times
+
+
+def benchmark(modules=ENTRY_POINTS, runs=5, top=5):
+    # Run from an empty directory so nothing on disk (data/, .env) is reused
+    with tempfile.TemporaryDirectory() as cwd:
+        for module in modules:
+            samples = []
+            for _ in range(runs):
+                try:
+                    samples.append(import_times(module, cwd))
+                except RuntimeError as e:
+                    print(f"❌ {e}")
+                    break
+            if not samples:
+                continue
+
+            total = statistics.median(s[module] for s in samples) / 1000
+            print(f"📊 import {module}: {total:.0f} ms (median of {len(samples)})")
+            heavy = sorted(
+                ((name, statistics.median(s.get(name, 0) for s in samples) / 1000)
+                 for name in samples[0] if '.' not in name and name != module),
+                key=lambda item: item[1], reverse=True
+            )
+            for name, ms in heavy[:top]:
+                print(f"   {name:<24} {ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1:] or ENTRY_POINTS)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Analytics tests: status history, funnel conversion, time to response and caching
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from analytics import Analytics
+
+
+def answered_after(db, app_id, days):
+    """Move an application's status changes `days` after it was logged"""
+    conn = sqlite3.connect(db.db_path)
+    conn.execute('''
+        UPDATE status_events SET created_date = ? WHERE application_id = ? AND status != 'pending'
+    ''', (datetime.now() + timedelta(days=days), app_id))
+    conn.commit()
+    conn.close()
+
+
+def test_update_status_appends_history(db):
+    app_id = db.add_application('Netdata', 'Backend Engineer')
+    db.update_status(app_id, 'interview')
+    db.update_status(app_id, 'interview')
+    db.update_status(app_id, 'rejected')
+
+    events = db.get_status_events(app_id)
+    assert [(e['previous_status'], e['status']) for e in events] == [
+        (None, 'pending'), ('pending', 'interview'), ('interview', 'rejected')]
+
+
+def test_funnel_time_to_response_and_sources(db):
+    ids = [db.add_application(f'Company {i}', 'Python Developer', source='email' if i % 2 == 0 else 'web')
+           for i in range(6)]
+    db.update_status(ids[0], 'interview')
+    db.update_status(ids[0], 'rejected')
+    db.update_status(ids[1], 'rejected')
+    db.update_status(ids[2], 'offer')
+    db.update_status(ids[3], 'applied')
+    for app_id, days in zip(ids, (2, 4, 10)):
+        answered_after(db, app_id, days)
+
+    report = Analytics(db).report()
+    funnel = {stage['stage']: (stage['count'], stage['conversion']) for stage in report['funnel']}
+    # The rejected interview still reached the interview stage
+    assert funnel == {'applied': (6, None), 'responded': (3, 50.0), 'interview': (2, 66.7),
+                      'offer': (1, 50.0), 'accepted': (0, 0.0)}
+    assert report['overall']['median_days_to_response'] == 4.0
+
+    by_source = {row['name']: row for row in report['by_source']}
+    assert (by_source['email']['responses'], by_source['email']['median_days_to_response']) == (2, 6.0)
+    assert (by_source['web']['response_rate'], by_source['web']['interviews']) == (33.3, 0)
+    assert report['by_resume'][0]['name'] == 'Base resume'
+
+
+def test_report_is_cached_until_a_new_event(db):
+    analytics = Analytics(db)
+    app_id = db.add_application('Netdata', 'Backend Engineer')
+    report = analytics.report()
+    assert analytics.report() is report
+
+    db.update_status(app_id, 'interview')
+    updated = analytics.report()
+    assert updated is not report
+    assert updated['overall']['interviews'] == 1
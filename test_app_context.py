@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Application context tests: shared lazy services and their lifecycle
+"""
+
+from app_context import AppContext
+from database import Database
+
+
+class FakeService:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_services_are_shared_and_lazy(tmp_path):
+    context = AppContext(db_path=str(tmp_path / 'applications.db'))
+    assert context._services == {}
+
+    assert context.db is context.db
+    assert isinstance(context.db, Database)
+    assert context.watermarks.db is context.db
+    assert list(context._services) == ['db', 'watermarks']
+
+
+def test_mailer_is_reused_per_account(tmp_path):
+    context = AppContext(db_path=str(tmp_path / 'applications.db'))
+    mailer = context.mailer('me@example.com', 'secret')
+
+    assert context.mailer('me@example.com', 'secret') is mailer
+    assert context.mailer('other@example.com', 'secret') is not mailer
+    assert mailer.db is context.db
+    context.close()
+
+
+def test_close_releases_services_and_allows_reuse(tmp_path):
+    context = AppContext(db_path=str(tmp_path / 'applications.db'))
+    service = context.provide('tailor', FakeService())
+    assert context.tailor is service
+
+    with context:
+        first_db = context.db
+    assert service.closed
+    assert context._services == {}
+
+    # Rebuilt on next use
+    assert context.db is not first_db
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Apply queue tests: dedupe, leases, retries and quota deferrals
+"""
+
+from datetime import date, datetime, timedelta
+
+from apply_queue import ApplyQueue, ApplyWorkerPool
+from rate_limiter import QuotaExceeded, RateLimiter
+
+
+def make_pool(queue, handler, quotas=None):
+    limiter = RateLimiter(limits={}, quotas=quotas or {}, db=queue.db)
+    return ApplyWorkerPool(queue, handlers={'email': handler}, limiter=limiter)
+
+
+def test_enqueue_dedupes_by_job(db):
+    queue = ApplyQueue(db=db)
+    task_id = queue.enqueue('Netdata_Backend Engineer', 'email', {'job': {'title': 'Backend Engineer'}})
+    assert task_id
+    assert queue.enqueue('Netdata_Backend Engineer', 'email', {'job': {'title': 'Backend Engineer'}}) is None
+    assert queue.counts() == {('email', 'queued'): 1}
+
+
+def test_expired_lease_is_claimed_again(db):
+    queue = ApplyQueue(db=db, lease_seconds=300)
+    queue.enqueue('a', 'email', {'n': 1})
+
+    task, = queue.lease('worker-1', ['email'])
+    assert task['payload'] == {'n': 1}
+    assert task['attempts'] == 1
+    # Held by worker-1 until the lease runs out
+    assert queue.lease('worker-2', ['email']) == []
+
+    # worker-1 died; once its lease expires another worker takes over
+    expired = ApplyQueue(db=db, lease_seconds=-1)
+    expired.enqueue('b', 'email', {'n': 2})
+    stale, = expired.lease('worker-3', ['email'])
+    assert stale['job_key'] == 'b'
+    reclaimed, = queue.lease('worker-2', ['email'])
+    assert reclaimed['id'] == stale['id']
+    assert reclaimed['lease_owner'] == 'worker-2'
+    assert reclaimed['attempts'] == 2
+
+
+def test_lease_only_takes_handled_channels(db):
+    queue = ApplyQueue(db=db)
+    queue.enqueue('a', 'manual', {})
+    assert queue.lease('worker', ['email']) == []
+    assert len(queue.pending('manual')) == 1
+
+
+def test_failed_send_is_retried_with_backoff(db):
+    queue = ApplyQueue(db=db, max_attempts=2, retry_delay=60)
+    queue.enqueue('a', 'email', {})
+
+    def broken(payload):
+        raise ConnectionError('smtp down')
+
+    pool = make_pool(queue, broken)
+    assert pool.run_once() == 'retry'
+    task, = db.get_application_tasks(channel='email')
+    assert task['status'] == 'queued'
+    assert task['last_error'] == 'ConnectionError: smtp down'
+    assert task['next_attempt'] > str(datetime.now() + timedelta(seconds=50))
+    # Not due again until the backoff has passed
+    assert pool.run_once() is None
+
+    db.finish_application_task(task['id'], 'queued', next_attempt=datetime.now())
+    assert pool.run_once() == 'failed'
+    assert queue.counts() == {('email', 'failed'): 1}
+
+
+def test_quota_exceeded_defers_to_tomorrow_without_an_attempt(db):
+    queue = ApplyQueue(db=db)
+    queue.enqueue('a', 'email', {})
+
+    def over_quota(payload):
+        raise QuotaExceeded('Daily applications quota of 10 reached')
+
+    assert make_pool(queue, over_quota).run_once() == 'deferred'
+    task, = db.get_application_tasks(channel='email')
+    assert task['status'] == 'queued'
+    assert task['attempts'] == 0
+    assert task['next_attempt'] == str(datetime.combine(date.today() + timedelta(days=1), datetime.min.time()))
+
+
+def test_used_up_quota_defers_without_calling_the_handler(db):
+    queue = ApplyQueue(db=db)
+    for key in 'abc':
+        queue.enqueue(key, 'email', {})
+    sent = []
+
+    def send(payload):
+        sent.append(payload)
+        return True
+
+    pool = make_pool(queue, send, quotas={'applications': 1})
+    pool.limiter.take_daily('applications')
+    assert pool.drain() == ['deferred', 'deferred', 'deferred']
+    assert sent == []
+
+
+def test_queued_today_counts_every_status(db):
+    queue = ApplyQueue(db=db)
+    assert queue.queued_today() == 0
+    for key in 'abc':
+        queue.enqueue(key, 'email', {})
+    queue.enqueue('a', 'email', {})
+
+    make_pool(queue, lambda payload: True).run_once()
+    assert queue.queued_today() == 3
+    assert queue.db.count_application_tasks(datetime.now() + timedelta(seconds=1)) == 0
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Blobstore tests: content addressing, fan-out, compression and attachment snapshots
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from blobstore import BlobStore
+
+
+def test_identical_content_is_stored_once(db, tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'), db, compression='zlib')
+    digest = store.put('Dear Netdata team,\n' * 50)
+
+    assert digest == hashlib.sha256(('Dear Netdata team,\n' * 50).encode()).hexdigest()
+    assert store.put(('Dear Netdata team,\n' * 50).encode()) == digest
+    assert store.path(digest) == str(tmp_path / 'blobs' / digest[:2] / digest[2:4] / digest)
+    assert os.path.getsize(store.path(digest)) < 100
+    assert store.get(digest) == ('Dear Netdata team,\n' * 50).encode()
+    assert db.get_blob_stats() == {'blobs': 1, 'size': 950, 'stored_size': os.path.getsize(store.path(digest))}
+
+    with pytest.raises(KeyError):
+        store.get('0' * 64)
+
+
+def test_zstd_and_zlib_blobs_are_read_side_by_side(db, tmp_path):
+    pytest.importorskip('zstandard')
+    zlib_store = BlobStore(str(tmp_path / 'blobs'), db, compression='zlib')
+    zstd_store = BlobStore(str(tmp_path / 'blobs'), db, compression='zstd')
+    old = zlib_store.put(b'old resume')
+    new = zstd_store.put(b'new resume')
+
+    assert zstd_store.get(old) == b'old resume'
+    assert zlib_store.get(new) == b'new resume'
+
+
+def test_attachments_are_snapshotted(db, tmp_path):
+    store = BlobStore(str(tmp_path / 'blobs'), db)
+    resume = tmp_path / 'resume.pdf'
+    resume.write_bytes(b'%PDF-1.4 first version')
+
+    from_file = store.attachment(str(resume))
+    generated = store.attachment({'filename': 'Netdata resume.txt', 'data': 'Tailored resume'})
+    resume.write_bytes(b'%PDF-1.4 second version')
+
+    assert from_file['filename'] == 'resume.pdf'
+    assert store.get(from_file['blob']) == b'%PDF-1.4 first version'
+    assert store.get(generated['blob']) == b'Tailored resume'
+    assert store.attachment(generated) == generated
+
+
+def test_unchanged_files_are_not_reread(db, tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / 'blobs'), db, compression='zlib')
+    resume = tmp_path / 'resume.pdf'
+    resume.write_bytes(b'%PDF-1.4 first version')
+    first = store.attachment(str(resume))
+
+    puts = []
+    monkeypatch.setattr(store, 'put', lambda data: puts.append(data))
+    assert store.attachment(str(resume)) == first
+    assert puts == []
+
+    resume.write_bytes(b'%PDF-1.4 second version, longer')
+    store.attachment(str(resume))
+    assert puts == [b'%PDF-1.4 second version, longer']
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Document store tests: delta round trips, deduplication and the size report
+"""
+
+import pytest
+
+from document_store import DocumentStore, apply_delta, make_delta, sample_documents
+
+
+@pytest.fixture
+def store(db):
+    return DocumentStore(db)
+
+
+@pytest.mark.parametrize('text', [
+    'JOHN DOE\nSenior Python Developer\n\nSKILLS\nPython, SQL\n',
+    'JOHN DOE\nPython Developer\nNew line\n\nSKILLS\nPython, SQL, Docker',
+    'Completely different\n',
+    '',
+])
+def test_delta_round_trip(text):
+    base = 'JOHN DOE\nPython Developer\n\nSKILLS\nPython, SQL\n'.splitlines(keepends=True)
+    assert apply_delta(base, make_delta(base, text.splitlines(keepends=True))) == text
+
+
+def test_tailored_resumes_are_stored_as_small_deltas(store):
+    base, resume, cover = next(sample_documents(1))
+    base_id = store.put_base(base)
+    resume_id = store.put(resume, 'resume', base_id)
+    cover_id = store.put(cover, 'cover_letter')
+
+    assert store.get(resume_id) == resume
+    assert store.get(cover_id) == cover
+    assert store.db.get_document(resume_id)['encoding'] == 'delta'
+
+    # A delta's base is always a full document
+    again = store.put(resume + 'References available on request.\n', 'resume', resume_id)
+    assert store.db.get_document(again)['base_id'] == base_id
+
+    report = store.size_report()
+    resume_row = next(row for row in report['by_kind'] if row['kind'] == 'resume')
+    assert resume_row['stored_bytes'] < resume_row['text_bytes'] / 3
+
+
+def test_identical_documents_are_stored_once(store):
+    base_id = store.put_base('JOHN DOE\n')
+    assert store.put_base('JOHN DOE\n') == base_id
+    assert store.put('Dear team,\n', 'cover_letter') == store.put('Dear team,\n', 'cover_letter')
+    assert store.size_report()['documents'] == 2
+    assert store.get(12345) is None
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Embedding index tests: adding, replacing and searching vectors
+"""
+
+import numpy as np
+
+from embedding_index import EmbeddingIndex, HashingEmbedder
+
+
+def test_repeated_ids_in_a_batch_are_added_once(tmp_path):
+    index = EmbeddingIndex(str(tmp_path / 'jobs'), dim=64, initial_capacity=2)
+    vectors = HashingEmbedder(64).embed(['python backend developer', 'react frontend', 'python backend engineer'])
+
+    index.add(['job-1', 'job-2', 'job-1'], vectors)
+
+    assert index.ids == ['job-1', 'job-2']
+    assert np.allclose(index.vectors[0], vectors[0])
+    assert [item_id for item_id, _ in index.search(vectors[0], k=10)] == ['job-1', 'job-2']
+
+    reopened = EmbeddingIndex(str(tmp_path / 'jobs'), dim=64)
+    assert len(reopened) == 2
+
+
+def test_existing_ids_are_replaced_in_place(tmp_path):
+    index = EmbeddingIndex(str(tmp_path / 'jobs'), dim=64)
+    embedder = HashingEmbedder(64)
+    index.add(['job-1'], embedder.embed(['python developer']))
+    index.add(['job-1', 'job-2'], embedder.embed(['data engineer', 'python developer']))
+
+    assert len(index) == 2
+    assert index.search(embedder.embed(['data engineer'])[0], k=1)[0][0] == 'job-1'
+
+
+def test_switching_model_rebuilds_the_index(tmp_path):
+    path = str(tmp_path / 'jobs')
+    vectors = HashingEmbedder(64).embed(['python developer'])
+    EmbeddingIndex(path, dim=64, model='hashing').add(['job-1'], vectors)
+
+    assert len(EmbeddingIndex(path, dim=64, model='hashing')) == 1
+    # Same dimension, different model: the old vectors can't be compared with new queries
+    rebuilt = EmbeddingIndex(path, dim=64, model='all-MiniLM-L6-v2')
+    assert len(rebuilt) == 0
+    assert 'job-1' not in rebuilt
+    assert len(EmbeddingIndex(path, dim=64, model='all-MiniLM-L6-v2')) == 0
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Export tests: chunked CSV/JSONL/Parquet output and the streaming download route
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from database import Database
+from exporter import Exporter, ExportError
+
+
+@pytest.fixture
+def db(db):
+    for i in range(12):
+        db.add_application(f'Company {i}', 'Python Developer', job_url=f'https://example.com/{i}',
+                           notes='Line one\nline "two", three' if i == 3 else None)
+    return db
+
+
+def test_csv_and_jsonl_are_written_in_chunks(db):
+    exporter = Exporter(db, chunksize=5)
+
+    pieces = list(exporter.iter_export('applications', 'csv'))
+    assert len(pieces) == 3
+    rows = list(csv.DictReader(io.StringIO(''.join(pieces))))
+    assert [row['company'] for row in rows] == [f'Company {i}' for i in range(12)]
+    assert rows[3]['notes'] == 'Line one\nline "two", three'
+
+    lines = ''.join(exporter.iter_export('applications', 'jsonl')).splitlines()
+    assert len(lines) == 12
+    assert json.loads(lines[0])['job_url'] == 'https://example.com/0'
+
+
+def test_empty_dataset_and_bad_arguments(db, tmp_path):
+    exporter = Exporter(db)
+    path = exporter.export('jobs', 'csv', str(tmp_path / 'jobs.csv'))
+    assert open(path, encoding='utf-8').read().startswith('id,job_key,title,company')
+
+    with pytest.raises(ExportError):
+        exporter.iter_export('resumes', 'csv')
+    with pytest.raises(ExportError):
+        exporter.iter_export('applications', 'xlsx')
+
+
+def test_parquet_has_one_row_group_per_chunk(db, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = Exporter(db, chunksize=5).export('applications', 'parquet', str(tmp_path / 'applications.parquet'))
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_rows == 12
+    assert parquet.num_row_groups == 3
+    # notes is empty in the first chunk but keeps a string type for later ones
+    assert parquet.read().column('notes').to_pylist()[3] == 'Line one\nline "two", three'
+
+
+def test_parquet_column_empty_in_the_first_chunk_keeps_its_type(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    db = Database(db_path=str(tmp_path / 'applications.db'))
+    db.add_application('Old Company', 'Python Developer')
+    db.add_application('Older Company', 'Python Developer')
+    db.add_application('Netdata', 'Backend Engineer', resume_id=5)
+
+    path = Exporter(db, chunksize=2).export('applications', 'parquet', str(tmp_path / 'applications.parquet'))
+
+    table = pq.read_table(path)
+    assert str(table.schema.field('resume_id').type) == 'int64'
+    assert table.column('resume_id').to_pylist() == [None, None, 5]
+    assert table.column('company').to_pylist()[2] == 'Netdata'
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Regression and throughput tests for the extractor registry, run against saved fixtures
+"""
+
+import os
+import time
+
+from extractors import ExtractorRegistry, SITE_SPECS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_indeed_current_markup():
+    registry = ExtractorRegistry(SITE_SPECS)
+    cards = registry.extract('indeed', load_fixture('indeed_results.html'),
+                             base_url='https://gr.indeed.com/jobs?q=Developer')
+
+    assert [c['title'] for c in cards] == ['Junior Java Web Developer', 'Fullstack Developer', 'Python Backend Engineer']
+    assert cards[0]['company'] == 'EUROPEAN DYNAMICS'
+    assert cards[0]['location'] == 'Thessaloniki'
+    assert cards[0]['salary'] == '€1,200 - €1,600 a month'
+    assert cards[0]['job_key'] == 'a1b2c3d4e5f60001'
+    assert cards[0]['url'] == 'https://gr.indeed.com/rc/clk?jk=a1b2c3d4e5f60001'
+    assert len(cards[0]['description']) <= 300
+
+    stats = registry.get('indeed').stats()
+    assert stats['cards'] == {'div.job_seen_beacon': 1}
+    assert stats['fields']['title'] == {'h2.jobTitle span[title]': 3}
+
+
+def test_indeed_legacy_markup_uses_fallbacks():
+    registry = ExtractorRegistry(SITE_SPECS)
+    cards = registry.extract('indeed', load_fixture('indeed_results_legacy.html'), base_url='https://www.indeed.com/')
+
+    assert [(c['title'], c['company']) for c in cards] == [
+        ('Python Backend Engineer', 'Workable'),
+        ('Data Engineer', 'Netdata'),
+    ]
+    assert cards[0]['location'] == 'Athens'
+    assert cards[1]['location'] is None
+    assert cards[0]['url'] == 'https://www.indeed.com/viewjob?jk=7f3e9a0b1c2d0001'
+
+    indeed = registry.get('indeed')
+    stats = indeed.stats()
+    assert stats['cards'] == {'div.jobsearch-SerpJobCard': 1}
+    assert stats['fields']['title'] == {'a[data-testid="job-title"]': 2}
+    assert stats['fields']['company'] == {'div.companyName': 2}
+    assert 'h2.jobTitle span[title]' in indeed.unused_selectors()['title']
+
+
+def test_ycombinator():
+    registry = ExtractorRegistry(SITE_SPECS)
+    cards = registry.extract('ycombinator', load_fixture('ycombinator_jobs.html'),
+                             base_url='https://www.ycombinator.com/jobs/role/software-engineer')
+
+    assert [c['title'] for c in cards] == ['Backend Engineer', 'Full Stack Engineer']
+    assert cards[1]['company'] == 'Orbit'
+    assert cards[0]['url'] == 'https://www.ycombinator.com/companies/acme/jobs/1-backend-engineer'
+
+
+def test_empty_page():
+    registry = ExtractorRegistry(SITE_SPECS)
+    assert registry.extract('indeed', '') == []
+    assert registry.extract('indeed', '<html><body><p>Blocked</p></body></html>') == []
+    assert registry.get('indeed').stats()['cards'] == {'none': 1}
+
+
+def test_throughput():
+    from card_extraction import _amplified_fixture
+
+    registry = ExtractorRegistry(SITE_SPECS)
+    page = _amplified_fixture(os.path.join(FIXTURES, 'indeed_results.html'), copies=20)
+    runs = 20
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        cards = registry.extract('indeed', page)
+    elapsed = time.perf_counter() - start
+
+    cards_per_second = len(cards) * runs / elapsed
+    print(f"📊 {len(cards)} cards per page, {cards_per_second:,.0f} cards/s")
+    assert len(cards) == 60
+    # Generous floor so slow CI machines pass; a regression to per-card reparsing would not
+    assert cards_per_second > 500
+
+
+if __name__ == "__main__":
+    test_indeed_current_markup()
+    test_indeed_legacy_markup_uses_fallbacks()
+    test_ycombinator()
+    test_empty_page()
+    test_throughput()
+    print("✅ Extractor tests passed")
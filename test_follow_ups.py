@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Follow-up engine tests: scheduling, the indexed due query and batched sending
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from follow_ups import FollowUpEngine
+
+
+class FakeMailer:
+    def __init__(self):
+        self.queued = []
+        self.flushes = 0
+
+    def enqueue(self, sender, recipient, subject, body, attachments=None, application_id=None):
+        self.queued.append((sender, recipient, subject, application_id))
+
+    def flush(self):
+        self.flushes += 1
+
+
+def backdate(db, app_id, days):
+    conn = sqlite3.connect(db.db_path)
+    conn.execute('UPDATE applications SET date_applied = ? WHERE id = ?',
+                 (datetime.now() - timedelta(days=days), app_id))
+    conn.commit()
+    conn.close()
+
+
+def test_sync_schedules_new_applications_once(db):
+    old = db.add_application('Netdata', 'Backend Engineer', contact_email='hr@netdata.cloud')
+    backdate(db, old, 10)
+    db.add_application('Schoox', 'Data Engineer')
+    engine = FollowUpEngine(db, days=7)
+
+    assert engine.sync() == 2
+    assert engine.sync() == 0
+    assert [f['application_id'] for f in db.get_due_follow_ups(datetime.now())] == [old]
+    assert engine.next_due() <= str(datetime.now())
+
+    # A reply cancels the follow-up
+    db.update_status(old, 'interview')
+    assert db.get_due_follow_ups(datetime.now()) == []
+
+
+def test_backfill_skips_long_overdue_follow_ups(db):
+    history = db.add_application('Old Company', 'Python Developer')
+    backdate(db, history, 90)
+    recent = db.add_application('Netdata', 'Backend Engineer')
+    backdate(db, recent, 10)
+    engine = FollowUpEngine(db, days=7, max_overdue_days=14)
+
+    assert engine.sync() == 2
+    assert [f['application_id'] for f in db.get_due_follow_ups(datetime.now(), statuses=('pending', 'manual'))] == [recent]
+
+
+def test_due_query_uses_the_index(db):
+    conn = sqlite3.connect(db.db_path)
+    plan = conn.execute('''
+        EXPLAIN QUERY PLAN SELECT id FROM follow_ups
+        WHERE status IN ('pending') AND follow_up_date <= ? ORDER BY follow_up_date
+    ''', (datetime.now(),)).fetchall()
+    conn.close()
+    assert 'idx_follow_ups_due' in str(plan)
+
+
+def test_run_emails_in_batches_and_leaves_manual_reminders(db):
+    for i in range(5):
+        app_id = db.add_application(f'Company {i}', 'Python Developer',
+                                    contact_email=f'hr{i}@example.com' if i != 2 else None)
+        backdate(db, app_id, 8)
+    db.add_application('Recent', 'Python Developer', contact_email='hr@recent.example')
+    engine = FollowUpEngine(db, days=7, batch_size=2)
+    mailer = FakeMailer()
+
+    assert engine.run(mailer, 'me@example.com') == {'queued': 4, 'manual': 1}
+    assert [recipient for _, recipient, _, _ in mailer.queued] == ['hr0@example.com', 'hr1@example.com',
+                                                                  'hr3@example.com', 'hr4@example.com']
+    assert mailer.flushes == 1
+
+    count, reminders = engine.reminders()
+    assert count == 1 and reminders[0]['company'] == 'Company 2'
+    # Nothing else is due until the recent application's follow-up comes up
+    assert engine.run(mailer, 'me@example.com') == {'queued': 0, 'manual': 0}
+    assert engine.next_due() > str(datetime.now())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Detail fetcher tests against a local HTTP server serving the saved fixtures
+"""
+
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import pytest
+
+from job_details import DetailFetcher, extract_description, job_description_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    requests_served = []
+
+    def do_GET(self):
+        FixtureHandler.requests_served.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def fixture_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(FixtureHandler, directory=FIXTURES))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_extract_description_strips_boilerplate():
+    text = extract_description(load_fixture('indeed_job_detail.html'))
+
+    assert text.startswith('Schoox is looking for a Python Backend Engineer')
+    assert '• Design and build REST APIs with Django and PostgreSQL' in text.split('\n')
+    assert 'Requirements' in text.split('\n')
+    for boilerplate in ['cookies', 'Share this job', 'Similar jobs', 'Get new jobs', 'Indeed', 'mosaic']:
+        assert boilerplate not in text
+
+
+def test_extract_description_generic_page():
+    text = extract_description(load_fixture('company_job_page.html'))
+
+    assert text.split('\n') == [
+        'Data Engineer',
+        'Build the pipelines behind real-time infrastructure monitoring.',
+        '• Spark and Airflow',
+        '• ClickHouse',
+    ]
+
+
+def test_enrich_fetches_and_caches(fixture_server, tmp_path):
+    FixtureHandler.requests_served.clear()
+    jobs = [
+        {'title': 'Python Backend Engineer', 'company': 'Schoox, LLC', 'location': 'Thessaloniki',
+         'url': f"{fixture_server}/indeed_job_detail.html", 'description': 'Python, Django, Docker and AWS.'},
+        {'title': 'Data Engineer', 'company': 'Netdata',
+         'url': f"{fixture_server}/company_job_page.html"},
+        {'title': 'Gone', 'company': 'Nowhere', 'url': f"{fixture_server}/missing.html", 'description': 'Card text'},
+    ]
+
+    fetcher = DetailFetcher(cache_folder=str(tmp_path), max_workers=2)
+    fetcher.enrich(jobs)
+
+    assert 'Experience with CI/CD and automated testing' in jobs[0]['description']
+    assert jobs[1]['description'].startswith('Data Engineer')
+    assert jobs[2]['description'] == 'Card text'
+    assert not jobs[2].get('detail_fetched')
+    assert len(FixtureHandler.requests_served) == 3
+
+    # A second run (new records, same URLs) is served from the URL cache
+    again = [{'title': job['title'], 'company': job['company'], 'url': job['url']} for job in jobs[:2]]
+    DetailFetcher(cache_folder=str(tmp_path)).enrich(again)
+    assert again[0]['description'] == jobs[0]['description']
+    assert len(FixtureHandler.requests_served) == 3
+
+
+def test_job_description_text():
+    job = {'title': 'Data Engineer', 'company': 'Netdata', 'location': 'Athens', 'description': 'Spark'}
+    assert job_description_text(job) == "Position: Data Engineer\nCompany: Netdata\nLocation: Athens\n\nSpark"
+
+    del job['description']
+    assert job_description_text(job).endswith("This is a Data Engineer position at Netdata based in Athens.")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bulk job import tests: chunked CSV/JSONL import, normalisation and dedupe
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from job_finder import JobFinder, job_key
+from job_import import JobImporter, write_sample_csv
+
+
+def test_csv_import_in_chunks_dedupes(db, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    write_sample_csv(str(path), 25, duplicate_every=5)
+
+    stats = JobImporter(db, chunksize=7).import_file(str(path))
+    assert stats['chunks'] == 4
+    assert (stats['rows'], stats['imported'], stats['duplicates']) == (25, 20, 5)
+
+    jobs = db.get_saved_jobs()
+    assert jobs[0]['url'] == 'https://example.com/jobs/0'
+    assert jobs[0]['salary'] == '$80k-100k'
+
+    # A second import only finds jobs that are already saved
+    again = JobImporter(db).import_file(str(path))
+    assert (again['imported'], again['duplicates']) == (0, 25)
+    assert db.count_saved_jobs() == 20
+
+
+def test_aliases_defaults_and_jsonl(db, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text('Job Title,Company_Name,link,Salary_Range\n'
+                    'Backend Engineer,Netdata,,€40k\n'
+                    ',,https://example.com/a,\n', encoding='utf-8')
+    jsonl = tmp_path / 'jobs.jsonl'
+    jsonl.write_text('\n'.join(json.dumps(row) for row in [
+        {'position': 'Data Engineer', 'company': 'Schoox', 'url': 'https://example.com/b', 'salary': None},
+        {'title': 'Backend Engineer', 'company': 'Netdata'},
+    ]), encoding='utf-8')
+
+    assert JobImporter(db).import_file(str(path))['imported'] == 2
+    assert JobImporter(db).import_file(str(jsonl))['imported'] == 1
+
+    jobs = db.get_saved_jobs()
+    assert [job_key(job) for job in jobs] == ['Netdata_Backend Engineer', 'https://example.com/a', 'https://example.com/b']
+    assert jobs[0]['salary'] == '€40k'
+    assert (jobs[1]['title'], jobs[1]['company']) == ('Unknown', 'Unknown')
+    assert 'salary' not in jobs[2]
+
+
+def test_job_finder_moves_json_jobs_into_database(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data').mkdir()
+    saved = [{'title': 'Python Developer', 'company': 'Example Corp', 'url': 'https://example.com/1',
+              'date_found': '2024-05-01T10:00:00', 'source': 'manual'}]
+    (tmp_path / 'data' / 'saved_jobs.json').write_text(json.dumps(saved), encoding='utf-8')
+
+    finder = JobFinder(db)
+    assert finder.jobs == saved
+    assert not (tmp_path / 'data' / 'saved_jobs.json').exists()
+
+    finder.remove_job(0)
+    assert JobFinder(db).jobs == []
+
+
+def test_unknown_columns_are_kept_in_extra(db, tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text('title,company,url,Tags,Recruiter\n'
+                    'Backend Engineer,Netdata,https://example.com/a,python;go,\n'
+                    'Data Engineer,Schoox,https://example.com/b,,Maria\n', encoding='utf-8')
+
+    JobImporter(db).import_file(str(path))
+
+    jobs = db.get_saved_jobs()
+    assert jobs[0]['tags'] == 'python;go' and 'recruiter' not in jobs[0]
+    assert jobs[1]['recruiter'] == 'Maria' and 'tags' not in jobs[1]
+
+
+def test_job_finder_loads_only_the_newest_jobs(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'jobs.csv'
+    write_sample_csv(str(path), 30, duplicate_every=0)
+
+    finder = JobFinder(db, max_loaded=10)
+    finder.import_from_csv(str(path))
+
+    assert (len(finder.jobs), finder.total_jobs) == (10, 30)
+    assert finder.jobs[0]['url'] == 'https://example.com/jobs/20'
+    assert db.get_saved_jobs(limit=2, offset=28)[1]['url'] == 'https://example.com/jobs/29'
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Keyword extractor tests: leftmost-longest matching, word boundaries and batches
+"""
+
+from keyword_extractor import KeywordAutomaton, SkillsTaxonomy
+
+
+def test_longest_term_wins():
+    automaton = KeywordAutomaton()
+    # react.js is one react mention, not react + js
+    assert automaton.find_all('React.js') == [(0, 8, 'react')]
+    assert automaton.find_all('Amazon Web Services') == [(0, 19, 'aws')]
+    assert automaton.keywords('Java EE and machine learning') == ['java', 'machine learning']
+
+
+def test_leftmost_match_wins_over_a_later_overlap():
+    automaton = KeywordAutomaton(SkillsTaxonomy({'data science': [], 'science fiction': []}))
+    assert automaton.find_all('data science fiction') == [(0, 12, 'data science')]
+
+
+def test_terms_only_match_whole_words():
+    automaton = KeywordAutomaton()
+    assert automaton.keywords('JavaScript, typescripts, pythonic, gitter') == ['javascript']
+    assert automaton.keywords('py-spark, k8s/helm') == ['python', 'kubernetes']
+    # Punctuation inside a term (t-sql, node.js) still matches after a word
+    assert automaton.keywords('T-SQL; Node.js') == ['sql', 'node']
+
+
+def test_extract_counts_synonyms_under_the_skill():
+    hits = KeywordAutomaton().extract('Postgres and PostgreSQL, then postgres again')
+    assert hits == {'postgresql': {'count': 3, 'positions': [(0, 8), (13, 23), (30, 38)]}}
+
+
+def test_batch_positions_are_per_document():
+    automaton = KeywordAutomaton()
+    texts = ['Python and Docker', None, 'docker']
+    assert automaton.extract_batch(texts) == [automaton.extract(text) for text in texts]
+    assert automaton.extract_batch(texts)[2] == {'docker': {'count': 1, 'positions': [(0, 6)]}}
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Mailer tests against a local aiosmtpd debugging server
+"""
+
+import base64
+import socket
+
+import pytest
+
+pytest.importorskip('aiosmtpd')
+from aiosmtpd.controller import Controller
+
+from blobstore import BlobStore
+from database import Database
+from mailer import AttachmentCache, Mailer, SMTPPool, is_transient
+from rate_limiter import TokenBucket
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.replies = []  # Queued replies for the next DATA commands, e.g. '451 Try later'
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.replies:
+            return self.replies.pop(0)
+        self.messages.append(envelope)
+        return '250 OK'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield handler, controller.hostname, controller.port
+    controller.stop()
+
+
+@pytest.fixture
+def make_mailer(smtp_server, tmp_path):
+    _, host, port = smtp_server
+    db = Database(db_path=str(tmp_path / 'applications.db'))
+
+    def make(**kwargs):
+        pool = SMTPPool(host=host, port=port, use_tls=False, size=1)
+        return Mailer(pool, db=db, rate=TokenBucket(per_minute=60000, burst=100), retry_delay=0, **kwargs)
+    return make
+
+
+def test_sends_over_one_pooled_connection(smtp_server, make_mailer, tmp_path):
+    handler, _, _ = smtp_server
+    resume = tmp_path / 'resume.pdf'
+    resume.write_bytes(b'%PDF-1.4 fake resume')
+    mailer = make_mailer()
+
+    outcomes = [
+        mailer.send('me@example.com', f'jobs{i}@example.com', 'Application', 'Hello', attachments=[str(resume)])
+        for i in range(3)
+    ]
+
+    assert outcomes == ['sent'] * 3
+    assert [m.rcpt_tos for m in handler.messages] == [[f'jobs{i}@example.com'] for i in range(3)]
+    assert b'filename="resume.pdf"' in handler.messages[0].content
+    assert mailer.pool.connects == 1
+    assert mailer.db.get_outbox_counts() == {'sent': 3}
+    mailer.close()
+
+
+def test_queued_attachments_come_from_the_blobstore(smtp_server, make_mailer, tmp_path):
+    handler, _, _ = smtp_server
+    resume = tmp_path / 'resume.pdf'
+    resume.write_bytes(b'%PDF-1.4 queued version')
+    mailer = make_mailer(blobs=BlobStore(str(tmp_path / 'blobs'), compression='zlib',
+                                         db=Database(db_path=str(tmp_path / 'applications.db'))))
+
+    message_id = mailer.enqueue('me@example.com', 'jobs@example.com', 'Application', 'Hello', attachments=[
+        str(resume), {'filename': 'Netdata resume.txt', 'data': 'Tailored resume'}])
+    resume.write_bytes(b'%PDF-1.4 edited after queueing')
+
+    assert mailer.flush() == {message_id: 'sent'}
+    content = handler.messages[0].content
+    assert b'filename="Netdata resume.txt"' in content
+    assert base64.b64encode(b'%PDF-1.4 queued version') in content
+    mailer.close()
+
+
+def test_attachment_cache_keeps_every_blob(tmp_path):
+    blobs = BlobStore(str(tmp_path / 'blobs'), compression='zlib',
+                      db=Database(db_path=str(tmp_path / 'applications.db')))
+    resume = tmp_path / 'resume.pdf'
+    resume.write_bytes(b'%PDF-1.4 v1')
+    references = [blobs.attachment({'filename': 'resume.pdf', 'data': b'%PDF-1.4 resume'}),
+                  blobs.attachment({'filename': 'cover.txt', 'data': b'Dear team'})]
+    cache = AttachmentCache()
+
+    for _ in range(4):
+        for reference in references:
+            cache.get(reference, blobs)
+    assert (cache.hits, cache.misses) == (6, 2)
+
+    cache.get(str(resume))
+    resume.write_bytes(b'%PDF-1.4 v2, rewritten')
+    cache.get(str(resume))
+    # Only the stale encoding of the rewritten file is dropped
+    assert len(cache._parts) == 3
+
+
+def test_transient_failure_is_retried(smtp_server, make_mailer):
+    handler, _, _ = smtp_server
+    handler.replies = ['451 4.3.0 Try again later']
+    mailer = make_mailer()
+
+    assert mailer.send('me@example.com', 'jobs@example.com', 'Application', 'Hello') == 'retry'
+    assert mailer.db.get_outbox_counts() == {'pending': 1}
+
+    assert list(mailer.flush().values()) == ['sent']
+    assert len(handler.messages) == 1
+    mailer.close()
+
+
+def test_permanent_failure_is_not_retried(smtp_server, make_mailer):
+    handler, _, _ = smtp_server
+    handler.replies = ['550 5.1.1 Mailbox unavailable']
+    mailer = make_mailer()
+
+    assert mailer.send('me@example.com', 'nobody@example.com', 'Application', 'Hello') == 'failed'
+    assert mailer.flush() == {}
+    assert mailer.db.get_outbox_counts() == {'failed': 1}
+    mailer.close()
+
+
+def test_missing_attachment_is_not_retried(smtp_server, make_mailer, tmp_path):
+    handler, _, _ = smtp_server
+    mailer = make_mailer()
+
+    assert mailer.send('me@example.com', 'jobs@example.com', 'Application', 'Hello',
+                       attachments=[str(tmp_path / 'moved.pdf')]) == 'failed'
+    assert mailer.db.get_outbox_counts() == {'failed': 1}
+    assert handler.messages == []
+    assert not is_transient(PermissionError('resume.pdf'))
+    assert is_transient(ConnectionResetError())
+    mailer.close()
+
+
+def test_acquire_gives_up_when_every_connection_is_busy(smtp_server):
+    _, host, port = smtp_server
+    pool = SMTPPool(host=host, port=port, use_tls=False, size=1, acquire_timeout=0.1)
+    conn = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    pool.release(conn)
+    pool.close()
+
+
+def test_reconnects_after_dropped_connection(smtp_server, make_mailer):
+    handler, _, _ = smtp_server
+    mailer = make_mailer()
+    assert mailer.send('me@example.com', 'a@example.com', 'Application', 'Hello') == 'sent'
+
+    # Simulate the server closing the idle session
+    conn = mailer.pool.acquire()
+    conn.smtp.close()
+    mailer.pool.release(conn)
+
+    assert mailer.send('me@example.com', 'b@example.com', 'Application', 'Hello') == 'sent'
+    assert len(handler.messages) == 2
+    assert mailer.pool.connects == 2
+    mailer.close()
+
+
+def test_outbox_survives_restart(smtp_server, make_mailer):
+    handler, _, _ = smtp_server
+    mailer = make_mailer()
+    message_id = mailer.enqueue('me@example.com', 'jobs@example.com', 'Application', 'Hello')
+    # Claimed by a run that then crashed mid-send
+    mailer.db.claim_outbox_messages(message_ids=[message_id])
+    mailer.close()
+
+    restarted = make_mailer()
+    assert restarted.flush() == {message_id: 'sent'}
+    assert len(handler.messages) == 1
+    restarted.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Rate limiter tests: token buckets, per-host limits and persisted daily quotas
+"""
+
+from datetime import date
+
+import pytest
+
+from app_context import AppContext
+from auto_applier import JobAutoApplier
+from rate_limiter import QuotaExceeded, RateLimiter, TokenBucket
+
+
+class FailingMailer:
+    def send(self, sender, recipient, subject, body, attachments=None, application_id=None):
+        return 'failed'
+
+
+class FakeTailor:
+    base_resume = 'JOHN DOE\n'
+
+    def generate_cover_letter(self, description, company, title):
+        return f"Dear {company} team,"
+
+
+def test_failed_send_gives_the_quota_back(db, tmp_path):
+    limiter = RateLimiter(limits={}, quotas={'applications': 3}, db=db)
+    context = AppContext(db_path=db.db_path)
+    context.provide('db', db)
+    context.provide('limiter', limiter)
+    context.provide('tailor', FakeTailor())
+    applier = JobAutoApplier('me@example.com', 'secret', context=context)
+    applier.mailer = FailingMailer()
+
+    job = {'id': 'Netdata_Backend Engineer', 'title': 'Backend Engineer', 'company': 'Netdata',
+           'description': 'Python', 'email': 'jobs@netdata.cloud'}
+    assert applier.auto_apply_email(job, str(tmp_path / 'resume.pdf')) is False
+    assert limiter.remaining('applications') == 3
+
+    limiter.take_daily('applications')
+    limiter.refund('applications')
+    limiter.refund('applications')
+    assert limiter.remaining('applications') == 3
+
+
+def test_bucket_allows_a_burst_then_spaces_out_requests(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr('rate_limiter.time.monotonic', lambda: clock[0])
+    bucket = TokenBucket(per_minute=60, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Waiting callers are spaced one refill apart instead of waking together
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert not bucket.try_take()
+
+    clock[0] += 3
+    assert bucket.try_take()
+    assert not bucket.try_take()
+
+    # Refills never go past the burst size
+    clock[0] += 60
+    assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+
+
+def test_each_host_gets_its_own_bucket(monkeypatch):
+    monkeypatch.setattr('rate_limiter.time.monotonic', lambda: 100.0)
+    limiter = RateLimiter(limits={'scrape': (6, 1)}, quotas={}, db=None)
+
+    assert limiter.try_acquire('scrape', 'remoteok.io')
+    assert not limiter.try_acquire('scrape', 'remoteok.io')
+    assert limiter.try_acquire('scrape', 'weworkremotely.com')
+    assert limiter.bucket('scrape', 'remoteok.io') is limiter.bucket('scrape', 'remoteok.io')
+    # Channels without a limit never wait
+    assert limiter.acquire('unlimited', 'example.com') == 0.0
+
+
+def test_daily_quota_is_persisted_and_rolls_over(db, monkeypatch):
+    class Today(date):
+        day = date(2026, 3, 2)
+
+        @classmethod
+        def today(cls):
+            return cls.day
+
+    monkeypatch.setattr('rate_limiter.date', Today)
+    limiter = RateLimiter(limits={}, quotas={'applications': 2}, db=db)
+    assert limiter.take_daily('applications')
+    assert limiter.take_daily('applications')
+    assert not limiter.take_daily('applications')
+    with pytest.raises(QuotaExceeded):
+        limiter.take_daily('applications', raise_error=True)
+
+    # A restarted process sees the same count
+    assert RateLimiter(limits={}, quotas={'applications': 2}, db=db).remaining('applications') == 0
+
+    Today.day = date(2026, 3, 3)
+    assert limiter.remaining('applications') == 2
+    assert limiter.take_daily('applications')
+    assert limiter.remaining('applications') == 1
+    assert db.get_daily_quota_used('applications', '2026-03-02') == 2
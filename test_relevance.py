@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Relevance tests: tokenizing tech terms and ranking jobs against resumes
+"""
+
+from relevance import job_text, rank_jobs, tokenize
+
+JOBS = [
+    {'title': 'Frontend Developer', 'description': 'React, TypeScript and CSS for our design system'},
+    {'title': 'Backend Engineer', 'description': 'Python, Django and PostgreSQL APIs on AWS'},
+    {'title': 'Data Engineer', 'description': 'Python and SQL pipelines with Airflow and Spark'},
+    {'title': 'Office Manager', 'description': 'Run the office, plan events, order supplies'},
+]
+
+RESUMES = [
+    (7, 'Python developer: Django, PostgreSQL, SQL, REST APIs, AWS, Docker'),
+    (9, 'Frontend engineer: React, TypeScript, CSS, accessibility'),
+]
+
+
+def test_tokenize_keeps_tech_terms():
+    assert tokenize('We use C++, C# and Node.js.') == ['use', 'c++', 'c#', 'node.js']
+    assert tokenize(None) == []
+
+
+def test_job_text_boosts_title_and_joins_tags():
+    text = job_text({'title': 'SRE', 'description': 'On call', 'tags': ['k8s', 'go']})
+    assert text == 'SRE SRE On call k8s go'
+
+
+def test_best_match_first():
+    ranked = rank_jobs(JOBS, RESUMES)
+    titles = [job['title'] for _, _, job in ranked]
+    # Backend shares far more of resume 7 than the data role does; nothing matches the office job
+    assert titles.index('Backend Engineer') < titles.index('Data Engineer')
+    assert titles[-1] == 'Office Manager'
+
+    scores = [score for score, _, _ in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert scores[-1] == 0.0
+
+
+def test_each_job_gets_its_best_resume():
+    best_resume = {job['title']: resume_id for _, resume_id, job in rank_jobs(JOBS, RESUMES)}
+    assert best_resume['Backend Engineer'] == 7
+    assert best_resume['Data Engineer'] == 7
+    assert best_resume['Frontend Developer'] == 9
+
+
+def test_ties_and_missing_resumes_keep_the_original_order():
+    assert rank_jobs([], RESUMES) == []
+    assert rank_jobs(JOBS, []) == [(0.0, None, job) for job in JOBS]
+
+    unrelated = [dict(job, title=f'Clerk {i}', description='filing') for i, job in enumerate(JOBS)]
+    assert [job for _, _, job in rank_jobs(unrelated, RESUMES)] == unrelated
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Scheduler tests: intervals, persisted last runs and non-overlapping execution
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from scheduler import Scheduler, parse_interval
+
+
+def test_parse_interval():
+    assert parse_interval('90s') == 90
+    assert parse_interval('15m') == 900
+    assert parse_interval('1h30m') == 5400
+    assert parse_interval(2) == 2
+    with pytest.raises(ValueError):
+        parse_interval('every 4 hours')
+
+
+def test_restart_waits_for_persisted_interval(db):
+    scheduler = Scheduler(db=db)
+    job = scheduler.add('scrape', lambda: None, every='4h')
+    assert scheduler.due_times()['scrape'] <= datetime.now()
+
+    assert asyncio.run(scheduler.run_job(job)) == 'ok'
+
+    restarted = Scheduler(db=db)
+    restarted.add('scrape', lambda: None, every='4h')
+    next_run = restarted.due_times()['scrape']
+    assert next_run > datetime.now() + timedelta(hours=3, minutes=59)
+    assert db.get_scheduled_jobs()['scrape']['last_status'] == 'ok'
+
+
+def test_job_never_overlaps_itself(db):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    first, second = Scheduler(db=db, owner='first'), Scheduler(db=db, owner='second')
+    job = first.add('apply', slow, every='5m')
+    other = second.add('apply', slow, every='5m')
+
+    async def overlap():
+        running = asyncio.ensure_future(first.run_job(job))
+        await asyncio.to_thread(started.wait, 5)
+        outcome = await second.run_job(other)
+        release.set()
+        return outcome, await running
+
+    assert asyncio.run(overlap()) == ('locked', 'ok')
+
+
+def test_pipelines_run_concurrently(db):
+    scheduler = Scheduler(db=db)
+    both_running = threading.Barrier(2, timeout=5)
+    ran = []
+
+    def pipeline(name):
+        def run():
+            both_running.wait()
+            ran.append(name)
+            if len(ran) == 2:
+                scheduler.stop()
+        return run
+
+    def failing():
+        raise RuntimeError('source down')
+
+    scheduler.add('scrape', pipeline('scrape'), every='1h')
+    scheduler.add('apply', pipeline('apply'), every='1h')
+    scheduler.add('broken', failing, every='1h')
+    asyncio.run(scheduler.serve())
+
+    assert sorted(ran) == ['apply', 'scrape']
+    state = db.get_scheduled_jobs()
+    assert state['broken']['last_status'] == 'error'
+    assert 'source down' in state['broken']['last_error']
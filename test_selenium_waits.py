@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Wait timing tests: latency samples, timeouts and backoff
+"""
+
+from selenium_waits import StepTimings, WaitStrategy
+
+
+def test_timeouts_are_not_latency_samples():
+    timings = StepTimings(path=None)
+    for seconds in (0.4, 0.5, 0.6):
+        timings.record('results', seconds)
+    timings.record('results', 30.0, timed_out=True)
+
+    assert timings.summary()['results'] == {'count': 3, 'median': 0.5, 'p95': 0.6, 'timeouts': 1}
+    assert timings.backoff['results'] == 60.0
+
+    # The backoff, not a skewed p95, raises the next timeout until a wait succeeds
+    waits = WaitStrategy(driver=None, timings=timings, max_timeout=45.0)
+    assert waits.timeout_for('results') == 45.0
+    timings.record('results', 0.5)
+    assert 'results' not in timings.backoff
+    assert waits.timeout_for('results') == 2.0
+
+
+def test_timings_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'wait_timings.json')
+    timings = StepTimings(path=path)
+    timings.record('login', 1.5)
+    timings.record('login', 10.0, timed_out=True)
+    timings.save()
+
+    reloaded = StepTimings(path=path)
+    assert reloaded.summary() == timings.summary()
+    assert reloaded.backoff == {'login': 20.0}
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Watermark tests: new-posting detection and incremental Indeed crawls over the saved fixtures
+"""
+
+import os
+
+import pytest
+
+from crawl_frontier import CrawlFrontier, IndeedCrawler, normalize_url
+from watermarks import Watermark, WatermarkStore, scope_key
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+@pytest.fixture
+def store(db):
+    return WatermarkStore(db)
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_watermark_by_date_and_id(store):
+    scope = scope_key(['Python Developer', 'AI Engineer'])
+    assert scope == 'ai engineer,python developer'
+
+    first = store.get('remoteok', scope)
+    for job_id, posted in [('3', '2024-05-02T10:00:00'), ('2', '2024-05-02T10:00:00'), ('1', '2024-05-01T09:00:00')]:
+        assert first.is_new(job_id, posted)
+        first.record(job_id, posted)
+    store.save(first)
+
+    again = store.get('remoteok', scope)
+    assert (again.last_posted, again.last_id) == ('2024-05-02T10:00:00', '3')
+    assert not again.is_new('2', '2024-05-02T10:00:00')
+    assert not again.is_new('0', '2024-04-30T00:00:00')
+    # Same timestamp as the mark but not seen before
+    assert again.is_new('4', '2024-05-02T10:00:00')
+    assert again.is_new('5', '2024-05-03T08:00:00')
+    assert again.reached
+
+    assert not store.get('remoteok', 'other search').seen_ids
+
+
+def test_id_only_watermark():
+    watermark = Watermark('indeed', seen_ids=['abc'])
+    assert watermark.is_new('def')
+    assert not watermark.reached
+    assert not watermark.is_new('abc')
+    assert watermark.reached
+
+
+def test_indeed_crawl_stops_at_watermark(store):
+    pages = {
+        'start=10': load_fixture('indeed_results_legacy.html'),
+    }
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return next((page for marker, page in pages.items() if marker in url), load_fixture('indeed_results.html'))
+
+    def crawl():
+        crawler = IndeedCrawler(fetch, frontier=CrawlFrontier(state_path=None, politeness=0),
+                                follow_details=False, watermarks=store)
+        return crawler.crawl([('https://gr.indeed.com/jobs?q=Developer&l=Thessaloniki', 'Thessaloniki')])
+
+    first = crawl()
+    assert len(fetched) == 2
+    assert first
+
+    fetched.clear()
+    assert crawl() == []
+    # Page one only holds jobs seen last time, so page two is never requested
+    assert len(fetched) == 1
+
+
+def test_one_seen_card_does_not_stop_pagination(store):
+    start_url = 'https://gr.indeed.com/jobs?q=Developer&l=Thessaloniki'
+    # e.g. a pinned posting from the last crawl at the top of page one
+    store.db.save_watermark('indeed', normalize_url(start_url), None, None, ['a1b2c3d4e5f60002'])
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return load_fixture('indeed_results_legacy.html' if 'start=10' in url else 'indeed_results.html')
+
+    crawler = IndeedCrawler(fetch, frontier=CrawlFrontier(state_path=None, politeness=0),
+                            follow_details=False, watermarks=store)
+    jobs = crawler.crawl([(start_url, 'Thessaloniki')])
+
+    assert len(fetched) == 2
+    assert len(jobs) == 4
+    assert not crawler.reached_watermark
+
+
+def test_unapplied_jobs_are_carried_over(store):
+    store.carry_over('python|remote', {'a': {'title': 'Backend Engineer'}, 'b': {'title': 'Data Engineer'}})
+    store.carry_over('python|remote', {'a': {'title': 'Backend Engineer', 'salary': 5000}})
+
+    assert store.carried_over('python|remote') == {'a': {'title': 'Backend Engineer', 'salary': 5000},
+                                                   'b': {'title': 'Data Engineer'}}
+    assert store.carried_over('other search') == {}
+
+    store.consumed('python|remote', ['a'])
+    assert list(store.carried_over('python|remote')) == ['b']
+
+    store.carry_days = -1
+    assert store.carried_over('python|remote') == {}
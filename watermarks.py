@@ -0,0 +1,114 @@
+"""
+Per-source high-water marks for incremental scraping
+The newest posting date and IDs seen per source and search are kept in the database,
+so steady-state scrapes only emit new postings and stop paginating at old ones.
+Postings that pass the mark but aren't applied to (daily budget, quota) are carried
+over to the next run rather than lost.
+"""
+
+from datetime import datetime, timedelta
+
+
+def scope_key(*parts):
+    """Stable scope for a search, e.g. scope_key(keywords) or scope_key(what, where)"""
+    flat = []
+    for part in parts:
+        if isinstance(part, (list, tuple, set)):
+            flat.append(','.join(sorted(str(p).strip().lower() for p in part)))
+        else:
+            flat.append(str(part or '').strip().lower())
+    return '|'.join(flat)
+
+
+class Watermark:
+    """Where the previous scrape of one source and search got to
+
+    A posting is new when it is newer than last_posted, or equally new but not among
+    the IDs already seen (postings can share a timestamp). Sources without dates,
+    like Indeed cards, are tracked by ID alone.
+    """
+
+    def __init__(self, source, scope='', last_posted=None, last_id=None, seen_ids=(), max_ids=500):
+        self.source = source
+        self.scope = scope
+        self.last_posted = last_posted
+        self.last_id = last_id
+        self.seen_ids = list(seen_ids)
+        self.max_ids = max_ids
+        self.reached = False
+        self.exhausted = False
+        self._seen = set(self.seen_ids)
+        self._new_ids = []
+        self._newest = (last_posted, last_id)
+
+    def is_new(self, job_id=None, posted=None):
+        """True if the posting wasn't seen before; otherwise marks the watermark as reached"""
+        if job_id is not None and str(job_id) in self._seen:
+            self.reached = True
+            return False
+        if posted and self.last_posted and str(posted) < self.last_posted:
+            self.reached = True
+            return False
+        return True
+
+    def end_page(self, postings, seen):
+        """Note a results page of `postings`, `seen` of them already seen; True if paging should stop
+
+        Only a page of nothing but seen postings stops paging: one pinned or sponsored
+        old posting on an otherwise new page doesn't mean the rest is old.
+        """
+        if postings and seen >= postings:
+            self.exhausted = True
+        return self.exhausted
+
+    def record(self, job_id=None, posted=None):
+        """Remember a processed posting; the mark only moves when saved"""
+        if job_id is not None and str(job_id) not in self._seen:
+            self._seen.add(str(job_id))
+            self._new_ids.append(str(job_id))
+        if posted and (self._newest[0] is None or str(posted) > self._newest[0]):
+            self._newest = (str(posted), None if job_id is None else str(job_id))
+
+    @property
+    def changed(self):
+        return bool(self._new_ids) or self._newest != (self.last_posted, self.last_id)
+
+    def advance(self):
+        """Move the mark past everything recorded"""
+        self.last_posted, self.last_id = self._newest
+        self.seen_ids = (self._new_ids[::-1] + self.seen_ids)[:self.max_ids]
+        self._new_ids = []
+
+
+class WatermarkStore:
+    def __init__(self, db=None, carry_days=14):
+        if db is None:
+            from database import Database
+            db = Database()
+        self.db = db
+        self.carry_days = carry_days
+
+    def get(self, source, scope=''):
+        state = self.db.get_watermark(source, scope) or {}
+        return Watermark(source, scope, state.get('last_posted'), state.get('last_id'), state.get('seen_ids', ()))
+
+    def save(self, watermark):
+        if not watermark.changed:
+            return
+        watermark.advance()
+        self.db.save_watermark(watermark.source, watermark.scope, watermark.last_posted,
+                               watermark.last_id, watermark.seen_ids)
+
+    def carry_over(self, scope, jobs):
+        """Keep {key: job} that passed the watermark but weren't applied to, for the next run"""
+        if jobs:
+            self.db.carry_jobs(scope, jobs)
+
+    def carried_over(self, scope):
+        """{key: job} carried over from earlier runs of this search, up to carry_days old"""
+        return self.db.get_carried_jobs(scope, datetime.now() - timedelta(days=self.carry_days))
+
+    def consumed(self, scope, keys):
+        """Forget carried-over jobs that have since been applied to, queued or ruled out"""
+        if keys:
+            self.db.delete_carried_jobs(scope, list(keys))